@@ -0,0 +1,197 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+import requests
+
+from boxscore_cache import GAME_STATUS_FINAL
+from live_records import game_record
+from nba_fetch import BOXSCORE_URL, REQUEST_TIMEOUT, RateLimiter, get_json, get_response
+from nba_live_stats_db import (
+    PLAYER_COLUMNS, archive_database, boxscores_player_frame, open_database, scoreboard_frames, team_result_frame
+)
+from nba_metrics import metrics
+
+SCHEDULE_URL = "https://cdn.nba.com/static/json/staticData/scheduleLeagueV2.json"
+# Regular season games per season; their ids run 002YY00001 to 002YY01230
+REGULAR_SEASON_GAMES = 1230
+# Game id prefixes loaded from the schedule: regular season and playoffs
+BACKFILL_GAME_TYPES = ('002', '004')
+# Defaults for a backfill run: concurrent fetches, requests per second to the
+# CDN, and games fetched and loaded per transaction
+BACKFILL_WORKERS = 16
+BACKFILL_RATE = 20
+CHUNK_SIZE = 100
+
+def season_game_ids(season, num_games=REGULAR_SEASON_GAMES):
+    """
+    Regular season game ids of the season starting in `season` (2024 for 2024-25)
+    """
+    return [f"002{season % 100:02d}{number:05d}" for number in range(1, num_games + 1)]
+
+def schedule_game_ids(schedule, date_from, date_to):
+    """
+    Ids of the final regular season and playoff games in a league schedule
+    payload played between date_from and date_to (ISO dates, inclusive)
+    """
+    game_ids = []
+    for game_date in schedule['leagueSchedule']['gameDates']:
+        for game in game_date['games']:
+            if (
+                date_from <= game['gameDateEst'][:10] <= date_to
+                and game['gameStatus'] == GAME_STATUS_FINAL
+                and game['gameId'][:3] in BACKFILL_GAME_TYPES
+            ):
+                game_ids.append(game['gameId'])
+    return game_ids
+
+def fetch_historical_boxscore(game_id, url_template=BOXSCORE_URL, timeout=REQUEST_TIMEOUT):
+    """
+    The 'game' section of a past game's boxscore, or None when the CDN has no
+    boxscore for the id (it answers 403 or 404)
+    """
+    try:
+        response = get_response(url_template.format(game_id=game_id), timeout=timeout)
+    except requests.HTTPError as e:
+        if e.response is not None and e.response.status_code in (403, 404):
+            return None
+        raise
+    return response.json().get('game')
+
+def load_games(db, games, current_time=None):
+    """
+    Bulk-load final boxscores (GameRecords) into games, game_teams and
+    players, add them to the summary tables and checkpoint them in
+    backfill_progress, all in one transaction. Each table gets one columnar
+    INSERT for the whole batch.
+    Teams already stored keep their current record. Returns the rows written.
+    """
+    current_time = current_time or datetime.now()
+    # Boxscores carry no team records, so wins and losses are left empty
+    frames = scoreboard_frames(games, current_time)
+    players = boxscores_player_frame(games)
+    players['last_updated'] = current_time
+    frames['players'] = players[PLAYER_COLUMNS]
+    progress = pd.DataFrame({'game_id': [game.game_id for game in games], 'loaded_at': current_time})
+
+    written = 0
+    with db.transaction():
+        stored_teams = {row[0] for row in db.conn.execute("SELECT team_id FROM teams").fetchall()}
+        frames['teams'] = frames['teams'][~frames['teams']['team_id'].isin(stored_teams)]
+        # Summaries before the rows, in the same transaction
+        db.update_player_totals(frames['players'])
+        db.update_team_form(team_result_frame(games))
+        for table in ('teams', 'games', 'game_teams', 'players'):
+            written += db.upsert_frame(table, frames[table])
+        db.upsert_frame('backfill_progress', progress)
+    return written
+
+def backfill(game_ids, db_path='nba_live_stats.db', url_template=BOXSCORE_URL, workers=BACKFILL_WORKERS,
+             rate=BACKFILL_RATE, chunk_size=CHUNK_SIZE, log=print):
+    """
+    Load the boxscores of past games into the database.
+
+    Games already in backfill_progress are skipped, so rerunning after an
+    interruption picks up where the last run stopped. Boxscores are fetched
+    `workers` at a time, at most `rate` requests per second, one chunk
+    ahead of the database: while a chunk is being loaded, the next one is
+    already downloading. Each chunk is loaded and checkpointed in one
+    transaction, and the database is opened only for that, so the live
+    ingester can write between chunks. Games the CDN has no boxscore for, and games not final yet,
+    are left out and tried again by the next run.
+
+    Returns the counts of each outcome and the throughput.
+    """
+    limiter = RateLimiter(rate)
+
+    def fetch_one(game_id):
+        limiter.wait()
+        try:
+            with metrics.timer('backfill.fetch'):
+                return fetch_historical_boxscore(game_id, url_template), False
+        except Exception as e:
+            print(f"Error fetching boxscore for game ID {game_id}: {e}")
+            return None, True
+
+    db = open_database(db_path)
+    try:
+        loaded_ids = {row[0] for row in db.conn.execute("SELECT game_id FROM backfill_progress").fetchall()}
+    finally:
+        db.close()
+    game_ids = list(dict.fromkeys(game_ids))
+    pending = [game_id for game_id in game_ids if game_id not in loaded_ids]
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    stats = {
+        'requested': len(game_ids), 'already_loaded': len(game_ids) - len(pending),
+        'loaded': 0, 'missing': 0, 'not_final': 0, 'failed': 0, 'rows': 0,
+    }
+    if stats['already_loaded']:
+        log(f"Skipping {stats['already_loaded']} games loaded by an earlier run")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = [pool.submit(fetch_one, game_id) for game_id in chunks[0]] if chunks else []
+        for i in range(len(chunks)):
+            fetched = [future.result() for future in futures]
+            futures = [pool.submit(fetch_one, game_id) for game_id in chunks[i + 1]] if i + 1 < len(chunks) else []
+
+            games = []
+            for game_data, failed in fetched:
+                if failed:
+                    stats['failed'] += 1
+                elif game_data is None:
+                    stats['missing'] += 1
+                elif game_data.get('gameStatus') != GAME_STATUS_FINAL:
+                    stats['not_final'] += 1
+                else:
+                    games.append(game_record(game_data))
+            if games:
+                # The file is only held while a chunk is written, so the live
+                # ingester keeps running through the rate-limited fetches
+                with metrics.timer('backfill.load'):
+                    db = open_database(db_path)
+                    try:
+                        stats['rows'] += load_games(db, games)
+                    finally:
+                        db.close()
+                stats['loaded'] += len(games)
+
+            seconds = time.perf_counter() - start
+            done = sum(len(chunk) for chunk in chunks[:i + 1])
+            log(f"{done}/{len(pending)} games fetched, {stats['loaded']} loaded "
+                f"({stats['loaded'] / seconds:.1f} games/s, {stats['rows'] / seconds:.0f} rows/s)")
+
+    stats['seconds'] = time.perf_counter() - start
+    stats['games_per_sec'] = stats['loaded'] / stats['seconds'] if stats['seconds'] else 0.0
+    stats['rows_per_sec'] = stats['rows'] / stats['seconds'] if stats['seconds'] else 0.0
+    return stats
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load past games' boxscores into the NBA live stats database")
+    games = parser.add_mutually_exclusive_group(required=True)
+    games.add_argument('--season', type=int, help="starting year of a regular season, e.g. 2024 for 2024-25")
+    games.add_argument('--from', dest='date_from', help="first game date (YYYY-MM-DD) in the current season's schedule")
+    parser.add_argument('--to', dest='date_to', help="last game date (YYYY-MM-DD), defaults to today")
+    parser.add_argument('--db', default='nba_live_stats.db')
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS)
+    parser.add_argument('--rate', type=float, default=BACKFILL_RATE, help="most requests per second")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--boxscore-url', default=BOXSCORE_URL, help="with a {game_id} placeholder")
+    parser.add_argument('--schedule-url', default=SCHEDULE_URL)
+    parser.add_argument('--archive', action='store_true', help="move the loaded game dates into the Parquet archive")
+    args = parser.parse_args()
+
+    if args.season is not None:
+        ids = season_game_ids(args.season)
+    else:
+        date_to = args.date_to or datetime.now().strftime('%Y-%m-%d')
+        ids = schedule_game_ids(get_json(args.schedule_url), args.date_from, date_to)
+    result = backfill(ids, args.db, args.boxscore_url, args.workers, args.rate, args.chunk_size)
+    print(f"Loaded {result['loaded']} games ({result['rows']} rows) in {result['seconds']:.1f}s: "
+          f"{result['games_per_sec']:.1f} games/s, {result['rows_per_sec']:.0f} rows/s. "
+          f"{result['already_loaded']} already loaded, {result['missing']} missing, "
+          f"{result['not_final']} not final, {result['failed']} failed")
+    if args.archive:
+        archive_database(args.db)
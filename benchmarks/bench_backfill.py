@@ -0,0 +1,69 @@
+"""
+Time a season backfill against a local stand-in for the CDN.
+
+Usage: python benchmarks/bench_backfill.py [--games 1230] [--workers 16] [--rate 0] [--chunk-size 100]
+
+The final boxscores of a generated night (replay.record_night) are served
+by replay.ReplayServer under a full season of game ids, and backfill.backfill
+loads them into a fresh database. --rate 0 removes the request limit, so
+the result is bounded by the pipeline and the local server; against the
+CDN, the default of backfill.BACKFILL_RATE requests per second is the
+limit. Fetch and load time per chunk come from the metrics registry.
+"""
+import argparse
+import copy
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backfill import BACKFILL_WORKERS, CHUNK_SIZE, backfill, season_game_ids  # noqa: E402
+from nba_metrics import metrics  # noqa: E402
+from replay import ReplayServer, record_night  # noqa: E402
+
+
+def season_night(num_games):
+    night = record_night(num_games=15, ticks=130)
+    finals = list(night[-1]['boxscores'].values())
+    boxscores = {}
+    for i, game_id in enumerate(season_game_ids(2024, num_games)):
+        boxscore = copy.deepcopy(finals[i % len(finals)])
+        boxscore['game']['gameId'] = game_id
+        boxscores[game_id] = boxscore
+    return [{'scoreboard': night[-1]['scoreboard'], 'boxscores': boxscores}]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=1230)
+    parser.add_argument('--workers', type=int, default=BACKFILL_WORKERS)
+    parser.add_argument('--rate', type=float, default=0)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    night = season_night(args.games)
+    tmp = tempfile.mkdtemp()
+    try:
+        with ReplayServer(night) as replay:
+            metrics.reset()
+            result = backfill(
+                season_game_ids(2024, args.games), os.path.join(tmp, 'backfill.db'), replay.boxscore_url,
+                args.workers, args.rate, args.chunk_size, log=lambda message: None
+            )
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    stages = metrics.report()['stages']
+    print(f"Loaded {result['loaded']} games ({result['rows']} rows) in {result['seconds']:.1f}s")
+    print(f"throughput      : {result['games_per_sec']:8.1f} games/s {result['rows_per_sec']:10.0f} rows/s")
+    for stage in ('backfill.fetch', 'backfill.load'):
+        if stage in stages:
+            entry = stages[stage]
+            print(f"{stage:<16}: {entry['count']:5d} calls, mean {entry['mean_ms']:7.1f} ms, p95 {entry['p95_ms']:6.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
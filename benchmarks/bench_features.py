@@ -0,0 +1,139 @@
+"""
+Compare the per-player Python loop with the batched feature engine.
+
+Usage: python benchmarks/bench_features.py [--boxscores 3000] [--players 13] [--repeat 5]
+
+Synthetic boxscores are built from example_box_score_data.json with each
+team's roster padded to --players players and random statistics. Times are
+the best of --repeat runs; the feature engine is also split into parsing the
+JSON into live_records (done once per payload and shared with ingestion and
+the dashboard), flattening the records and aggregating the flattened frame.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feature_engine import aggregate_team_games, flatten_boxscores  # noqa: E402
+from live_records import game_record  # noqa: E402
+
+
+def legacy_process_game_stats(game_data, team_abv):
+    # The per-player loop nba_predictor.process_game_stats used before the feature engine
+    is_home = game_data['homeTeam']['teamTricode'] == team_abv
+    team_data = game_data['homeTeam'] if is_home else game_data['awayTeam']
+    active_players = [p for p in team_data.get('players', []) if p.get('played') == '1']
+    team_stats = {
+        'total_points': team_data['score'], 'is_home': 1 if is_home else 0,
+        'num_players': len(active_players), 'starters_points': 0, 'bench_points': 0,
+        'total_rebounds': 0, 'total_assists': 0,
+        'fg_percentage': 0, 'three_pt_percentage': 0, 'ft_percentage': 0,
+    }
+    for player in active_players:
+        stats = player.get('statistics', {})
+        points = int(stats.get('points', 0))
+        if player.get('starter') == '1':
+            team_stats['starters_points'] += points
+        else:
+            team_stats['bench_points'] += points
+        team_stats['total_rebounds'] += int(stats.get('reboundsTotal', 0))
+        team_stats['total_assists'] += int(stats.get('assists', 0))
+        fgm, fga = int(stats.get('fieldGoalsMade', 0)), int(stats.get('fieldGoalsAttempted', 0))
+        tpm, tpa = int(stats.get('threePointersMade', 0)), int(stats.get('threePointersAttempted', 0))
+        ftm, fta = int(stats.get('freeThrowsMade', 0)), int(stats.get('freeThrowsAttempted', 0))
+        if fga > 0:
+            team_stats['fg_percentage'] += (fgm / fga) * 100
+        if tpa > 0:
+            team_stats['three_pt_percentage'] += (tpm / tpa) * 100
+        if fta > 0:
+            team_stats['ft_percentage'] += (ftm / fta) * 100
+    if active_players:
+        for key in ('fg_percentage', 'three_pt_percentage', 'ft_percentage'):
+            team_stats[key] /= len(active_players)
+    return team_stats
+
+
+def random_player(template, rng, person_id, starter):
+    player = copy.deepcopy(template)
+    fga, tpa, fta = rng.randint(0, 20), rng.randint(0, 10), rng.randint(0, 10)
+    fgm, ftm = rng.randint(0, fga), rng.randint(0, fta)
+    tpm = min(rng.randint(0, tpa), fgm)
+    player.update(personId=person_id, starter='1' if starter else '0', played='1')
+    player['statistics'].update(
+        points=2 * fgm + tpm + ftm, reboundsTotal=rng.randint(0, 15), assists=rng.randint(0, 12),
+        fieldGoalsMade=fgm, fieldGoalsAttempted=fga, threePointersMade=tpm,
+        threePointersAttempted=tpa, freeThrowsMade=ftm, freeThrowsAttempted=fta,
+    )
+    return player
+
+
+def build_boxscores(num_boxscores, num_players, seed=0):
+    with open(os.path.join(ROOT, 'example_box_score_data.json')) as f:
+        template = json.load(f)['game']
+    rng = random.Random(seed)
+    boxscores = []
+    for i in range(num_boxscores):
+        game = copy.deepcopy(template)
+        game['gameId'] = f"00224{i:05d}"
+        for team in (game['homeTeam'], game['awayTeam']):
+            player_template = team['players'][0]
+            team['players'] = [random_player(player_template, rng, j, j < 5) for j in range(num_players)]
+            team['score'] = sum(p['statistics']['points'] for p in team['players'])
+        boxscores.append(game)
+    return boxscores
+
+
+def best_of(repeat, func):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def report(label, seconds, team_games):
+    print(f"{label:<18}: {seconds * 1000:8.1f} ms  ({team_games / seconds:10.0f} team-games/sec)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--boxscores', type=int, default=3000)
+    parser.add_argument('--players', type=int, default=13)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    boxscores = build_boxscores(args.boxscores, args.players)
+    team_games = [(game, team['teamTricode']) for game in boxscores for team in (game['homeTeam'], game['awayTeam'])]
+    print(f"{args.boxscores} boxscores, {len(team_games)} team-games, {args.players} players per team")
+
+    legacy_seconds, legacy = best_of(args.repeat, lambda: [legacy_process_game_stats(game, tricode) for game, tricode in team_games])
+    records_seconds, records = best_of(args.repeat, lambda: [game_record(game) for game in boxscores])
+    flatten_seconds, players = best_of(args.repeat, lambda: flatten_boxscores(records))
+    aggregate_seconds, teams = best_of(args.repeat, lambda: aggregate_team_games(players))
+    batched_seconds = records_seconds + flatten_seconds + aggregate_seconds
+
+    # Both paths must agree before their timings mean anything
+    assert teams['bench_points'].tolist() == [stats['bench_points'] for stats in legacy]
+    assert np.allclose(teams['fg_percentage'], [stats['fg_percentage'] for stats in legacy])
+
+    report('per-player loop', legacy_seconds, len(team_games))
+    report('feature engine', batched_seconds, len(team_games))
+    report('  parse to records', records_seconds, len(team_games))
+    report('  flatten', flatten_seconds, len(team_games))
+    report('  aggregate', aggregate_seconds, len(team_games))
+    print(f"speedup (end to end): {legacy_seconds / batched_seconds:.1f}x")
+    print(f"speedup (from records): {legacy_seconds / (flatten_seconds + aggregate_seconds):.1f}x")
+    print(f"speedup (aggregation only): {legacy_seconds / aggregate_seconds:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
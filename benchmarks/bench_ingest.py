@@ -0,0 +1,106 @@
+"""
+Compare per-row and batched ingestion throughput.
+
+Usage: python benchmarks/bench_ingest.py [--games 15] [--players 13] [--ticks 20]
+
+Every tick ingests the example scoreboard with its game repeated --games times
+and one copy of example_box_score_data.json per game, the same shape of work
+the dashboard does on each refresh. The example boxscore only lists a couple of
+players, so each team's player list is padded to --players copies with distinct
+ids to match a real roster.
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nba_live_stats_db import NBALiveStatsDB  # noqa: E402
+
+
+def load_example(file_name):
+    with open(os.path.join(ROOT, file_name)) as f:
+        return json.load(f)
+
+
+def pad_roster(team, num_players):
+    played = [p for p in team['players'] if p.get('played') == '1']
+    players = []
+    for i in range(num_players):
+        player = copy.deepcopy(played[i % len(played)])
+        player['personId'] = player['personId'] * 100 + i
+        players.append(player)
+    return dict(team, players=players)
+
+
+def build_slate(num_games, num_players=13):
+    scoreboard = load_example('example_game_data.json')
+    boxscore = load_example('example_box_score_data.json')
+    template = scoreboard['scoreboard']['games'][0]
+    game = dict(
+        boxscore['game'],
+        homeTeam=pad_roster(boxscore['game']['homeTeam'], num_players),
+        awayTeam=pad_roster(boxscore['game']['awayTeam'], num_players),
+    )
+
+    games, boxscores = [], []
+    for i in range(num_games):
+        game_id = f"00224{i:05d}"
+        games.append(dict(copy.deepcopy(template), gameId=game_id))
+        boxscores.append({'game': dict(game, gameId=game_id)})
+    scoreboard['scoreboard']['games'] = games
+    return scoreboard, boxscores
+
+
+def count_rows(scoreboard, boxscores):
+    games = len(scoreboard['scoreboard']['games'])
+    players = sum(
+        1 for b in boxscores
+        for team in ('homeTeam', 'awayTeam')
+        for p in b['game'][team]['players'] if p.get('played') == '1'
+    )
+    # games + 2 teams + 2 game_teams per game, plus one row per player who played
+    return games * 5 + players
+
+
+def run(batch_mode, scoreboard, boxscores, ticks, changed=True):
+    db = NBALiveStatsDB(':memory:', batch_mode=batch_mode)
+    db.process_refresh(scoreboard, boxscores)  # warm-up
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if changed:
+            # Forget what was ingested so every game counts as changed
+            db.fingerprints = {}
+        db.process_refresh(scoreboard, boxscores)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=15)
+    parser.add_argument('--players', type=int, default=13)
+    parser.add_argument('--ticks', type=int, default=20)
+    args = parser.parse_args()
+
+    scoreboard, boxscores = build_slate(args.games, args.players)
+    rows = count_rows(scoreboard, boxscores)
+
+    print(f"{args.games} games, {rows} rows per tick, {args.ticks} ticks")
+    results = {}
+    for label, batch_mode in (('per-row', False), ('batched', True)):
+        seconds = run(batch_mode, scoreboard, boxscores, args.ticks)
+        results[label] = seconds
+        print(f"{label:>9}: {seconds * 1000:8.1f} ms/tick {rows / seconds:10.0f} rows/sec")
+    print(f"  speedup: {results['per-row'] / results['batched']:.1f}x")
+
+    # Ticks where no game changed skip every write
+    seconds = run(True, scoreboard, boxscores, args.ticks, changed=False)
+    print(f"unchanged: {seconds * 1000:8.1f} ms/tick (all {rows} rows skipped)")
+
+
+if __name__ == '__main__':
+    main()
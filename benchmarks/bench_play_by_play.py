@@ -0,0 +1,110 @@
+"""
+Compare re-parsing a whole growing play-by-play feed every tick with ActionStream.
+
+Usage: python benchmarks/bench_play_by_play.py [--actions 600] [--per-tick 6] [--repeat 3]
+
+A synthetic feed of --actions actions is built by repeating the actions of
+example_play_by_play_data.json with new action numbers, and published
+--per-tick actions at a time, as the live CDN does over a game. Each tick
+either runs json.loads on the whole document and keeps the actions past the
+last one seen, or hands the document to ActionStream.new_actions. The database
+write of the new actions (process_actions) is timed separately. Times are the
+best of --repeat runs over the whole game.
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nba_live_stats_db import NBALiveStatsDB  # noqa: E402
+from play_by_play import ActionStream  # noqa: E402
+
+
+def synthetic_feed(num_actions):
+    with open(os.path.join(ROOT, 'example_play_by_play_data.json')) as f:
+        document = json.load(f)
+    template = document['game']['actions']
+    actions = []
+    for i in range(num_actions):
+        action = copy.deepcopy(template[i % len(template)])
+        action['actionNumber'] = i + 1
+        action['orderNumber'] = (i + 1) * 10000
+        actions.append(action)
+    return document, actions
+
+
+def published_texts(document, actions, per_tick):
+    # The feed as served at each tick, as the CDN sends it (compact JSON)
+    return [
+        json.dumps(dict(document, game=dict(document['game'], actions=actions[:end])), separators=(',', ':'))
+        for end in range(per_tick, len(actions) + per_tick, per_tick)
+    ]
+
+
+def full_parse(texts):
+    last_number = 0
+    new = 0
+    for text in texts:
+        actions = [action for action in json.loads(text)['game']['actions'] if action['actionNumber'] > last_number]
+        if actions:
+            last_number = actions[-1]['actionNumber']
+        new += len(actions)
+    return new
+
+
+def incremental_parse(texts):
+    stream = ActionStream()
+    return sum(len(stream.new_actions('0022000180', text)) for text in texts)
+
+
+def ingest(texts):
+    db = NBALiveStatsDB(':memory:')
+    stream = ActionStream()
+    try:
+        start = time.perf_counter()
+        for text in texts:
+            db.process_actions({'0022000180': stream.new_actions('0022000180', text)})
+        return time.perf_counter() - start
+    finally:
+        db.close()
+
+
+def best_of(repeat, func, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--actions', type=int, default=600)
+    parser.add_argument('--per-tick', type=int, default=6)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    document, actions = synthetic_feed(args.actions)
+    texts = published_texts(document, actions, args.per_tick)
+    print(f"{len(texts)} ticks, final feed {len(texts[-1]) / 1024:.0f} KB")
+
+    full_seconds, full_new = best_of(args.repeat, full_parse, texts)
+    stream_seconds, stream_new = best_of(args.repeat, incremental_parse, texts)
+    assert full_new == stream_new == len(actions)
+    print(f"json.loads every tick : {full_seconds * 1000:8.1f} ms per game")
+    print(f"ActionStream          : {stream_seconds * 1000:8.1f} ms per game ({full_seconds / stream_seconds:.1f}x)")
+
+    ingest_seconds = min(ingest(texts) for _ in range(args.repeat))
+    print(f"stream + process_actions: {ingest_seconds * 1000:6.1f} ms per game "
+          f"({ingest_seconds / len(texts) * 1000:.2f} ms per tick)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""
+Compare holding a slate's live payloads as JSON dicts with live_records.
+
+Usage: python benchmarks/bench_records.py [--games 15] [--repeat 5]
+
+A full slate of --games games is generated with replay.record_night and its
+final scoreboard and boxscores serialised as the CDN sends them. For each
+representation the benchmark reports the memory a process keeps while
+holding the slate (tracemalloc), the time to parse the texts into it, and the
+time to build the ingestion and dashboard player frame from it: the row
+tuples walked out of the dicts before live_records, or the columns joined
+from the records' arrays. Times are the best of --repeat runs.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from operator import itemgetter
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from live_records import game_record, scoreboard_records  # noqa: E402
+from nba_live_stats_db import PLAYER_FRAME_COLUMNS, boxscores_player_frame, clock_seconds_column  # noqa: E402
+from replay import record_night  # noqa: E402
+
+# Boxscore statistics of each player row, in PLAYER_FRAME_COLUMNS order
+LEGACY_STAT_FIELDS = [
+    'minutes', 'points', 'reboundsTotal', 'assists', 'fieldGoalsMade',
+    'fieldGoalsAttempted', 'fieldGoalsPercentage', 'threePointersMade',
+    'threePointersAttempted', 'freeThrowsMade', 'freeThrowsAttempted',
+    'plusMinusPoints', 'blocks'
+]
+
+
+def legacy_player_frame(games):
+    # How nba_live_stats_db.boxscores_player_frame walked the boxscore dicts before live_records
+    get_stats = itemgetter(*LEGACY_STAT_FIELDS)
+    rows = []
+    for game_data in games:
+        for team, is_home in ((game_data['homeTeam'], True), (game_data['awayTeam'], False)):
+            for player in team.get('players', []):
+                if player.get('played') == '1':
+                    rows.append((
+                        player['personId'], team['teamId'], game_data['gameId'],
+                        player['jerseyNum'], player['name'], player.get('position', ''),
+                        player['starter'] == '1', is_home
+                    ) + get_stats(player['statistics']))
+    players = pd.DataFrame(rows, columns=PLAYER_FRAME_COLUMNS)
+    players['seconds_played'] = clock_seconds_column(players['minutes'])
+    return players
+
+
+def slate_texts(num_games):
+    tick = record_night(num_games=num_games, ticks=130)[-1]
+    scoreboard = json.dumps(tick['scoreboard'], separators=(',', ':'))
+    boxscores = [json.dumps(boxscore, separators=(',', ':')) for boxscore in tick['boxscores'].values()]
+    return scoreboard, boxscores
+
+
+def parse_dicts(scoreboard, boxscores):
+    return json.loads(scoreboard)['scoreboard']['games'], [json.loads(text)['game'] for text in boxscores]
+
+
+def parse_records(scoreboard, boxscores):
+    return scoreboard_records(json.loads(scoreboard)), [game_record(json.loads(text)['game']) for text in boxscores]
+
+
+def retained_bytes(parse, *args):
+    # Memory still allocated once parsing is done and only the result is kept.
+    # A warm-up parse first, so the one-time growth of the interpreter's table
+    # of interned strings is not counted against the records.
+    parse(*args)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = parse(*args)
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del result
+    return retained
+
+
+def best_of(repeat, func, *args):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=15)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    scoreboard, boxscores = slate_texts(args.games)
+    text_bytes = len(scoreboard) + sum(len(text) for text in boxscores)
+
+    dict_bytes = retained_bytes(parse_dicts, scoreboard, boxscores)
+    record_bytes = retained_bytes(parse_records, scoreboard, boxscores)
+
+    dict_parse, (_, dict_games) = best_of(args.repeat, parse_dicts, scoreboard, boxscores)
+    record_parse, (_, record_games) = best_of(args.repeat, parse_records, scoreboard, boxscores)
+    dict_frame, legacy = best_of(args.repeat, legacy_player_frame, dict_games)
+    record_frame, players = best_of(args.repeat, boxscores_player_frame, record_games)
+    # Both paths must agree before their timings mean anything
+    assert legacy.astype(object).values.tolist() == players.astype(object).values.tolist()
+
+    print(f"{args.games} games, {len(players)} players, {text_bytes / 1024:.0f} KB of JSON")
+    print(f"memory held  : dicts {dict_bytes / 1024:8.0f} KB   records {record_bytes / 1024:8.0f} KB "
+          f"({dict_bytes / record_bytes:.1f}x smaller, {record_bytes / len(players):.0f} bytes per player)")
+    print(f"parse        : dicts {dict_parse * 1000:8.2f} ms   records {record_parse * 1000:8.2f} ms "
+          f"(+{(record_parse - dict_parse) * 1000:.2f} ms to build the records)")
+    print(f"player frame : dicts {dict_frame * 1000:8.2f} ms   records {record_frame * 1000:8.2f} ms "
+          f"({dict_frame / record_frame:.1f}x)")
+    print(f"parse + frame: dicts {(dict_parse + dict_frame) * 1000:8.2f} ms   "
+          f"records {(record_parse + record_frame) * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Simulate concurrent dashboard sessions against the live stats database.
+
+Usage: python benchmarks/bench_sessions.py [--sessions 32] [--renders 20] [--games 15] [--write-every 5]
+
+Each session is a thread that renders --renders pages (a read of the sidebar
+counts and one page of players), and every --write-every-th render also
+ingests a refresh. Two setups are compared: every render opening its own
+NBALiveStatsDB, as the page did before, and all sessions sharing one
+ConnectionManager. Reports render latency percentiles and errors (write
+conflicts and lock failures) for each.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from bench_ingest import build_slate  # noqa: E402
+from connection_manager import ConnectionManager  # noqa: E402
+from nba_live_stats_db import NBALiveStatsDB  # noqa: E402
+
+
+def render(db):
+    db.get_database_stats()
+    db.conn.execute("SELECT * FROM players ORDER BY game_id, player_id LIMIT 50").fetchall()
+
+
+def per_session_render(db_path, write, scoreboard, boxscores):
+    db = NBALiveStatsDB(db_path)
+    try:
+        if write:
+            db.process_refresh(scoreboard, boxscores)
+        render(db)
+    finally:
+        db.close()
+
+
+def managed_render(manager, write, scoreboard, boxscores):
+    if write:
+        with manager.writer() as db:
+            db.process_refresh(scoreboard, boxscores)
+    with manager.reader() as reader:
+        render(reader)
+
+
+def run_sessions(args, render_once):
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def session(index):
+        for i in range(args.renders):
+            start = time.perf_counter()
+            try:
+                render_once((index + i) % args.write_every == 0)
+            except Exception as e:
+                with lock:
+                    errors.append(type(e).__name__)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(args.sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def report(label, latencies, errors, seconds):
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000 if latencies else (float('nan'),) * 3
+    print(f"{label:<22}: p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  p99 {p99:7.1f} ms  "
+          f"{len(latencies) / seconds:7.1f} renders/sec  {len(errors)} errors")
+    for name in sorted(set(errors)):
+        print(f"  {errors.count(name)} x {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=32)
+    parser.add_argument('--renders', type=int, default=20)
+    parser.add_argument('--games', type=int, default=15)
+    parser.add_argument('--write-every', type=int, default=5)
+    args = parser.parse_args()
+
+    scoreboard, boxscores = build_slate(args.games)
+    print(f"{args.sessions} sessions x {args.renders} renders, a refresh of {args.games} games every {args.write_every} renders")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'per_session.db')
+        NBALiveStatsDB(db_path).close()
+        report('connection per render', *run_sessions(
+            args, lambda write: per_session_render(db_path, write, scoreboard, boxscores)
+        ))
+
+        manager = ConnectionManager(os.path.join(tmp, 'managed.db'))
+        report('connection manager', *run_sessions(
+            args, lambda write: managed_render(manager, write, scoreboard, boxscores)
+        ))
+        print(f"cursors opened: {manager.stats['cursors_opened']}, "
+              f"mean write wait: {manager.stats['write_wait_seconds'] / max(manager.stats['writes'], 1) * 1000:.1f} ms")
+        manager.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Query a full season of score and player stat snapshots.
+
+Usage: python benchmarks/bench_snapshots.py [--games 1230] [--queries 200]
+
+Fills score_snapshots and player_snapshots with synthetic histories (a row
+per scoring change, as the ingester stores them), then times score_timeline
+and player_line_at for random games and reports the storage used per game.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from nba_live_stats_db import NBALiveStatsDB, PLAYER_SNAPSHOT_COLUMNS, SCORE_SNAPSHOT_COLUMNS  # noqa: E402
+
+SCORE_CHANGES = 180
+PLAYERS_PER_GAME = 26
+LINE_CHANGES = 35
+
+
+def season_frames(game_ids, rng):
+    tip_offs = pd.Timestamp('2024-10-22 19:00') + pd.to_timedelta(np.arange(len(game_ids)) // 8, unit='D')
+    game = np.repeat(game_ids, SCORE_CHANGES)
+    step = np.tile(np.arange(SCORE_CHANGES), len(game_ids))
+    scores = pd.DataFrame({
+        'game_id': game,
+        'ts': np.repeat(tip_offs, SCORE_CHANGES) + pd.to_timedelta(step * 50, unit='s'),
+        'game_status': 2,
+        'period': 1 + step * 4 // SCORE_CHANGES,
+        'clock_seconds': 720.0 - (step * 16) % 720,
+        'home_score': step * 11 // 20,
+        'away_score': step * 10 // 20,
+    })[SCORE_SNAPSHOT_COLUMNS]
+
+    rows = len(game_ids) * PLAYERS_PER_GAME * LINE_CHANGES
+    step = np.tile(np.arange(LINE_CHANGES), len(game_ids) * PLAYERS_PER_GAME)
+    counts = {name: step * rng.integers(0, 2, rows) // 3 for name in PLAYER_SNAPSHOT_COLUMNS[5:-1]}
+    players = pd.DataFrame({
+        'game_id': np.repeat(game_ids, PLAYERS_PER_GAME * LINE_CHANGES),
+        'player_id': np.repeat(np.arange(len(game_ids) * PLAYERS_PER_GAME) % 500, LINE_CHANGES),
+        'team_id': np.repeat(np.arange(len(game_ids) * 2) % 30, PLAYERS_PER_GAME // 2 * LINE_CHANGES),
+        'ts': np.repeat(tip_offs, PLAYERS_PER_GAME * LINE_CHANGES) + pd.to_timedelta(step * 250, unit='s'),
+        'seconds_played': step * 60.0,
+        **counts,
+        'plus_minus': rng.integers(-20, 21, rows).astype(float),
+    })[PLAYER_SNAPSHOT_COLUMNS]
+    return scores, players, tip_offs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=1230)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    game_ids = np.array([f"00224{i:05d}" for i in range(args.games)])
+    scores, players, tip_offs = season_frames(game_ids, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'season.db')
+        db = NBALiveStatsDB(db_path)
+        for table, frame in (('score_snapshots', scores), ('player_snapshots', players)):
+            db.conn.register('season_frame', frame)
+            db.conn.execute(f"INSERT INTO {table} SELECT * FROM season_frame")
+            db.conn.unregister('season_frame')
+        db.conn.execute("CHECKPOINT")
+        size = os.path.getsize(db_path)
+
+        picks = rng.integers(0, args.games, args.queries)
+        start = time.perf_counter()
+        for i in picks:
+            db.score_timeline(game_ids[i])
+        timeline_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in picks:
+            db.player_line_at(game_ids[i], tip_offs[i] + pd.Timedelta(hours=1))
+        line_seconds = time.perf_counter() - start
+        db.close()
+
+    print(f"{args.games} games: {len(scores)} score rows, {len(players)} player rows")
+    print(f"storage          : {size / 2**20:8.1f} MiB  ({size / args.games / 1024:6.1f} KiB per game)")
+    print(f"score_timeline   : {timeline_seconds / args.queries * 1000:8.2f} ms per query")
+    print(f"player_line_at   : {line_seconds / args.queries * 1000:8.2f} ms per query")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Evaluate live win probability over many synthetic game states.
+
+Usage: python benchmarks/bench_win_probability.py [--states 100000] [--games 15] [--ticks 200]
+
+Times the vectorized win_probabilities over --states random states against a
+per-state loop, and LiveWinProbability.update over --ticks scoreboards of
+--games live games where every game changes on every tick.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from live_records import game_record  # noqa: E402
+from live_win_probability import GAME_SECONDS, LiveWinProbability, win_probabilities, win_probability  # noqa: E402
+
+
+def synthetic_games(num_games, tick, rng, template):
+    games = []
+    for i in range(num_games):
+        game = game_record(template)
+        game.game_id = f"00224{i:05d}"
+        game.status = 2
+        game.period = min(4, 1 + tick * 4 // 200)
+        game.clock = f"PT{rng.integers(0, 12):02d}M{rng.integers(0, 60):02d}.00S"
+        game.home.score = int(rng.integers(0, 130))
+        game.away.score = int(rng.integers(0, 130))
+        games.append(game)
+    return games
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--states', type=int, default=100000)
+    parser.add_argument('--games', type=int, default=15)
+    parser.add_argument('--ticks', type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    margins = rng.integers(-30, 31, args.states)
+    remaining = rng.uniform(0, GAME_SECONDS, args.states)
+
+    start = time.perf_counter()
+    looped = [win_probability(int(m), float(r)) for m, r in zip(margins, remaining)]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vectorized = win_probabilities(margins, remaining)
+    vector_seconds = time.perf_counter() - start
+    assert np.allclose(looped, vectorized)
+
+    with open(os.path.join(ROOT, 'example_game_data.json')) as f:
+        template = json.load(f)['scoreboard']['games'][0]
+    scoreboards = [synthetic_games(args.games, tick, rng, template) for tick in range(args.ticks)]
+    engine = LiveWinProbability()
+    start = time.perf_counter()
+    for games in scoreboards:
+        engine.update(games)
+    engine_seconds = time.perf_counter() - start
+
+    print(f"{args.states} states")
+    print(f"per-state loop   : {loop_seconds * 1000:8.1f} ms  ({args.states / loop_seconds:12.0f} states/sec)")
+    print(f"vectorized       : {vector_seconds * 1000:8.1f} ms  ({args.states / vector_seconds:12.0f} states/sec)")
+    print(f"{args.ticks} scoreboards of {args.games} live games")
+    print(f"engine update    : {engine_seconds / args.ticks * 1000:8.3f} ms per scoreboard  "
+          f"({args.games * args.ticks / engine_seconds:12.0f} states/sec)")
+
+
+if __name__ == '__main__':
+    main()
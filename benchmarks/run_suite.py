@@ -0,0 +1,211 @@
+"""
+End-to-end benchmark suite over a replayed night, checked against stored baselines.
+
+Usage: python benchmarks/run_suite.py [--games 10] [--ticks 130] [--renders 5]
+                                      [--baseline benchmarks/baselines.json] [--tolerance 0.3] [--update-baseline]
+
+A night is generated with replay.record_night and served by replay.ReplayServer,
+so nothing touches the network. The suite measures:
+
+- ingest: ingest_once ticks/sec against the replay server (fetch, write, snapshot)
+- write latency: process_refresh per tick, p50/p95/p99
+- predictor: predict_slate wall time for the night's opening slate, training a
+  model on synthetic team histories (game logs normally come from stats.nba.com)
+- render: one run of the dashboard (nba_stats.py under streamlit's AppTest)
+  reading a snapshot with live games, median of --renders runs
+
+Each metric is compared with the baseline file; a metric more than --tolerance
+worse than its baseline is reported as a regression and the exit status is 1.
+Baselines are machine-specific: rerun with --update-baseline after changing
+machines or after an intended change in performance.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import nba_predictor  # noqa: E402
+from boxscore_cache import BoxscoreCache  # noqa: E402
+from live_records import scoreboard_records  # noqa: E402
+from nba_live_stats_db import NBALiveStatsDB, ingest_once, write_snapshot  # noqa: E402
+from poll_scheduler import tipoff_timestamp  # noqa: E402
+from replay import ReplayServer, record_night  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baselines.json')
+# Metric name -> True when a higher value is better
+METRICS = {
+    'ingest_ticks_per_sec': True,
+    'write_p50_ms': False,
+    'write_p95_ms': False,
+    'write_p99_ms': False,
+    'predictor_seconds': False,
+    'render_seconds': False,
+}
+
+
+def bench_ingest(night, tmp):
+    cache = BoxscoreCache(os.path.join(tmp, 'cache'))
+    db_path, snapshot_path = os.path.join(tmp, 'ingest.db'), os.path.join(tmp, 'ingest.json')
+    with ReplayServer(night) as replay:
+        start = time.perf_counter()
+        for _ in night:
+            ingest_once(db_path, snapshot_path, replay.scoreboard_url, replay.boxscore_url, cache=cache)
+            replay.advance()
+        seconds = time.perf_counter() - start
+    return {'ingest_ticks_per_sec': len(night) / seconds}
+
+
+def bench_writes(night, tmp):
+    db = NBALiveStatsDB(os.path.join(tmp, 'writes.db'))
+    latencies = []
+    try:
+        for tick in night:
+            start = time.perf_counter()
+            db.process_refresh(tick['scoreboard'], list(tick['boxscores'].values()))
+            latencies.append(time.perf_counter() - start)
+    finally:
+        db.close()
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000
+    return {'write_p50_ms': p50, 'write_p95_ms': p95, 'write_p99_ms': p99}
+
+
+def synthetic_team_rows(team_abvs, games_per_team=50, seed=0):
+    # Round-robin history between the slate teams, shaped like build_teams_game_rows output
+    rng = np.random.default_rng(seed)
+    rows = {abv: [] for abv in team_abvs}
+    dates = pd.date_range('2024-10-22', periods=games_per_team, freq='2D')
+    for day, game_date in enumerate(dates):
+        order = rng.permutation(team_abvs)
+        for i in range(0, len(order) - 1, 2):
+            game_id = f"00224{day:03d}{i:02d}"
+            home_won = int(rng.integers(0, 2))
+            for abv, is_home, won in ((order[i], 1, home_won), (order[i + 1], 0, 1 - home_won)):
+                rows[abv].append({
+                    'game_id': game_id, 'game_date': game_date, 'won': won, 'is_home': is_home,
+                    'total_points': int(rng.integers(95, 130)), 'total_assists': int(rng.integers(18, 32)),
+                    'total_rebounds': int(rng.integers(36, 54)), 'fg_percentage': rng.uniform(40, 55),
+                    'three_pt_percentage': rng.uniform(28, 42), 'ft_percentage': rng.uniform(68, 88),
+                    'bench_points': int(rng.integers(20, 50)),
+                })
+    return {abv: pd.DataFrame(team_rows) for abv, team_rows in rows.items()}
+
+
+def bench_predictor(night):
+    scoreboard = night[0]['scoreboard']
+    games = scoreboard['scoreboard']['games']
+    team_abvs = [game[side]['teamTricode'] for game in games for side in ('homeTeam', 'awayTeam')]
+    team_rows = synthetic_team_rows(team_abvs)
+    build_teams_game_rows = nba_predictor.build_teams_game_rows
+    nba_predictor.build_teams_game_rows = lambda abvs, num_games=50: {abv: team_rows[abv] for abv in abvs}
+    try:
+        nba_predictor._slate_predictions.clear()
+        records = scoreboard_records(scoreboard)
+        before_tipoff = min(tipoff_timestamp(game) for game in records) - 60
+        start = time.perf_counter()
+        predictions = nba_predictor.predict_slate(records, now=before_tipoff)
+        seconds = time.perf_counter() - start
+    finally:
+        nba_predictor.build_teams_game_rows = build_teams_game_rows
+    assert len(predictions) == len(games)
+    return {'predictor_seconds': seconds}
+
+
+def bench_render(night, tmp, renders):
+    from streamlit.testing.v1 import AppTest
+
+    # A tick with live games, so the page renders once instead of sleeping until the next refresh
+    tick = next(tick for tick in night if any(game['gameStatus'] == 2 for game in tick['scoreboard']['scoreboard']['games']))
+    render_dir = os.path.join(tmp, 'render')
+    os.makedirs(render_dir)
+    cwd = os.getcwd()
+    os.chdir(render_dir)
+    try:
+        times = []
+        for _ in range(renders + 1):
+            write_snapshot({
+                'fetched_at': 'replay', 'scoreboard': tick['scoreboard'],
+                'boxscores': {game_id: boxscore['game'] for game_id, boxscore in tick['boxscores'].items()},
+                'write_stats': {'written': 0, 'skipped': 0}, 'database_stats': [0, 0, 0],
+            })
+            app = AppTest.from_file(os.path.join(ROOT, 'nba_stats.py'), default_timeout=120)
+            start = time.perf_counter()
+            app.run()
+            times.append(time.perf_counter() - start)
+            if app.exception:
+                raise RuntimeError(f"Dashboard raised: {app.exception[0].value}")
+    finally:
+        os.chdir(cwd)
+    # The first run also imports every module, so it is left out
+    return {'render_seconds': float(np.median(times[1:]))}
+
+
+def compare(results, baselines, tolerance):
+    """
+    Metrics more than `tolerance` (a fraction) worse than their baseline,
+    as (name, baseline, current) tuples
+    """
+    regressions = []
+    for name, higher_is_better in METRICS.items():
+        if name not in baselines or name not in results:
+            continue
+        baseline, current = baselines[name], results[name]
+        worse = current < baseline * (1 - tolerance) if higher_is_better else current > baseline * (1 + tolerance)
+        if worse:
+            regressions.append((name, baseline, current))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--games', type=int, default=10)
+    parser.add_argument('--ticks', type=int, default=130)
+    parser.add_argument('--renders', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.3)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args()
+
+    night = record_night(args.games, args.ticks)
+    print(f"Replaying {args.ticks} ticks of {args.games} games")
+    tmp = tempfile.mkdtemp()
+    try:
+        results = {}
+        results.update(bench_ingest(night, tmp))
+        results.update(bench_writes(night, tmp))
+        results.update(bench_predictor(night))
+        results.update(bench_render(night, tmp, args.renders))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baselines = json.load(f)
+    for name, value in results.items():
+        baseline = baselines.get(name)
+        change = f"{value / baseline - 1:+.0%} vs baseline {baseline:.2f}" if baseline else "no baseline"
+        print(f"{name:<22}: {value:10.2f}  ({change})")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({name: round(value, 4) for name, value in results.items()}, f, indent=2)
+        print(f"Baselines written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baselines, args.tolerance)
+    for name, baseline, current in regressions:
+        print(f"REGRESSION {name}: {current:.2f} vs baseline {baseline:.2f}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
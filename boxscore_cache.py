@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# gameStatus values used by the live CDN (1 = pre-game, 2 = live, 3 = final)
+GAME_STATUS_FINAL = 3
+
+
+class BoxscoreCache:
+    """
+    On-disk boxscore store keyed by game_id, shared by the dashboard and the predictor.
+
+    Final games never change, so they are kept until evicted. Anything that is
+    not final expires after `live_ttl` seconds. Entries are evicted least recently
+    used first once the store grows past `max_bytes`.
+    """
+
+    def __init__(self, cache_dir='.boxscore_cache', max_bytes=256 * 1024 * 1024, live_ttl=5):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_bytes = 0
+        # game_id -> entry dict, ordered from least to most recently used
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _path(self, game_id, final):
+        return os.path.join(self.cache_dir, f"{game_id}.{'final' if final else 'live'}.json")
+
+    def _load_index(self):
+        # The final flag lives in the file name and the store time in the mtime,
+        # so rebuilding the index never has to parse a payload.
+        found = []
+        for file_name in os.listdir(self.cache_dir):
+            parts = file_name.split('.')
+            if len(parts) != 3 or parts[2] != 'json' or parts[1] not in ('final', 'live'):
+                continue
+            path = os.path.join(self.cache_dir, file_name)
+            stat = os.stat(path)
+            found.append((stat.st_mtime, parts[0], parts[1] == 'final', stat.st_size))
+
+        for stored_at, game_id, final, size in sorted(found):
+            self._entries[game_id] = {
+                'final': final,
+                'stored_at': stored_at,
+                'size': size,
+                'digest': None,
+            }
+            self.total_bytes += size
+
+    def _is_fresh(self, entry):
+        return entry['final'] or time.time() - entry['stored_at'] < self.live_ttl
+
+    def _remove(self, game_id):
+        entry = self._entries.pop(game_id)
+        self.total_bytes -= entry['size']
+        try:
+            os.remove(self._path(game_id, entry['final']))
+        except FileNotFoundError:
+            pass
+
+    def get(self, game_id):
+        """
+        Return the cached 'game' section for game_id, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is None or not self._is_fresh(entry):
+                if entry is not None:
+                    self._remove(game_id)
+                self.misses += 1
+                return None
+            path = self._path(game_id, entry['final'])
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                # Removed behind our back, e.g. by another process evicting it
+                self._entries.pop(game_id)
+                self.total_bytes -= entry['size']
+                self.misses += 1
+                return None
+            self._entries.move_to_end(game_id)
+            self.hits += 1
+        return json.loads(raw)
+
+    def put(self, game_id, game_data):
+        """
+        Store the 'game' section of a boxscore. Returns the payload digest.
+        """
+        raw = json.dumps(game_data, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha1(raw).hexdigest()
+        final = game_data.get('gameStatus') == GAME_STATUS_FINAL
+
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is not None and entry['digest'] == digest and entry['final'] == final:
+                # Same payload as stored: only restart its TTL instead of rewriting the file
+                try:
+                    os.utime(self._path(game_id, final))
+                    entry['stored_at'] = time.time()
+                    self._entries.move_to_end(game_id)
+                    return digest
+                except FileNotFoundError:
+                    pass
+            if game_id in self._entries:
+                self._remove(game_id)
+            path = self._path(game_id, final)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(raw)
+            os.replace(tmp_path, path)
+
+            self._entries[game_id] = {
+                'final': final,
+                'stored_at': time.time(),
+                'size': len(raw),
+                'digest': digest,
+            }
+            self.total_bytes += len(raw)
+
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return digest
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            for game_id in list(self._entries):
+                self._remove(game_id)
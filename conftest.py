@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import nba_fetch
+from boxscore_cache import BoxscoreCache
+
+EXAMPLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_example(file_name):
+    with open(os.path.join(EXAMPLE_DIR, file_name)) as f:
+        return json.load(f)
+
+
+class LocalCDN:
+    """
+    Stand-in for the NBA CDN serving the example JSON files.
+
+    /boxscore_<id>.json returns the example boxscore with its gameId set to <id>,
+    /scoreboard.json returns the example scoreboard and /playbyplay_<id>.json
+    the first `play_by_play_actions` actions of the example play-by-play. Paths under /flaky/ answer
+    503 on the first request for each path, and `delay` slows every response.
+    Paths under /etag/ send ETag and Last-Modified validators and answer 304
+    to a matching If-None-Match or If-Modified-Since.
+    """
+
+    def __init__(self):
+        self.boxscore = load_example('example_box_score_data.json')
+        self.scoreboard = load_example('example_game_data.json')
+        self.play_by_play = load_example('example_play_by_play_data.json')
+        # Actions published so far; None publishes the whole feed
+        self.play_by_play_actions = None
+        self.delay = 0
+        self.requests = []
+        self.responses = []
+        self.last_modified = 'Thu, 16 Jan 2025 03:00:00 GMT'
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._failed_once = set()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.boxscore_url = self.url + "/boxscore_{game_id}.json"
+
+    def payload_for(self, path):
+        name = path.rsplit('/', 1)[-1]
+        if name == 'scoreboard.json':
+            return self.scoreboard
+        if name.startswith('boxscore_') and name.endswith('.json'):
+            game_id = name[len('boxscore_'):-len('.json')]
+            return dict(self.boxscore, game=dict(self.boxscore['game'], gameId=game_id))
+        if name.startswith('playbyplay_') and name.endswith('.json'):
+            game_id = name[len('playbyplay_'):-len('.json')]
+            actions = self.play_by_play['game']['actions'][:self.play_by_play_actions]
+            return dict(self.play_by_play, game=dict(self.play_by_play['game'], gameId=game_id, actions=actions))
+        return None
+
+    def _make_handler(self):
+        cdn = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with cdn._lock:
+                    cdn.requests.append(self.path)
+                    cdn.in_flight += 1
+                    cdn.max_in_flight = max(cdn.max_in_flight, cdn.in_flight)
+                    fail = self.path.startswith('/flaky/') and self.path not in cdn._failed_once
+                    cdn._failed_once.add(self.path)
+                try:
+                    time.sleep(cdn.delay)
+                    payload = cdn.payload_for(self.path)
+                    if fail or payload is None:
+                        self.send_response(503 if fail else 404)
+                        self.end_headers()
+                        return
+                    body = json.dumps(payload).encode('utf-8')
+                    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                    validated = self.path.startswith('/etag/')
+                    if validated and (
+                        self.headers.get('If-None-Match') == etag
+                        or self.headers.get('If-Modified-Since') == cdn.last_modified
+                        and self.headers.get('If-None-Match') is None
+                    ):
+                        cdn.responses.append(304)
+                        self.send_response(304)
+                        self.send_header('ETag', etag)
+                        self.end_headers()
+                        return
+                    cdn.responses.append(200)
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    if validated:
+                        self.send_header('ETag', etag)
+                        self.send_header('Last-Modified', cdn.last_modified)
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with cdn._lock:
+                        cdn.in_flight -= 1
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def local_cdn():
+    cdn = LocalCDN()
+    cdn.start()
+    yield cdn
+    cdn.stop()
+
+
+@pytest.fixture(autouse=True)
+def boxscore_cache(tmp_path_factory, monkeypatch):
+    # Keep the process-wide cache out of the working directory
+    cache = BoxscoreCache(str(tmp_path_factory.mktemp('boxscore_cache')))
+    monkeypatch.setattr(nba_fetch, '_boxscore_cache', cache)
+    return cache
@@ -0,0 +1,101 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from nba_live_stats_db import NBALiveStatsDB, open_database
+
+# Most read cursors handed out at once; further readers wait for one to come back
+READ_POOL_SIZE = 8
+
+class ConnectionManager:
+    """
+    The process's connection to the live stats database, open only while in use.
+
+    Writes go through one NBALiveStatsDB and are serialized by a lock, so
+    concurrent Streamlit sessions never interleave their transactions. Reads
+    use cursors of the same database (DuckDB connections sharing the open
+    file, safe to use from other threads), pooled so a page render does not
+    open a new connection. DuckDB has no per-connection read-only mode, so the
+    cursors are read-only by convention: writes belong in writer().
+
+    A read-write DuckDB connection locks the file against every other process,
+    readers included. The connection is therefore opened when the first
+    writer or reader arrives and closed when the last one leaves, so the
+    ingester, the backfill and the archiver can open the file between
+    refreshes, the same way ingest_once releases it after every tick.
+    """
+
+    def __init__(self, db_path='nba_live_stats.db', pool_size=READ_POOL_SIZE):
+        self.db_path = db_path
+        self.db = None
+        self._users = 0
+        self._open_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pool = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._stats_lock = threading.Lock()
+        self.stats = {'writes': 0, 'write_wait_seconds': 0.0, 'reads': 0, 'cursors_opened': 0,
+                      'connections_opened': 0}
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    @contextmanager
+    def _connection(self):
+        # Share the open database while anyone is using it; the last one out closes it
+        with self._open_lock:
+            if self.db is None:
+                self.db = open_database(self.db_path)
+                self._count('connections_opened')
+            self._users += 1
+            db = self.db
+        try:
+            yield db
+        finally:
+            with self._open_lock:
+                self._users -= 1
+                if self._users == 0:
+                    self._close()
+
+    def _close(self):
+        # Caller holds _open_lock and nobody is using the connection
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    @contextmanager
+    def writer(self):
+        """
+        Hold the write lock and yield the writer NBALiveStatsDB
+        """
+        start = time.perf_counter()
+        with self._write_lock:
+            self._count('write_wait_seconds', time.perf_counter() - start)
+            self._count('writes')
+            with self._connection() as db:
+                yield db
+
+    @contextmanager
+    def reader(self):
+        """
+        Borrow a pooled cursor, wrapped as a read-only NBALiveStatsDB
+        """
+        with self._slots, self._connection() as db:
+            try:
+                reader = self._pool.get_nowait()
+            except queue.Empty:
+                reader = NBALiveStatsDB(read_only=True, connection=db.conn.cursor(), archive_dir=db.archive_dir)
+                self._count('cursors_opened')
+            self._count('reads')
+            try:
+                yield reader
+            finally:
+                self._pool.put(reader)
+
+    def close(self):
+        with self._open_lock:
+            self._close()
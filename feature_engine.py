@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from live_records import PLAYER_COUNT_STATS, STAT_INDEX, joined_column
+
+# Boxscore statistics kept for every player, keyed by their column name
+PLAYER_STATS = {
+    'points': 'points',
+    'rebounds': 'reboundsTotal',
+    'assists': 'assists',
+    'fgm': 'fieldGoalsMade',
+    'fga': 'fieldGoalsAttempted',
+    'tpm': 'threePointersMade',
+    'tpa': 'threePointersAttempted',
+    'ftm': 'freeThrowsMade',
+    'fta': 'freeThrowsAttempted',
+}
+
+PLAYER_COLUMNS = ['game_id', 'team_tricode', 'team_game', 'is_home', 'team_score', 'starter'] + list(PLAYER_STATS)
+
+def flatten_boxscores(games):
+    """
+    Flatten the players of many boxscores (GameRecords, see live_records) into
+    one columnar frame with a row per player who played. The stat columns are
+    sliced straight out of the teams' PlayerTable arrays.
+    """
+    # One entry per team-game, repeated out to its players at the end
+    game_ids, tricodes, home_flags, scores, tables = [], [], [], [], []
+    for game in games:
+        if game is None:
+            continue
+        for team, is_home in ((game.home, True), (game.away, False)):
+            game_ids.append(game.game_id)
+            tricodes.append(team.tricode)
+            home_flags.append(is_home)
+            scores.append(team.score)
+            tables.append(team.players)
+
+    team_game = np.repeat(np.arange(len(tables), dtype=np.int64), [len(table) for table in tables])
+    stats = joined_column(tables, 'stats').reshape(-1, len(PLAYER_COUNT_STATS))
+    return pd.DataFrame({
+        'game_id': np.array(game_ids, dtype=object)[team_game],
+        'team_tricode': np.array(tricodes, dtype=object)[team_game],
+        'team_game': team_game,
+        'is_home': np.array(home_flags, dtype=bool)[team_game],
+        'team_score': np.array(scores, dtype=np.int64)[team_game],
+        'starter': joined_column(tables, 'starters').astype(bool),
+        **{name: stats[:, STAT_INDEX[key]].astype(np.int64) for name, key in PLAYER_STATS.items()},
+    })
+
+def _ratio(made, attempted):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(attempted > 0, made / attempted * 100, 0.0)
+
+def aggregate_team_games(players):
+    """
+    Per team-game aggregates from a flattened player frame, summed per group
+    with np.bincount over the team_game numbers.
+
+    fg/three_pt/ft_percentage are the mean of the player percentages over the
+    players who played (players without attempts count as 0). The *_weighted
+    columns are the team's made shots over its attempts.
+    """
+    # Renumber the team-games that have players so the codes are dense
+    groups, codes = np.unique(players['team_game'].to_numpy(), return_inverse=True)
+    num_groups = len(groups)
+    stat = {name: players[name].to_numpy(dtype=np.float64) for name in PLAYER_STATS}
+    starter = players['starter'].to_numpy()
+
+    def total(values):
+        return np.bincount(codes, weights=values, minlength=num_groups)
+
+    # Team-level columns are the same on every player row, so take the first
+    first = np.zeros(num_groups, dtype=np.int64)
+    first[codes[::-1]] = np.arange(len(codes))[::-1]
+    num_players = np.bincount(codes, minlength=num_groups)
+    sums = {name: total(values) for name, values in stat.items()}
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_pct = {
+            name: total(_ratio(stat[made], stat[attempted])) / num_players
+            for name, (made, attempted) in (
+                ('fg_percentage', ('fgm', 'fga')),
+                ('three_pt_percentage', ('tpm', 'tpa')),
+                ('ft_percentage', ('ftm', 'fta')),
+            )
+        }
+
+    return pd.DataFrame({
+        'game_id': players['game_id'].to_numpy()[first],
+        'team_tricode': players['team_tricode'].to_numpy()[first],
+        'total_points': players['team_score'].to_numpy()[first],
+        'is_home': players['is_home'].to_numpy()[first].astype(np.int64),
+        'num_players': num_players,
+        'starters_points': total(np.where(starter, stat['points'], 0.0)),
+        'bench_points': total(np.where(starter, 0.0, stat['points'])),
+        'total_rebounds': sums['rebounds'],
+        'total_assists': sums['assists'],
+        **mean_pct,
+        'fg_pct_weighted': _ratio(sums['fgm'], sums['fga']),
+        'three_pt_pct_weighted': _ratio(sums['tpm'], sums['tpa']),
+        'ft_pct_weighted': _ratio(sums['ftm'], sums['fta']),
+    })
+
+def team_game_features(boxscores):
+    """
+    Aggregate features for every team in every boxscore (GameRecords), one row per team-game
+    """
+    return aggregate_team_games(flatten_boxscores(boxscores))
@@ -0,0 +1,141 @@
+import hashlib
+from array import array
+from itertools import chain
+from operator import itemgetter
+from sys import intern
+
+import numpy as np
+
+# Counting statistics kept for every player, in the column order of PlayerTable.stats
+PLAYER_COUNT_STATS = (
+    'points', 'reboundsTotal', 'assists', 'fieldGoalsMade', 'fieldGoalsAttempted',
+    'threePointersMade', 'threePointersAttempted', 'freeThrowsMade', 'freeThrowsAttempted', 'blocks'
+)
+STAT_INDEX = {key: i for i, key in enumerate(PLAYER_COUNT_STATS)}
+
+# numpy dtype of each array field of PlayerTable
+ARRAY_DTYPES = {'person_ids': np.int64, 'starters': np.int8, 'stats': np.int32, 'fg_percentages': np.float64,
+                'plus_minus': np.float64}
+
+_get_counts = itemgetter(*PLAYER_COUNT_STATS)
+_get_line = itemgetter('minutes', 'fieldGoalsPercentage', 'plusMinusPoints')
+_get_player = itemgetter('personId', 'name', 'jerseyNum', 'starter', 'statistics')
+
+class PlayerTable:
+    """
+    The players of one team who played in a game, stored by column.
+
+    Ids, starters and stats live in typed arrays (the counting stats as one
+    row-major array, a row per player); names and the other strings are
+    interned, since the same players come back every tick. Players who did
+    not play, and every field the app never reads, are dropped while parsing.
+    """
+
+    __slots__ = ('person_ids', 'names', 'jersey_nums', 'positions', 'starters', 'minutes',
+                 'stats', 'fg_percentages', 'plus_minus')
+
+    def __init__(self, players):
+        rows = [_get_player(player) for player in players if player.get('played') == '1']
+        person_ids, names, jersey_nums, starters, statistics = zip(*rows) if rows else ((),) * 5
+        self.person_ids = array('q', person_ids)
+        self.names = tuple(map(intern, names))
+        self.jersey_nums = tuple(map(intern, jersey_nums))
+        self.positions = tuple([intern(player.get('position', '')) for player in players if player.get('played') == '1'])
+        self.starters = array('b', map('1'.__eq__, starters))
+        try:
+            self.stats = array('i', chain.from_iterable(map(_get_counts, statistics)))
+            minutes, fg_percentages, plus_minus = zip(*map(_get_line, statistics)) if rows else ((),) * 3
+        except KeyError:
+            self.stats = array('i', [stats.get(key, 0) for stats in statistics for key in PLAYER_COUNT_STATS])
+            minutes = [stats['minutes'] for stats in statistics]
+            fg_percentages = [stats.get('fieldGoalsPercentage', 0.0) for stats in statistics]
+            plus_minus = [stats.get('plusMinusPoints', 0.0) for stats in statistics]
+        self.minutes = tuple(minutes)
+        self.fg_percentages = array('d', fg_percentages)
+        self.plus_minus = array('d', plus_minus)
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    def stat_matrix(self):
+        """
+        The counting stats as a (players, PLAYER_COUNT_STATS) numpy view, without copying
+        """
+        return np.frombuffer(self.stats, dtype=np.int32).reshape(-1, len(PLAYER_COUNT_STATS))
+
+class TeamRecord:
+    """
+    One side of a scoreboard game or boxscore. wins and losses are None for a
+    boxscore, and players is None for a scoreboard game.
+    """
+
+    __slots__ = ('team_id', 'name', 'city', 'tricode', 'wins', 'losses', 'score', 'in_bonus',
+                 'timeouts_remaining', 'period1_score', 'players')
+
+    def __init__(self, team):
+        self.team_id = team['teamId']
+        self.name = intern(team['teamName'])
+        self.city = intern(team['teamCity'])
+        self.tricode = intern(team['teamTricode'])
+        self.wins = team.get('wins')
+        self.losses = team.get('losses')
+        self.score = team['score']
+        self.in_bonus = team.get('inBonus')
+        self.timeouts_remaining = team.get('timeoutsRemaining')
+        periods = team.get('periods')
+        self.period1_score = periods[0]['score'] if periods else None
+        self.players = PlayerTable(team['players']) if 'players' in team else None
+
+class GameRecord:
+    """
+    The fields of a scoreboard game or a boxscore's 'game' section that the
+    app reads, with the two teams as TeamRecords
+    """
+
+    __slots__ = ('game_id', 'status', 'status_text', 'period', 'clock', 'time_utc', 'game_et',
+                 'regulation_periods', 'series_game_number', 'series_text', 'home', 'away')
+
+    def __init__(self, game):
+        self.game_id = game['gameId']
+        self.status = game['gameStatus']
+        self.status_text = intern(game.get('gameStatusText', ''))
+        self.period = game['period']
+        self.clock = game.get('gameClock', '')
+        self.time_utc = game['gameTimeUTC']
+        self.game_et = game['gameEt']
+        self.regulation_periods = game.get('regulationPeriods')
+        self.series_game_number = game.get('seriesGameNumber', '')
+        self.series_text = game.get('seriesText', '')
+        self.home = TeamRecord(game['homeTeam'])
+        self.away = TeamRecord(game['awayTeam'])
+
+def joined_column(tables, field):
+    """
+    One array field (see PlayerTable.__slots__) of many PlayerTables, joined
+    end to end into a single numpy array
+    """
+    return np.frombuffer(b''.join([getattr(table, field) for table in tables]), dtype=ARRAY_DTYPES[field])
+
+def players_digest(game):
+    """
+    Digest of both teams' PlayerTables of a boxscore GameRecord: it changes
+    whenever any player's line does, even if the score and clock did not
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for table in (game.home.players, game.away.players):
+        for field in PlayerTable.__slots__:
+            value = getattr(table, field)
+            digest.update(value if field in ARRAY_DTYPES else repr(value).encode('utf-8'))
+    return digest.hexdigest()
+
+def game_record(game):
+    """
+    GameRecord for a scoreboard game or a boxscore's 'game' section (None stays None)
+    """
+    return None if game is None else GameRecord(game)
+
+def scoreboard_records(scoreboard_data):
+    """
+    GameRecords for every game of a scoreboard payload
+    """
+    return [GameRecord(game) for game in scoreboard_data['scoreboard']['games']]
@@ -0,0 +1,158 @@
+import math
+import threading
+from collections import deque
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+from poll_scheduler import GAME_STATUS_FINAL, GAME_STATUS_LIVE, clock_seconds
+
+# Regulation is four 12-minute quarters; each overtime is 5 minutes
+PERIOD_SECONDS = 12 * 60
+REGULATION_PERIODS = 4
+OVERTIME_SECONDS = 5 * 60
+GAME_SECONDS = PERIOD_SECONDS * REGULATION_PERIODS
+# Standard deviation of the final home margin over a full game, in points
+MARGIN_SIGMA = 13.5
+# Expected home margin from home court alone, in points
+HOME_EDGE = 2.5
+# Points kept per timeline; the oldest go first (a game rarely reaches this)
+MAX_TIMELINE_POINTS = 2000
+
+def seconds_remaining(period, game_clock):
+    """
+    Seconds left in the game, counting the remaining regulation periods.
+    In overtime only the current period's clock is left.
+    """
+    clock = clock_seconds(game_clock)
+    if period <= 0:
+        return float(GAME_SECONDS)
+    if period > REGULATION_PERIODS:
+        return clock
+    return (REGULATION_PERIODS - period) * PERIOD_SECONDS + clock
+
+def pregame_margin(home_win_probability):
+    """
+    Expected home margin implied by a pre-game win probability
+    """
+    probability = min(max(home_win_probability, 0.001), 0.999)
+    return MARGIN_SIGMA * float(ndtri(probability))
+
+def win_probabilities(margins, remaining, expected_margins=HOME_EDGE):
+    """
+    Home win probability for arrays of game states.
+
+    The rest of the game is treated as a normal random walk: the final margin
+    is the current margin plus the remaining share of the expected margin, with
+    variance shrinking in proportion to the time left. All arguments broadcast.
+    """
+    margins = np.asarray(margins, dtype=np.float64)
+    share = np.clip(np.asarray(remaining, dtype=np.float64) / GAME_SECONDS, 0.0, None)
+    mean = margins + np.asarray(expected_margins, dtype=np.float64) * share
+    sigma = MARGIN_SIGMA * np.sqrt(share)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        probabilities = ndtr(mean / sigma)
+    # With no time left the result is decided (a tie goes to overtime)
+    return np.where(sigma > 0, probabilities, np.sign(margins) * 0.5 + 0.5)
+
+def win_probability(margin, remaining, expected_margin=HOME_EDGE):
+    """
+    Home win probability for a single game state
+    """
+    if remaining <= 0:
+        return 0.5 if margin == 0 else float(margin > 0)
+    share = remaining / GAME_SECONDS
+    z = (margin + expected_margin * share) / (MARGIN_SIGMA * math.sqrt(share))
+    return 0.5 * math.erfc(-z / math.sqrt(2))
+
+class LiveWinProbability:
+    """
+    Home win probability of every live game, updated from each scoreboard.
+
+    Games are only re-evaluated when their score, period or clock changed
+    since the last scoreboard, and each evaluation is appended to the game's
+    timeline (at most MAX_TIMELINE_POINTS). A game is forgotten once it is
+    final or no longer on the scoreboard, so the process-wide instance does
+    not grow from one night to the next. Nothing is trained or fetched here,
+    so it is cheap to run on every refresh.
+    """
+
+    def __init__(self):
+        # game_id -> expected home margin from a pre-game prediction
+        self._expected_margin = {}
+        # game_id -> (period, gameClock, home score, away score) last evaluated
+        self._last_state = {}
+        # game_id -> deque of {'elapsed', 'period', 'clock', 'margin', 'home_win_probability'}
+        self.timelines = {}
+        self._lock = threading.Lock()
+
+    def set_pregame(self, game_id, home_win_probability):
+        """
+        Use a pre-game prediction as the game's prior instead of home court alone
+        """
+        with self._lock:
+            self._expected_margin[game_id] = pregame_margin(home_win_probability)
+
+    def update(self, games):
+        """
+        Evaluate the live games (GameRecords) of a scoreboard whose state changed.
+        Returns game_id -> current home win probability for those games.
+        """
+        changed = []
+        with self._lock:
+            self._forget_games(games)
+            for game in games:
+                if game.status != GAME_STATUS_LIVE:
+                    continue
+                state = (game.period, game.clock, game.home.score, game.away.score)
+                if self._last_state.get(game.game_id) == state:
+                    continue
+                self._last_state[game.game_id] = state
+                changed.append(game)
+
+            if not changed:
+                return {}
+
+            margins = [game.home.score - game.away.score for game in changed]
+            remaining = [seconds_remaining(game.period, game.clock) for game in changed]
+            expected = [self._expected_margin.get(game.game_id, HOME_EDGE) for game in changed]
+            probabilities = win_probabilities(margins, remaining, expected)
+
+            results = {}
+            for game, margin, left, probability in zip(changed, margins, remaining, probabilities):
+                elapsed = GAME_SECONDS - left if game.period <= REGULATION_PERIODS else (
+                    GAME_SECONDS + (game.period - REGULATION_PERIODS) * OVERTIME_SECONDS - left
+                )
+                timeline = self.timelines.get(game.game_id)
+                if timeline is None:
+                    timeline = self.timelines[game.game_id] = deque(maxlen=MAX_TIMELINE_POINTS)
+                timeline.append({
+                    'elapsed': elapsed,
+                    'period': game.period,
+                    'clock': game.clock,
+                    'margin': margin,
+                    'home_win_probability': float(probability),
+                })
+                results[game.game_id] = float(probability)
+            return results
+
+    def _forget_games(self, games):
+        # Timelines of games that are not live any more, and priors of games
+        # that left the scoreboard
+        live = {game.game_id for game in games if game.status == GAME_STATUS_LIVE}
+        listed = {game.game_id for game in games if game.status != GAME_STATUS_FINAL}
+        for game_id in [game_id for game_id in self._last_state if game_id not in live]:
+            self._last_state.pop(game_id)
+            self.timelines.pop(game_id, None)
+        for game_id in [game_id for game_id in self._expected_margin if game_id not in listed]:
+            self._expected_margin.pop(game_id)
+
+    def current(self, game_id):
+        """
+        Latest home win probability of a game, or None if it was never evaluated
+        """
+        timeline = self.timelines.get(game_id)
+        return timeline[-1]['home_win_probability'] if timeline else None
+
+    def timeline(self, game_id):
+        return list(self.timelines.get(game_id, []))
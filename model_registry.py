@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+from datetime import datetime
+
+import joblib
+
+MODEL_DIR = 'models'
+
+class ModelRegistry:
+    """
+    Versioned prediction models on disk.
+
+    Each version is a joblib file holding the fitted model, its scaler and
+    metadata (feature list, training window, accuracy), with the metadata
+    also written next to it as JSON. Versions are timestamps, so the newest
+    one sorts last.
+    """
+
+    def __init__(self, model_dir=MODEL_DIR):
+        self.model_dir = model_dir
+
+    def _path(self, version, extension):
+        return os.path.join(self.model_dir, f"model-{version}.{extension}")
+
+    def versions(self):
+        if not os.path.isdir(self.model_dir):
+            return []
+        return sorted(
+            name[len('model-'):-len('.joblib')] for name in os.listdir(self.model_dir)
+            if name.startswith('model-') and name.endswith('.joblib')
+        )
+
+    def latest_version(self):
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def save(self, model, scaler, metadata):
+        """
+        Write a new version and return its name
+        """
+        os.makedirs(self.model_dir, exist_ok=True)
+        version = datetime.now().strftime('%Y%m%d-%H%M%S')
+        suffix = 1
+        while os.path.exists(self._path(version, 'joblib')):
+            version = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{suffix}"
+            suffix += 1
+
+        metadata = dict(metadata, version=version, trained_at=datetime.now().isoformat(timespec='seconds'))
+        path = self._path(version, 'joblib')
+        # Written under a temporary name so a reader never loads half a model
+        joblib.dump({'model': model, 'scaler': scaler, 'metadata': metadata}, path + '.tmp')
+        os.replace(path + '.tmp', path)
+        with open(self._path(version, 'json'), 'w') as f:
+            json.dump(metadata, f, indent=2)
+        return version
+
+    def metadata(self, version=None):
+        version = version or self.latest_version()
+        if version is None:
+            return None
+        with open(self._path(version, 'json')) as f:
+            return json.load(f)
+
+    def load(self, version=None):
+        """
+        Load a version (the latest by default) as a dict with 'model', 'scaler',
+        'metadata' and 'version', or None if nothing has been trained yet
+        """
+        version = version or self.latest_version()
+        if version is None:
+            return None
+        artifact = joblib.load(self._path(version, 'joblib'))
+        artifact['version'] = version
+        return artifact
+
+def retrain(model_dir=MODEL_DIR, num_games=50, window=None):
+    """
+    Train a league-wide model on the latest games and save it as a new version
+    """
+    # Imported here so listing models does not pull in nba_api
+    from nba_predictor import FORM_WINDOW, train_league_model
+
+    model, scaler, metadata = train_league_model(num_games, window or FORM_WINDOW)
+    version = ModelRegistry(model_dir).save(model, scaler, metadata)
+    print(f"Saved model {version}: {metadata['training_rows']} games, accuracy {metadata['accuracy']:.2%}")
+    return version
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="NBA prediction model registry")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    retrain_parser = subcommands.add_parser('retrain', help="train on every team's recent games and save a new version")
+    retrain_parser.add_argument('--dir', default=MODEL_DIR)
+    retrain_parser.add_argument('--games', type=int, default=50, help="recent games per team")
+    retrain_parser.add_argument('--window', type=int, help="games averaged into each team's form")
+    list_parser = subcommands.add_parser('list', help="show the saved versions")
+    list_parser.add_argument('--dir', default=MODEL_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'retrain':
+        retrain(args.dir, args.games, args.window)
+    elif args.command == 'list':
+        registry = ModelRegistry(args.dir)
+        for version in registry.versions():
+            metadata = registry.metadata(version)
+            print(f"{version}  {metadata['training_rows']} games  "
+                  f"{metadata['first_game_date']} to {metadata['last_game_date']}  accuracy {metadata['accuracy']:.2%}")
@@ -0,0 +1,141 @@
+import glob
+import os
+from datetime import date
+
+ARCHIVE_DIR = 'nba_archive'
+# Per-game tables rolled out of the live database; teams stays since every game refers to it
+ARCHIVED_TABLES = (
+    'games', 'game_teams', 'players', 'score_snapshots', 'player_snapshots',
+    'actions', 'pbp_player_stats', 'pbp_team_stats'
+)
+# Key of each archived table, used when a date's new rows are merged with the
+# rows archived before. The snapshot tables have none: identical rows are merged.
+ARCHIVE_KEYS = {
+    'games': ['game_id'],
+    'game_teams': ['game_id', 'team_id'],
+    'players': ['player_id', 'game_id'],
+    'score_snapshots': None,
+    'player_snapshots': None,
+    'actions': ['game_id', 'action_number'],
+    'pbp_player_stats': ['game_id', 'player_id'],
+    'pbp_team_stats': ['game_id', 'team_id'],
+}
+
+def completed_game_dates(conn, today=None):
+    """
+    Game dates (ET) before today on which every game is final
+    """
+    today = today or date.today()
+    rows = conn.execute("""
+        SELECT CAST(gameEt AS DATE) AS game_date
+        FROM games
+        GROUP BY game_date
+        HAVING bool_and(gameStatus = 3) AND game_date < ?
+        ORDER BY game_date
+    """, [today]).fetchall()
+    return [row[0] for row in rows]
+
+def archived_files(table_dir, dates):
+    """
+    Parquet files already archived for the given game dates
+    """
+    files = []
+    for game_date in dates:
+        files += glob.glob(os.path.join(table_dir, 'season=*', f'game_date={game_date}', '*.parquet'))
+    return sorted(files)
+
+def archive_completed_dates(db, archive_dir=ARCHIVE_DIR, today=None):
+    """
+    Move every completed game date out of the live tables into Parquet files
+    partitioned by season (its starting year) and game date, e.g.
+    nba_archive/players/season=2024/game_date=2025-01-16/data_<uuid>.parquet.
+
+    A date that was archived before (a game ingested again, or a backfill
+    finishing a date an earlier run started) has its archived rows merged
+    with the new ones, newer rows winning, and written to new files; the old
+    files are only removed after that. Archiving again after an interruption
+    therefore neither loses nor duplicates rows. Returns the dates archived
+    and the live rows moved per table.
+    """
+    dates = completed_game_dates(db.conn, today)
+    if not dates:
+        return {'dates': [], 'rows': {}}
+
+    db.conn.execute("""
+        CREATE OR REPLACE TEMP TABLE archived_games AS
+        SELECT
+            game_id,
+            CAST(gameEt AS DATE) AS game_date,
+            CASE WHEN month(gameEt) >= 10 THEN year(gameEt) ELSE year(gameEt) - 1 END AS season
+        FROM games
+        WHERE CAST(gameEt AS DATE) IN (SELECT unnest(?::DATE[]))
+    """, [dates])
+
+    rows = {}
+    replaced_files = []
+    for table in ARCHIVED_TABLES:
+        table_dir = os.path.join(archive_dir, table)
+        os.makedirs(table_dir, exist_ok=True)
+        new_rows = f"""
+            SELECT t.*, a.season, a.game_date, 0 AS archive_source
+            FROM {table} AS t JOIN archived_games AS a USING (game_id)
+        """
+        rows[table] = db.conn.execute(f"SELECT count(*) FROM ({new_rows})").fetchone()[0]
+        existing = archived_files(table_dir, dates)
+        if existing:
+            file_list = ', '.join(f"'{path}'" for path in existing)
+            merged = f"""
+                {new_rows}
+                UNION ALL BY NAME
+                SELECT *, 1 AS archive_source FROM read_parquet([{file_list}], hive_partitioning = true)
+            """
+            keys = ARCHIVE_KEYS[table]
+            if keys:
+                query = f"""
+                    SELECT * EXCLUDE (archive_source) FROM ({merged})
+                    QUALIFY row_number() OVER (PARTITION BY {', '.join(keys)} ORDER BY archive_source) = 1
+                """
+            else:
+                query = f"SELECT DISTINCT * EXCLUDE (archive_source) FROM ({merged})"
+        else:
+            query = f"SELECT * EXCLUDE (archive_source) FROM ({new_rows})"
+        db.conn.execute(f"""
+            COPY ({query}) TO '{table_dir}' (
+                FORMAT PARQUET, PARTITION_BY (season, game_date),
+                OVERWRITE_OR_IGNORE, FILENAME_PATTERN 'data_{{uuid}}'
+            )
+        """)
+        replaced_files += existing
+
+    # The merged files now hold everything the old ones did
+    for path in replaced_files:
+        os.remove(path)
+    # Only delete once every table has been written out
+    with db.transaction():
+        for table in ARCHIVED_TABLES:
+            db.conn.execute(f"DELETE FROM {table} WHERE game_id IN (SELECT game_id FROM archived_games)")
+    db.conn.execute("DROP TABLE archived_games")
+    db.conn.execute("CHECKPOINT")
+    return {'dates': dates, 'rows': rows}
+
+def attach_archive(conn, archive_dir=ARCHIVE_DIR):
+    """
+    Create an all_<table> view for each archived table: its live rows plus the
+    archived Parquet files read through read_parquet. Archived rows also carry
+    season and game_date (NULL for live rows), so filters on them skip whole
+    partitions.
+    """
+    for table in ARCHIVED_TABLES:
+        pattern = os.path.join(archive_dir, table, '**', '*.parquet')
+        if glob.glob(pattern, recursive=True):
+            conn.execute(f"""
+                CREATE OR REPLACE TEMP VIEW all_{table} AS
+                SELECT * FROM {table}
+                UNION ALL BY NAME
+                SELECT * FROM read_parquet('{pattern}', hive_partitioning = true)
+            """)
+        else:
+            conn.execute(f"""
+                CREATE OR REPLACE TEMP VIEW all_{table} AS
+                SELECT *, NULL::BIGINT AS season, NULL::DATE AS game_date FROM {table}
+            """)
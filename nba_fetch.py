@@ -0,0 +1,333 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from boxscore_cache import GAME_STATUS_FINAL, BoxscoreCache
+from live_records import game_record
+from nba_metrics import metrics
+
+BOXSCORE_URL = "https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{game_id}.json"
+SCOREBOARD_URL = "https://nba-prod-us-east-1-mediaops-stats.s3.amazonaws.com/NBA/liveData/scoreboard/todaysScoreboard_00.json"
+
+# Defaults for talking to the CDN
+MAX_WORKERS = 8
+REQUEST_TIMEOUT = 10
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# URLs whose validators and last payload are remembered for conditional requests
+MAX_CONDITIONAL_URLS = 64
+
+_boxscore_cache = None
+_boxscore_cache_lock = threading.Lock()
+_session = None
+_session_lock = threading.Lock()
+
+def get_boxscore_cache():
+    """
+    Return the boxscore cache shared by everything running in this process.
+    It is created on first use, so importing this module touches no files.
+    """
+    global _boxscore_cache
+    with _boxscore_cache_lock:
+        if _boxscore_cache is None:
+            _boxscore_cache = BoxscoreCache()
+        return _boxscore_cache
+
+def boxscore_cache_stats():
+    # An empty report until something has used the cache
+    cache = _boxscore_cache
+    return cache.stats() if cache is not None else {}
+
+def get_session():
+    """
+    Return the process-wide requests session, so connections to the CDN are reused
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=MAX_WORKERS)
+            _session.mount('https://', adapter)
+            _session.mount('http://', adapter)
+        return _session
+
+def get_response(url, headers=None, timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES, backoff=BACKOFF_BASE):
+    """
+    GET a URL, retrying connection errors and retryable status codes with
+    jittered exponential backoff
+    """
+    session = get_session()
+    for attempt in range(retries + 1):
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == retries:
+                response.raise_for_status()
+                return response
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        # Full jitter keeps parallel workers from retrying in lockstep
+        time.sleep(random.uniform(0, backoff * 2 ** attempt))
+
+class RateLimiter:
+    """
+    Spaces calls to wait() at least 1 / rate seconds apart, across threads.
+    A rate of None or 0 never waits.
+    """
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def get_json(url, timeout=REQUEST_TIMEOUT, retries=MAX_RETRIES, backoff=BACKOFF_BASE):
+    """
+    GET a JSON document with retries
+    """
+    return get_response(url, timeout=timeout, retries=retries, backoff=backoff).json()
+
+class ConditionalFetcher:
+    """
+    Fetches JSON documents with conditional requests.
+
+    The ETag/Last-Modified validators, a content hash and the payload of
+    recently fetched URLs are remembered. A 304 response, or a 200 whose body
+    hashes the same as last time, returns the remembered payload without
+    parsing it again. With a convert function (e.g. scoreboard_records) only
+    what it returns is remembered, so an unchanged payload hands back the same
+    records instead of rebuilding them from a kept copy of the JSON.
+    """
+
+    def __init__(self, max_urls=MAX_CONDITIONAL_URLS):
+        self.max_urls = max_urls
+        self.requests = 0
+        self.not_modified = 0
+        self.unchanged_bodies = 0
+        self.bytes_fetched = 0
+        self.bytes_saved = 0
+        self.parse_seconds = 0.0
+        self.parse_seconds_saved = 0.0
+        # url -> {'etag', 'last_modified', 'digest', 'size', 'parse_seconds', 'convert', 'data'}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=REQUEST_TIMEOUT, convert=None, on_change=None):
+        """
+        Return (data, changed) for a URL. `changed` is False when the payload is
+        the same one returned by the previous call for this URL. A changed
+        payload is parsed, passed to on_change(parsed) if given, and returned as
+        convert(parsed). Call it with the same convert every time for a URL.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        if entry is not None and entry['convert'] is not convert:
+            # Remembered in another form, so it cannot be handed back as is
+            entry = None
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = get_response(url, headers=headers, timeout=timeout)
+
+        with self._lock:
+            self.requests += 1
+            if response.status_code == 304 and entry is not None:
+                self.not_modified += 1
+                self.bytes_saved += entry['size']
+                self.parse_seconds_saved += entry['parse_seconds']
+                self._entries.move_to_end(url)
+                return entry['data'], False
+
+            body = response.content
+            self.bytes_fetched += len(body)
+            digest = hashlib.sha1(body).digest()
+            if entry is not None and entry['digest'] == digest:
+                self.unchanged_bodies += 1
+                self.parse_seconds_saved += entry['parse_seconds']
+                self._remember(url, response, entry)
+                return entry['data'], False
+
+        start = time.perf_counter()
+        data = json.loads(body)
+        parse_seconds = time.perf_counter() - start
+        metrics.record('parse.json', parse_seconds)
+        if on_change is not None:
+            on_change(data)
+        if convert is not None:
+            start = time.perf_counter()
+            data = convert(data)
+            metrics.record('parse.records', time.perf_counter() - start)
+
+        with self._lock:
+            self.parse_seconds += parse_seconds
+            self._remember(url, response, {
+                'digest': digest, 'size': len(body),
+                'parse_seconds': parse_seconds, 'convert': convert, 'data': data,
+            })
+        return data, True
+
+    def _remember(self, url, response, entry):
+        entry['etag'] = response.headers.get('ETag')
+        entry['last_modified'] = response.headers.get('Last-Modified')
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_urls:
+            self._entries.popitem(last=False)
+
+    def forget(self, url):
+        with self._lock:
+            self._entries.pop(url, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'not_modified': self.not_modified,
+                'unchanged_bodies': self.unchanged_bodies,
+                'bytes_fetched': self.bytes_fetched,
+                'bytes_saved': self.bytes_saved,
+                'parse_seconds': self.parse_seconds,
+                'parse_seconds_saved': self.parse_seconds_saved,
+            }
+
+# Single conditional fetcher shared by everything running in this process
+conditional_fetcher = ConditionalFetcher()
+# Bytes fetched and cache hit rates show up in every metrics report
+metrics.register_source('conditional_fetch', conditional_fetcher.stats)
+metrics.register_source('boxscore_cache', boxscore_cache_stats)
+
+def fetch_scoreboard(url=SCOREBOARD_URL, timeout=REQUEST_TIMEOUT, fetcher=None, convert=None):
+    """
+    Fetch today's scoreboard. Returns (data, changed), with data passed
+    through convert (e.g. scoreboard_records) when given.
+    """
+    with metrics.timer('fetch.scoreboard'):
+        return (fetcher or conditional_fetcher).get(url, timeout=timeout, convert=convert)
+
+def boxscore_record(data):
+    """
+    GameRecord of a boxscore payload, or None when it has no 'game' section
+    """
+    return game_record(data.get('game')) if data else None
+
+def fetch_boxscore_conditional(game_id, cache=None, url_template=BOXSCORE_URL, timeout=REQUEST_TIMEOUT, fetcher=None,
+                               records=False):
+    """
+    Return (game_data, unchanged) for a boxscore. `unchanged` is True only when
+    the CDN confirmed the payload matches the previous fetch (a 304 or an
+    identical body). Cache hits do not count, since whoever reads them may not
+    have seen them yet. With records=True game_data is a GameRecord, and the
+    fetcher keeps only the record of a live game between polls.
+    """
+    cache = cache or get_boxscore_cache()
+    game_data = cache.get(game_id)
+    if game_data is not None:
+        return (game_record(game_data) if records else game_data), False
+
+    def store(data):
+        if data and 'game' in data:
+            cache.put(game_id, data['game'])
+
+    fetcher = fetcher or conditional_fetcher
+    url = url_template.format(game_id=game_id)
+    with metrics.timer('fetch.boxscore'):
+        data, changed = fetcher.get(url, timeout=timeout, convert=boxscore_record if records else None, on_change=store)
+    game = data if records else (data or {}).get('game')
+    if game is None:
+        return None, not changed
+
+    status = game.status if records else game.get('gameStatus')
+    if status == GAME_STATUS_FINAL:
+        # The cache keeps final games for good, so there is nothing left to revalidate
+        fetcher.forget(url)
+    return game, not changed
+
+def fetch_boxscore(game_id, cache=None, url_template=BOXSCORE_URL, timeout=REQUEST_TIMEOUT, records=False):
+    """
+    Return the 'game' section of a boxscore (a GameRecord with records=True),
+    serving it from the cache when it is still fresh. Returns None when the
+    payload has no 'game' key.
+    """
+    return fetch_boxscore_conditional(game_id, cache, url_template, timeout, records=records)[0]
+
+def fetch_boxscores(game_ids, cache=None, url_template=BOXSCORE_URL, max_workers=MAX_WORKERS,
+                    timeout=REQUEST_TIMEOUT, with_unchanged=False, records=False):
+    """
+    Fetch many boxscores concurrently over pooled connections.
+
+    Returns a dict of game_id -> 'game' section (a GameRecord with
+    records=True) in the order the ids were given. Games that could not be
+    fetched map to None. With with_unchanged=True, returns (results,
+    unchanged_ids) where unchanged_ids lists the games the CDN reported as
+    identical to their previous fetch.
+    """
+    game_ids = list(dict.fromkeys(game_ids))
+
+    def fetch_one(game_id):
+        try:
+            return fetch_boxscore_conditional(game_id, cache=cache, url_template=url_template, timeout=timeout,
+                                              records=records)
+        except Exception as e:
+            print(f"Error fetching boxscore for game ID {game_id}: {e}")
+            return None, False
+
+    with metrics.timer('fetch.boxscores'):
+        if len(game_ids) <= 1:
+            fetched = [fetch_one(game_id) for game_id in game_ids]
+        else:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(game_ids)))) as executor:
+                fetched = list(executor.map(fetch_one, game_ids))
+
+    results = {game_id: game_data for game_id, (game_data, _) in zip(game_ids, fetched)}
+    if not with_unchanged:
+        return results
+    unchanged_ids = [game_id for game_id, (game_data, unchanged) in zip(game_ids, fetched) if game_data and unchanged]
+    return results, unchanged_ids
+
+def fetch_due_boxscores(games, scheduler=None, latest=None, records=False, **kwargs):
+    """
+    Fetch the boxscores of the started games (GameRecords) that are due: all
+    of them without a scheduler, otherwise those its poll_due reports. Final
+    games are marked persisted with the scheduler once fetched.
+
+    `latest` (game_id -> boxscore) is updated with what was fetched, so it
+    keeps the previous boxscore of every game that was not due. Other keyword
+    arguments go to fetch_boxscores. Returns (fetched, unchanged_ids) like
+    fetch_boxscores(with_unchanged=True).
+    """
+    started_ids = [game.game_id for game in games if game.status != 1]
+    if scheduler is None:
+        due_ids = started_ids
+    else:
+        due = {game.game_id for game in games if scheduler.poll_due(game)}
+        due_ids = [game_id for game_id in started_ids if game_id in due]
+
+    fetched, unchanged_ids = fetch_boxscores(due_ids, with_unchanged=True, records=records, **kwargs)
+    if latest is not None:
+        latest.update((game_id, game) for game_id, game in fetched.items() if game)
+    if scheduler is not None:
+        for game_id, game in fetched.items():
+            if game and (game.status if records else game['gameStatus']) == GAME_STATUS_FINAL:
+                scheduler.mark_persisted(game_id)
+    return fetched, unchanged_ids
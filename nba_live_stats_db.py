@@ -1,10 +1,314 @@
+import argparse
 import duckdb
-from datetime import datetime
+import hashlib
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import chain
+from datetime import date, datetime
+from live_records import PLAYER_COUNT_STATS, STAT_INDEX, game_record, joined_column, players_digest, scoreboard_records
+from nba_archive import ARCHIVE_DIR, archive_completed_dates, attach_archive
+from nba_fetch import BOXSCORE_URL, MAX_WORKERS, SCOREBOARD_URL, fetch_due_boxscores, fetch_scoreboard
+from nba_metrics import METRICS_PATH, metrics
+from play_by_play import PLAYBYPLAY_URL, ActionStream
+from poll_scheduler import GAME_STATUS_FINAL, PollScheduler, clock_seconds
+
+# Latest scoreboard and boxscores written by the ingester for the dashboard to read
+SNAPSHOT_PATH = 'nba_snapshot.json'
+# A snapshot older than this means the ingester is not running
+SNAPSHOT_MAX_AGE = 120
+# Shortest and longest wait between ingester ticks; in between, the poll
+# scheduler decides based on the state of each game
+MIN_INGEST_INTERVAL = 5
+INGEST_INTERVAL = 120
+
+# Column order of each table, shared by the per-row and batched ingestion paths
+GAME_COLUMNS = [
+    'game_id', 'gameStatus', 'gameStatusText', 'period', 'gameClock',
+    'gameTimeUTC', 'gameEt', 'regulationPeriods', 'seriesGameNumber',
+    'seriesText', 'last_updated'
+]
+TEAM_COLUMNS = ['team_id', 'team_name', 'team_city', 'team_tricode', 'wins', 'losses']
+GAME_TEAM_COLUMNS = [
+    'game_id', 'team_id', 'is_home', 'score', 'in_bonus',
+    'timeouts_remaining', 'points_period1', 'last_updated'
+]
+PLAYER_COLUMNS = [
+    'player_id', 'team_id', 'game_id', 'jersey_num', 'name', 'position',
+    'starter', 'minutes', 'points', 'rebounds', 'assists', 'field_goals_made',
+    'field_goals_attempted', 'field_goals_percentage', 'three_pointers_made',
+    'three_pointers_attempted', 'free_throws_made', 'free_throws_attempted',
+    'plus_minus', 'last_updated'
+]
+# Player frame columns taken from PlayerTable's counting stats, and the boxscore field of each
+PLAYER_FRAME_STATS = {
+    'points': 'points', 'rebounds': 'reboundsTotal', 'assists': 'assists',
+    'field_goals_made': 'fieldGoalsMade', 'field_goals_attempted': 'fieldGoalsAttempted',
+    'three_pointers_made': 'threePointersMade', 'three_pointers_attempted': 'threePointersAttempted',
+    'free_throws_made': 'freeThrowsMade', 'free_throws_attempted': 'freeThrowsAttempted', 'blocks': 'blocks',
+}
+# Columns of boxscore_player_frame: the players table's, minus last_updated,
+# plus what the dashboard shows; seconds_played is added from minutes
+PLAYER_FRAME_COLUMNS = PLAYER_COLUMNS[:7] + ['is_home'] + PLAYER_COLUMNS[7:-1] + ['blocks']
+
+# Append-only history tables: the columns of each row, the columns naming one
+# series (a game's score, a player's line in a game) and the columns compared
+# with the series' latest row. A row is only appended when those differ, so
+# the running clock and minutes alone never add rows.
+SCORE_SNAPSHOT_COLUMNS = ['game_id', 'ts', 'game_status', 'period', 'clock_seconds', 'home_score', 'away_score']
+PLAYER_SNAPSHOT_COLUMNS = [
+    'game_id', 'player_id', 'team_id', 'ts', 'seconds_played', 'points', 'rebounds',
+    'assists', 'field_goals_made', 'field_goals_attempted', 'three_pointers_made',
+    'three_pointers_attempted', 'free_throws_made', 'free_throws_attempted', 'plus_minus'
+]
+SNAPSHOT_SERIES = {
+    'score_snapshots': (['game_id'], ['game_status', 'period', 'home_score', 'away_score']),
+    'player_snapshots': (['game_id', 'player_id'], PLAYER_SNAPSHOT_COLUMNS[5:]),
+}
+
+# Counting stats summed into player_season_totals
+PLAYER_TOTAL_COLUMNS = [
+    'points', 'rebounds', 'assists', 'field_goals_made', 'field_goals_attempted',
+    'three_pointers_made', 'three_pointers_attempted', 'free_throws_made', 'free_throws_attempted'
+]
+# Columns of the actions table, one row per play-by-play action
+ACTION_COLUMNS = [
+    'game_id', 'action_number', 'order_number', 'period', 'clock', 'clock_seconds', 'time_actual',
+    'team_id', 'player_id', 'action_type', 'sub_type', 'shot_result', 'is_field_goal',
+    'shot_distance', 'assist_player_id', 'score_home', 'score_away', 'description'
+]
+# Stats derived from the actions into pbp_player_stats and pbp_team_stats:
+# what one action credits to its player, as SQL over an actions row
+ACTION_STAT_SQL = {
+    'points': "CASE WHEN shot_result = 'Made' THEN CASE action_type"
+              " WHEN '3pt' THEN 3 WHEN '2pt' THEN 2 WHEN 'freethrow' THEN 1 ELSE 0 END ELSE 0 END",
+    'rebounds': "action_type = 'rebound'",
+    'assists': "false",
+    'field_goals_made': "is_field_goal AND shot_result = 'Made'",
+    'field_goals_attempted': "is_field_goal",
+    'three_pointers_made': "action_type = '3pt' AND shot_result = 'Made'",
+    'three_pointers_attempted': "action_type = '3pt'",
+    'free_throws_made': "action_type = 'freethrow' AND shot_result = 'Made'",
+    'free_throws_attempted': "action_type = 'freethrow'",
+    'steals': "action_type = 'steal'",
+    'blocks': "action_type = 'block'",
+    'turnovers': "action_type = 'turnover'",
+    'fouls': "action_type = 'foul'",
+}
+ACTION_STAT_COLUMNS = list(ACTION_STAT_SQL)
+TEAM_RESULT_COLUMNS = ['season', 'team_id', 'game_id', 'game_date', 'is_home', 'points', 'opponent_points', 'won']
+# Games averaged into team_form's recent-form columns
+TEAM_FORM_GAMES = 10
+
+# NBA game ids encode the season's starting year: 0022400001 is a 2024-25 game
+SEASON_SQL = "2000 + CAST(substr({0}, 4, 2) AS INTEGER)"
+# Seconds in a "PT32M10.00S" minutes string
+SECONDS_PLAYED_SQL = (
+    "coalesce(TRY_CAST(regexp_extract({0}, 'PT(\\d+)M', 1) AS INTEGER) * 60"
+    " + TRY_CAST(regexp_extract({0}, 'M([\\d.]+)S', 1) AS DOUBLE), 0)"
+)
+
+# Primary key of each table, used to drop duplicate rows inside a batch
+TABLE_KEYS = {
+    'games': ['game_id'],
+    'teams': ['team_id'],
+    'game_teams': ['game_id', 'team_id'],
+    'players': ['player_id', 'game_id'],
+    'ingest_fingerprints': ['game_id', 'source'],
+    'team_results': ['team_id', 'game_id'],
+    'actions': ['game_id', 'action_number'],
+    'backfill_progress': ['game_id'],
+}
+
+def fingerprint(*values):
+    """
+    Compact, process-independent 64-bit fingerprint of a tuple of values
+    """
+    digest = hashlib.blake2b(repr(values).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+def scoreboard_game_fingerprint(game):
+    """
+    Fingerprint of everything a scoreboard game (a GameRecord) writes: score,
+    period, clock and status, plus the team fields stored alongside them
+    """
+    teams = tuple(
+        (t.team_id, t.score, t.wins, t.losses, t.in_bonus, t.timeouts_remaining, t.period1_score)
+        for t in (game.home, game.away)
+    )
+    return fingerprint(game.status, game.status_text, game.period, game.clock, teams)
+
+def boxscore_game_fingerprint(game):
+    """
+    Fingerprint of a boxscore's (GameRecord's) score, period, clock and status,
+    and of every player's line, so a foul or a rebound during a stoppage is
+    written even though the score and clock stayed put
+    """
+    return fingerprint(game.status, game.period, game.clock, game.home.score, game.away.score, players_digest(game))
+
+def scoreboard_frames(games, current_time=None, game_ids=None):
+    """
+    Flatten scoreboard GameRecords into one DataFrame per table, optionally
+    keeping only the games in game_ids
+    """
+    current_time = current_time or datetime.now()
+    game_rows, teams, game_teams = [], [], []
+
+    for game in games:
+        if game_ids is not None and game.game_id not in game_ids:
+            continue
+        game_rows.append((
+            game.game_id, game.status, game.status_text, game.period, game.clock, game.time_utc,
+            game.game_et, game.regulation_periods, game.series_game_number, game.series_text,
+            current_time
+        ))
+        for team, is_home in ((game.home, True), (game.away, False)):
+            teams.append((team.team_id, team.name, team.city, team.tricode, team.wins, team.losses))
+            game_teams.append((
+                game.game_id, team.team_id, is_home, team.score, team.in_bonus,
+                team.timeouts_remaining, team.period1_score, current_time
+            ))
+
+    return {
+        'games': pd.DataFrame(game_rows, columns=GAME_COLUMNS),
+        'teams': pd.DataFrame(teams, columns=TEAM_COLUMNS),
+        'game_teams': pd.DataFrame(game_teams, columns=GAME_TEAM_COLUMNS),
+    }
+
+def clock_seconds_column(clocks):
+    """
+    clock_seconds for a whole column of ISO duration strings at once
+    """
+    parts = pd.Series(clocks, dtype=object).str.extract(r'PT(\d+)M([\d.]+)S')
+    return (parts[0].astype(float) * 60 + parts[1].astype(float)).fillna(0.0)
+
+def boxscore_player_frame(game):
+    """
+    Every player who played in a boxscore (a GameRecord), both teams in one
+    tidy frame. The ingestion frames and the dashboard's player tables are
+    both built from it.
+    """
+    return boxscores_player_frame([game])
+
+def boxscores_player_frame(games):
+    """
+    boxscore_player_frame for many boxscores at once. Each column is joined
+    from the PlayerTable arrays of every team, without a row per player.
+    """
+    sides = [(game, team, is_home) for game in games for team, is_home in ((game.home, True), (game.away, False))]
+    tables = [team.players for _, team, _ in sides]
+    counts = [len(table) for table in tables]
+    stats = joined_column(tables, 'stats').reshape(-1, len(PLAYER_COUNT_STATS))
+    columns = {
+        'player_id': joined_column(tables, 'person_ids'),
+        'team_id': np.repeat(np.array([team.team_id for _, team, _ in sides], dtype=np.int64), counts),
+        'game_id': np.repeat(np.array([game.game_id for game, _, _ in sides], dtype=object), counts),
+        'jersey_num': list(chain.from_iterable(table.jersey_nums for table in tables)),
+        'name': list(chain.from_iterable(table.names for table in tables)),
+        'position': list(chain.from_iterable(table.positions for table in tables)),
+        'starter': joined_column(tables, 'starters').astype(bool),
+        'is_home': np.repeat(np.array([is_home for _, _, is_home in sides], dtype=bool), counts),
+        'minutes': list(chain.from_iterable(table.minutes for table in tables)),
+        'field_goals_percentage': joined_column(tables, 'fg_percentages'),
+        'plus_minus': joined_column(tables, 'plus_minus'),
+    }
+    for column, key in PLAYER_FRAME_STATS.items():
+        columns[column] = stats[:, STAT_INDEX[key]]
+
+    players = pd.DataFrame(columns, columns=PLAYER_FRAME_COLUMNS)
+    players['seconds_played'] = clock_seconds_column(players['minutes'])
+    return players
+
+def boxscore_frames(game, current_time=None):
+    """
+    Flatten a boxscore (a GameRecord) into one DataFrame per table
+    """
+    players = boxscore_player_frame(game)
+    players['last_updated'] = current_time or datetime.now()
+    return {'players': players[PLAYER_COLUMNS]}
+
+def score_snapshot_frame(games, current_time=None, game_ids=None):
+    """
+    One score_snapshots row per scoreboard GameRecord, optionally only for game_ids
+    """
+    current_time = current_time or datetime.now()
+    rows = [
+        (game.game_id, current_time, game.status, game.period, clock_seconds(game.clock), game.home.score, game.away.score)
+        for game in games
+        if game_ids is None or game.game_id in game_ids
+    ]
+    return pd.DataFrame(rows, columns=SCORE_SNAPSHOT_COLUMNS)
+
+def team_result_frame(games, game_ids=None):
+    """
+    One team_results row per team of every final GameRecord, optionally only for game_ids
+    """
+    rows = []
+    for game in games:
+        if game.status != GAME_STATUS_FINAL or (game_ids is not None and game.game_id not in game_ids):
+            continue
+        season = 2000 + int(game.game_id[3:5])
+        game_date = datetime.strptime(game.game_et[:10], '%Y-%m-%d').date()
+        for team, opponent, is_home in ((game.home, game.away, True), (game.away, game.home, False)):
+            rows.append((
+                season, team.team_id, game.game_id, game_date, is_home,
+                team.score, opponent.score, team.score > opponent.score
+            ))
+    return pd.DataFrame(rows, columns=TEAM_RESULT_COLUMNS)
+
+def action_frame(game_id, actions):
+    """
+    actions rows for a list of play-by-play actions of one game
+    """
+    rows = [
+        (
+            game_id, action['actionNumber'], action.get('orderNumber'), action['period'],
+            action['clock'], action.get('timeActual'), action.get('teamId'), action.get('personId') or None,
+            action['actionType'], action.get('subType'), action.get('shotResult'),
+            bool(action.get('isFieldGoal')), action.get('shotDistance'), action.get('assistPersonId'),
+            int(action.get('scoreHome') or 0), int(action.get('scoreAway') or 0), action.get('description')
+        )
+        for action in actions
+    ]
+    columns = [column for column in ACTION_COLUMNS if column != 'clock_seconds']
+    frame = pd.DataFrame(rows, columns=columns)
+    frame.insert(5, 'clock_seconds', clock_seconds_column(frame['clock']))
+    frame['time_actual'] = pd.to_datetime(frame['time_actual'], format='ISO8601', utc=True).dt.tz_localize(None)
+    for column in ('team_id', 'player_id', 'assist_player_id'):
+        frame[column] = frame[column].astype('Int64')
+    frame['shot_distance'] = frame['shot_distance'].astype(float)
+    return frame
+
+def player_snapshot_frame(players):
+    """
+    player_snapshots rows from a players frame (see boxscore_frames)
+    """
+    snapshots = players.rename(columns={'last_updated': 'ts'})
+    snapshots['seconds_played'] = clock_seconds_column(snapshots['minutes'])
+    snapshots['plus_minus'] = snapshots['plus_minus'].astype(float)
+    return snapshots[PLAYER_SNAPSHOT_COLUMNS]
 
 class NBALiveStatsDB:
-    def __init__(self, db_path='nba_live_stats.db'):
-        self.conn = duckdb.connect(db_path)
-        self.create_tables()
+    def __init__(self, db_path='nba_live_stats.db', batch_mode=True, read_only=False, archive_dir=ARCHIVE_DIR,
+                 connection=None):
+        # An existing connection or cursor (see connection_manager) can be wrapped instead
+        self.conn = connection if connection is not None else duckdb.connect(db_path, read_only=read_only)
+        # Completed game dates are moved here as Parquet (see nba_archive)
+        self.archive_dir = archive_dir
+        # Batched mode upserts each table with one set-based statement per payload;
+        # otherwise every row is written with its own INSERT OR REPLACE
+        self.batch_mode = batch_mode
+        self.read_only = read_only
+        self._in_transaction = False
+        # Rows written and skipped by the most recent batched write
+        self.last_write_stats = {'written': 0, 'skipped': 0}
+        if not read_only:
+            self.create_tables()
+            self._load_fingerprints()
     
     def create_tables(self):
         # Games table - from scoreboard data
@@ -78,9 +382,526 @@ class NBALiveStatsDB:
             )
         """)
 
+        # Last ingested fingerprint per game and payload source ('scoreboard' or
+        # 'boxscore'), so unchanged games can skip their writes across restarts
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_fingerprints (
+                game_id VARCHAR,
+                source VARCHAR,
+                fingerprint BIGINT,
+                PRIMARY KEY (game_id, source)
+            )
+        """)
+
+        # Games already loaded by the historical backfill (see backfill.py), so
+        # an interrupted run resumes where it stopped
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS backfill_progress (
+                game_id VARCHAR PRIMARY KEY,
+                loaded_at TIMESTAMP
+            )
+        """)
+
+        # Append-only score and player stat history, one row per change
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS score_snapshots (
+                game_id VARCHAR,
+                ts TIMESTAMP,
+                game_status TINYINT,
+                period TINYINT,
+                clock_seconds DOUBLE,
+                home_score SMALLINT,
+                away_score SMALLINT
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS player_snapshots (
+                game_id VARCHAR,
+                player_id INTEGER,
+                team_id INTEGER,
+                ts TIMESTAMP,
+                seconds_played DOUBLE,
+                points SMALLINT,
+                rebounds SMALLINT,
+                assists SMALLINT,
+                field_goals_made SMALLINT,
+                field_goals_attempted SMALLINT,
+                three_pointers_made SMALLINT,
+                three_pointers_attempted SMALLINT,
+                free_throws_made SMALLINT,
+                free_throws_attempted SMALLINT,
+                plus_minus DOUBLE
+            )
+        """)
+
+        # Play-by-play actions, appended as the feed grows, and the player and
+        # team stats derived from them
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS actions (
+                game_id VARCHAR,
+                action_number INTEGER,
+                order_number BIGINT,
+                period TINYINT,
+                clock VARCHAR,
+                clock_seconds DOUBLE,
+                time_actual TIMESTAMP,
+                team_id INTEGER,
+                player_id INTEGER,
+                action_type VARCHAR,
+                sub_type VARCHAR,
+                shot_result VARCHAR,
+                is_field_goal BOOLEAN,
+                shot_distance DOUBLE,
+                assist_player_id INTEGER,
+                score_home SMALLINT,
+                score_away SMALLINT,
+                description VARCHAR,
+                PRIMARY KEY (game_id, action_number)
+            )
+        """)
+        stat_columns = ',\n'.join(f"{column} INTEGER" for column in ACTION_STAT_COLUMNS)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS pbp_player_stats (
+                game_id VARCHAR,
+                player_id INTEGER,
+                team_id INTEGER,
+                {stat_columns},
+                PRIMARY KEY (game_id, player_id)
+            )
+        """)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS pbp_team_stats (
+                game_id VARCHAR,
+                team_id INTEGER,
+                {stat_columns},
+                PRIMARY KEY (game_id, team_id)
+            )
+        """)
+
+        # Secondary indexes for per-team and per-player lookups
+        self.conn.execute("CREATE INDEX IF NOT EXISTS players_team_game ON players (team_id, game_id)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS players_name ON players (name)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS game_teams_team_game ON game_teams (team_id, game_id)")
+
+        # Summary tables maintained during ingestion. They are not archived,
+        # so they keep covering games that have moved to the Parquet archive.
+        total_columns = ',\n'.join(f"{column} INTEGER" for column in PLAYER_TOTAL_COLUMNS)
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS player_season_totals (
+                season INTEGER,
+                player_id INTEGER,
+                name VARCHAR,
+                team_id INTEGER,
+                games INTEGER,
+                seconds_played DOUBLE,
+                {total_columns},
+                PRIMARY KEY (season, player_id)
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS player_season_totals_name ON player_season_totals (name)")
+        # Each game's line as last added to player_season_totals. The players
+        # rows leave with the archive, so a re-ingested game is compared with
+        # this table instead and is not counted twice.
+        lines_exist = self.conn.execute(
+            "SELECT count(*) FROM information_schema.tables WHERE table_name = 'player_season_lines'"
+        ).fetchone()[0]
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS player_season_lines (
+                player_id INTEGER,
+                game_id VARCHAR,
+                seconds_played DOUBLE,
+                {total_columns},
+                PRIMARY KEY (player_id, game_id)
+            )
+        """)
+        if not lines_exist:
+            self.conn.execute(f"""
+                INSERT INTO player_season_lines
+                SELECT player_id, game_id, {SECONDS_PLAYED_SQL.format('minutes')}, {', '.join(PLAYER_TOTAL_COLUMNS)}
+                FROM players
+            """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS team_results (
+                season INTEGER,
+                team_id INTEGER,
+                game_id VARCHAR,
+                game_date DATE,
+                is_home BOOLEAN,
+                points INTEGER,
+                opponent_points INTEGER,
+                won BOOLEAN,
+                PRIMARY KEY (team_id, game_id)
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS team_form (
+                season INTEGER,
+                team_id INTEGER,
+                games INTEGER,
+                wins INTEGER,
+                losses INTEGER,
+                recent_games INTEGER,
+                recent_wins INTEGER,
+                recent_points DOUBLE,
+                recent_allowed DOUBLE,
+                last_game_date DATE,
+                PRIMARY KEY (season, team_id)
+            )
+        """)
+
+    def _load_fingerprints(self):
+        rows = self.conn.execute("SELECT game_id, source, fingerprint FROM ingest_fingerprints").fetchall()
+        self.fingerprints = {(game_id, source): value for game_id, source, value in rows}
+        # Last stored play-by-play action per game, so only newer actions are appended
+        rows = self.conn.execute("SELECT game_id, max(action_number) FROM actions GROUP BY game_id").fetchall()
+        self.last_action_numbers = dict(rows)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block inside one explicit transaction. Nested blocks join the outer one.
+        """
+        if self._in_transaction:
+            yield
+            return
+        self.conn.execute("BEGIN TRANSACTION")
+        self._in_transaction = True
+        try:
+            yield
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._in_transaction = False
+
+    def upsert_frame(self, table, frame):
+        """
+        Upsert a whole DataFrame into a table with a single INSERT OR REPLACE
+        """
+        if frame.empty:
+            return 0
+        frame = frame.drop_duplicates(TABLE_KEYS[table], keep='last')
+        columns = ', '.join(frame.columns)
+        self.conn.register('batch_frame', frame)
+        try:
+            with metrics.timer(f'ingest.upsert.{table}'):
+                self.conn.execute(f"INSERT OR REPLACE INTO {table} ({columns}) SELECT {columns} FROM batch_frame")
+        finally:
+            self.conn.unregister('batch_frame')
+        return len(frame)
+
+    def append_snapshots(self, table, frame):
+        """
+        Append the rows of a snapshot frame whose compared values differ from
+        the latest stored row of their series. Returns the rows appended.
+        """
+        if frame.empty:
+            return 0
+        keys, values = SNAPSHOT_SERIES[table]
+        key_list = ', '.join(keys)
+        self.conn.register('snapshot_frame', frame)
+        try:
+            return self.conn.execute(f"""
+                INSERT INTO {table} ({', '.join(frame.columns)})
+                SELECT frame.* FROM snapshot_frame AS frame
+                LEFT JOIN (
+                    SELECT {key_list}, arg_max(hash({', '.join(values)}), ts) AS last_hash
+                    FROM {table}
+                    WHERE game_id IN (SELECT DISTINCT game_id FROM snapshot_frame)
+                    GROUP BY {key_list}
+                ) AS last USING ({key_list})
+                WHERE last.last_hash IS DISTINCT FROM hash({', '.join('frame.' + v for v in values)})
+            """).fetchone()[0]
+        finally:
+            self.conn.unregister('snapshot_frame')
+
+    def score_timeline(self, game_id):
+        """
+        Every stored change of a game's score, period or status, oldest first.
+        Archived games are read from the Parquet archive.
+        """
+        attach_archive(self.conn, self.archive_dir)
+        return self.conn.execute("""
+            SELECT ts, game_status, period, clock_seconds, home_score, away_score
+            FROM all_score_snapshots
+            WHERE game_id = ?
+            ORDER BY ts
+        """, [game_id]).df()
+
+    def player_line_at(self, game_id, ts, player_id=None):
+        """
+        Each player's stat line in a game as it stood at ts (their latest
+        snapshot at or before it), or only one player's with player_id
+        """
+        player_filter = "AND player_id = ?" if player_id is not None else ""
+        params = [game_id, ts] + ([player_id] if player_id is not None else [])
+        attach_archive(self.conn, self.archive_dir)
+        return self.conn.execute(f"""
+            SELECT * EXCLUDE (season, game_date) FROM all_player_snapshots
+            WHERE game_id = ? AND ts <= ? {player_filter}
+            QUALIFY row_number() OVER (PARTITION BY player_id ORDER BY ts DESC) = 1
+            ORDER BY team_id, points DESC
+        """, params).df()
+
+    def update_player_totals(self, players):
+        """
+        Add the change in each player's line to player_season_totals, measured
+        against the line kept in player_season_lines for that game
+        """
+        if players.empty:
+            return
+        players = players.drop_duplicates(TABLE_KEYS['players'], keep='last')
+        deltas = ',\n'.join(
+            f"sum(new.{column} - coalesce(old.{column}, 0)) AS {column}" for column in PLAYER_TOTAL_COLUMNS
+        )
+        updates = ', '.join(f"{column} = {column} + excluded.{column}" for column in PLAYER_TOTAL_COLUMNS)
+        self.conn.register('player_batch', players)
+        try:
+            self.conn.execute(f"""
+                INSERT INTO player_season_totals
+                SELECT
+                    {SEASON_SQL.format('new.game_id')} AS season,
+                    new.player_id,
+                    arg_max(new.name, new.game_id),
+                    arg_max(new.team_id, new.game_id),
+                    count(*) FILTER (WHERE old.player_id IS NULL),
+                    sum({SECONDS_PLAYED_SQL.format('new.minutes')} - coalesce(old.seconds_played, 0)),
+                    {deltas}
+                FROM player_batch AS new
+                LEFT JOIN player_season_lines AS old USING (player_id, game_id)
+                GROUP BY season, new.player_id
+                ON CONFLICT (season, player_id) DO UPDATE SET
+                    name = excluded.name, team_id = excluded.team_id,
+                    games = games + excluded.games,
+                    seconds_played = seconds_played + excluded.seconds_played,
+                    {updates}
+            """)
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO player_season_lines
+                SELECT player_id, game_id, {SECONDS_PLAYED_SQL.format('minutes')}, {', '.join(PLAYER_TOTAL_COLUMNS)}
+                FROM player_batch
+            """)
+        finally:
+            self.conn.unregister('player_batch')
+
+    def update_team_form(self, results):
+        """
+        Store final results and recompute team_form for the teams involved
+        """
+        if results.empty:
+            return
+        self.upsert_frame('team_results', results)
+        self.conn.register('result_batch', results)
+        try:
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO team_form
+                SELECT
+                    season, team_id,
+                    count(*), count(*) FILTER (WHERE won), count(*) FILTER (WHERE NOT won),
+                    count(*) FILTER (WHERE recency <= {TEAM_FORM_GAMES}),
+                    count(*) FILTER (WHERE won AND recency <= {TEAM_FORM_GAMES}),
+                    avg(points) FILTER (WHERE recency <= {TEAM_FORM_GAMES}),
+                    avg(opponent_points) FILTER (WHERE recency <= {TEAM_FORM_GAMES}),
+                    max(game_date)
+                FROM (
+                    SELECT *, row_number() OVER (PARTITION BY season, team_id ORDER BY game_date DESC) AS recency
+                    FROM team_results
+                    WHERE (season, team_id) IN (SELECT DISTINCT (season, team_id) FROM result_batch)
+                )
+                GROUP BY season, team_id
+            """)
+        finally:
+            self.conn.unregister('result_batch')
+
+    def player_season_averages(self, player_id=None, name=None, season=None):
+        """
+        Per-game averages from player_season_totals, for one player by id or
+        name (case-insensitive) and optionally one season
+        """
+        conditions, params = [], []
+        if player_id is not None:
+            conditions.append("player_id = ?")
+            params.append(player_id)
+        if name is not None:
+            conditions.append("lower(name) = lower(?)")
+            params.append(name)
+        if season is not None:
+            conditions.append("season = ?")
+            params.append(season)
+        where = ('WHERE ' + ' AND '.join(conditions)) if conditions else ''
+        averages = ', '.join(f"{column} / games AS {column}" for column in PLAYER_TOTAL_COLUMNS)
+        return self.conn.execute(f"""
+            SELECT season, player_id, name, team_id, games, seconds_played / games / 60 AS minutes, {averages}
+            FROM player_season_totals
+            {where}
+            ORDER BY season, player_id
+        """, params).df()
+
+    def process_actions(self, actions_by_game):
+        """
+        Append new play-by-play actions ({game_id: [action, ...]}) and add what
+        they credit to pbp_player_stats and pbp_team_stats, in one transaction
+        for every game of a tick. Actions at or below a game's last stored
+        action number are dropped, so the stats never count an action twice.
+        Returns the actions appended.
+        """
+        frames = []
+        for game_id, actions in actions_by_game.items():
+            last_number = self.last_action_numbers.get(game_id, 0)
+            new_actions = [action for action in actions if action['actionNumber'] > last_number]
+            if new_actions:
+                frames.append(action_frame(game_id, new_actions))
+        if not frames:
+            return 0
+        frame = pd.concat(frames, ignore_index=True).drop_duplicates(TABLE_KEYS['actions'], keep='last')
+
+        credits = ', '.join(f"CAST({sql} AS INTEGER) AS {column}" for column, sql in ACTION_STAT_SQL.items())
+        assist_credits = ', '.join(f"{int(column == 'assists')} AS {column}" for column in ACTION_STAT_COLUMNS)
+        # One row per action and credited player: an assisted basket also credits the passer
+        credited = f"""
+            SELECT game_id, team_id, player_id, {credits} FROM action_batch WHERE team_id IS NOT NULL
+            UNION ALL
+            SELECT game_id, team_id, assist_player_id, {assist_credits} FROM action_batch
+            WHERE assist_player_id IS NOT NULL AND shot_result = 'Made'
+        """
+        totals = ', '.join(f"sum({column})" for column in ACTION_STAT_COLUMNS)
+        updates = ', '.join(f"{column} = {column} + excluded.{column}" for column in ACTION_STAT_COLUMNS)
+        self.conn.register('action_batch', frame)
+        try:
+            with metrics.timer('ingest.actions'), self.transaction():
+                self.conn.execute(f"INSERT INTO actions ({', '.join(ACTION_COLUMNS)}) SELECT * FROM action_batch")
+                self.conn.execute(f"""
+                    INSERT INTO pbp_player_stats
+                    SELECT game_id, player_id, any_value(team_id), {totals}
+                    FROM ({credited})
+                    WHERE player_id IS NOT NULL
+                    GROUP BY game_id, player_id
+                    ON CONFLICT (game_id, player_id) DO UPDATE SET {updates}
+                """)
+                self.conn.execute(f"""
+                    INSERT INTO pbp_team_stats
+                    SELECT game_id, team_id, {totals}
+                    FROM ({credited})
+                    GROUP BY game_id, team_id
+                    ON CONFLICT (game_id, team_id) DO UPDATE SET {updates}
+                """)
+        finally:
+            self.conn.unregister('action_batch')
+        self.last_action_numbers.update(frame.groupby('game_id')['action_number'].max().astype(int).to_dict())
+        metrics.count('ingest.actions_written', len(frame))
+        return len(frame)
+
+    def team_last_games(self, team_id, num_games=TEAM_FORM_GAMES):
+        """
+        A team's most recent final results, newest first
+        """
+        return self.conn.execute("""
+            SELECT * FROM team_results
+            WHERE team_id = ?
+            ORDER BY game_date DESC
+            LIMIT ?
+        """, [team_id, num_games]).df()
+
+    def process_refresh(self, scoreboard_data, boxscores=()):
+        """
+        Ingest one refresh tick (the scoreboard plus any boxscore payloads)
+        inside a single transaction. scoreboard_data may be None when only
+        boxscores changed. Returns the rows written and skipped.
+        """
+        games = scoreboard_records(scoreboard_data) if scoreboard_data is not None else None
+        return self.process_records(games, [game_record(boxscore_data['game']) for boxscore_data in boxscores])
+
+    def process_records(self, games, boxscore_games=()):
+        """
+        process_refresh for payloads already parsed into GameRecords (see
+        live_records): the scoreboard's games, or None, and the boxscores
+        """
+        with metrics.timer('ingest.refresh'):
+            if not self.batch_mode:
+                with self.transaction():
+                    if games is not None:
+                        self.update_team_form(team_result_frame(games))
+                        self._process_scoreboard_rows(games)
+                    for game in boxscore_games:
+                        players = boxscore_frames(game)['players']
+                        self.update_player_totals(players)
+                        self._process_player_rows(players)
+                return None
+            write_stats = self._write_batch(games, boxscore_games)
+        metrics.count('ingest.rows_written', write_stats['written'])
+        metrics.count('ingest.rows_skipped', write_stats['skipped'])
+        return write_stats
 
     def process_scoreboard_data(self, scoreboard_data):
-        games = scoreboard_data['scoreboard']['games']
+        return self.process_refresh(scoreboard_data)
+
+    def process_boxscore_data(self, boxscore_data):
+        return self.process_refresh(None, [boxscore_data])
+
+    def _write_batch(self, games=None, boxscore_games=()):
+        """
+        Flatten every changed game of a tick and upsert each table once.
+        Games whose fingerprint matches the last ingested one are skipped.
+        """
+        current_time = datetime.now()
+        changed = {}
+        skipped = 0
+        frames = {}
+        snapshot_frames = {}
+        results = pd.DataFrame(columns=TEAM_RESULT_COLUMNS)
+
+        if games is not None:
+            changed_ids = set()
+            for game in games:
+                key = (game.game_id, 'scoreboard')
+                value = scoreboard_game_fingerprint(game)
+                if self.fingerprints.get(key) == value:
+                    # One games row plus two teams and two game_teams rows
+                    skipped += 5
+                else:
+                    changed[key] = value
+                    changed_ids.add(game.game_id)
+            frames = scoreboard_frames(games, current_time, changed_ids)
+            results = team_result_frame(games, changed_ids)
+            snapshot_frames['score_snapshots'] = score_snapshot_frame(games, current_time, changed_ids)
+
+        changed_games = []
+        for game in boxscore_games:
+            key = (game.game_id, 'boxscore')
+            value = boxscore_game_fingerprint(game)
+            if self.fingerprints.get(key) == value:
+                skipped += len(game.home.players) + len(game.away.players)
+            else:
+                changed[key] = value
+                changed_games.append(game)
+        if changed_games:
+            players = boxscores_player_frame(changed_games)
+            players['last_updated'] = current_time
+            frames['players'] = players[PLAYER_COLUMNS]
+            snapshot_frames['player_snapshots'] = player_snapshot_frame(frames['players'])
+
+        written = 0
+        if changed:
+            with self.transaction():
+                # Summaries before the rows, in the same transaction
+                if 'players' in frames:
+                    self.update_player_totals(frames['players'])
+                self.update_team_form(results)
+                for table, frame in frames.items():
+                    written += self.upsert_frame(table, frame)
+                for table, frame in snapshot_frames.items():
+                    self.append_snapshots(table, frame)
+                self.upsert_frame('ingest_fingerprints', pd.DataFrame(
+                    [(game_id, source, value) for (game_id, source), value in changed.items()],
+                    columns=['game_id', 'source', 'fingerprint']
+                ))
+            self.fingerprints.update(changed)
+
+        self.last_write_stats = {'written': written, 'skipped': skipped}
+        return self.last_write_stats
+
+    def _process_scoreboard_rows(self, games):
         current_time = datetime.now()
         
         for game in games:
@@ -93,124 +914,47 @@ class NBALiveStatsDB:
                     last_updated
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, [
-                game['gameId'], game['gameStatus'],
-                game['gameStatusText'], game['period'], game['gameClock'],
-                game['gameTimeUTC'], game['gameEt'], game['regulationPeriods'],
-                game['seriesGameNumber'], game['seriesText'], current_time
-            ])
-            
-            # Process home team
-            home_team = game['homeTeam']
-            self.conn.execute("""
-                INSERT OR REPLACE INTO teams (
-                    team_id, team_name, team_city, team_tricode,
-                    wins, losses
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """, [
-                home_team['teamId'], home_team['teamName'],
-                home_team['teamCity'], home_team['teamTricode'],
-                home_team['wins'], home_team['losses']
-            ])
-            
-            # Process away team
-            away_team = game['awayTeam']
-            self.conn.execute("""
-                INSERT OR REPLACE INTO teams (
-                    team_id, team_name, team_city, team_tricode,
-                    wins, losses
-                ) VALUES (?, ?, ?, ?, ?, ?)
-            """, [
-                away_team['teamId'], away_team['teamName'],
-                away_team['teamCity'], away_team['teamTricode'],
-                away_team['wins'], away_team['losses']
-            ])
-            
-            # Insert game_teams data
-            self.conn.execute("""
-                INSERT OR REPLACE INTO game_teams (
-                    game_id, team_id, is_home, score, in_bonus,
-                    timeouts_remaining, points_period1, last_updated
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, [
-                game['gameId'], home_team['teamId'], True,
-                home_team['score'], home_team['inBonus'],
-                home_team['timeoutsRemaining'],
-                home_team['periods'][0]['score'], current_time
+                game.game_id, game.status,
+                game.status_text, game.period, game.clock,
+                game.time_utc, game.game_et, game.regulation_periods,
+                game.series_game_number, game.series_text, current_time
             ])
             
-            self.conn.execute("""
-                INSERT OR REPLACE INTO game_teams (
-                    game_id, team_id, is_home, score, in_bonus,
-                    timeouts_remaining, points_period1, last_updated
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, [
-                game['gameId'], away_team['teamId'], False,
-                away_team['score'], away_team['inBonus'],
-                away_team['timeoutsRemaining'],
-                away_team['periods'][0]['score'], current_time
-            ])
-
-    def process_boxscore_data(self, boxscore_data):
-        game_data = boxscore_data['game']
-        game_id = game_data['gameId']
-        current_time = datetime.now()
-        
-        # Process home team players
-        for player in game_data['homeTeam']['players']:
-            if player.get('played') == '1':
-                stats = player['statistics']
+            for team, is_home in ((game.home, True), (game.away, False)):
                 self.conn.execute("""
-                    INSERT OR REPLACE INTO players (
-                        player_id, team_id, game_id, jersey_num, name,
-                        position, starter, minutes, points, rebounds,
-                        assists, field_goals_made, field_goals_attempted,
-                        field_goals_percentage, three_pointers_made,
-                        three_pointers_attempted, free_throws_made,
-                        free_throws_attempted, plus_minus, last_updated
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, [
-                    player['personId'], game_data['homeTeam']['teamId'],
-                    game_id, player['jerseyNum'], player['name'],
-                    player.get('position', ''), player['starter'] == '1',
-                    stats['minutes'], stats['points'], stats['reboundsTotal'],
-                    stats['assists'], stats['fieldGoalsMade'],
-                    stats['fieldGoalsAttempted'], stats['fieldGoalsPercentage'],
-                    stats['threePointersMade'], stats['threePointersAttempted'],
-                    stats['freeThrowsMade'], stats['freeThrowsAttempted'],
-                    stats['plusMinusPoints'], current_time
-                ])
-        
-        # Process away team players
-        for player in game_data['awayTeam']['players']:
-            if player.get('played') == '1':
-                stats = player['statistics']
+                    INSERT OR REPLACE INTO teams (
+                        team_id, team_name, team_city, team_tricode,
+                        wins, losses
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                """, [team.team_id, team.name, team.city, team.tricode, team.wins, team.losses])
+
+                # Insert game_teams data
                 self.conn.execute("""
-                    INSERT OR REPLACE INTO players (
-                        player_id, team_id, game_id, jersey_num, name,
-                        position, starter, minutes, points, rebounds,
-                        assists, field_goals_made, field_goals_attempted,
-                        field_goals_percentage, three_pointers_made,
-                        three_pointers_attempted, free_throws_made,
-                        free_throws_attempted, plus_minus, last_updated
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    INSERT OR REPLACE INTO game_teams (
+                        game_id, team_id, is_home, score, in_bonus,
+                        timeouts_remaining, points_period1, last_updated
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """, [
-                    player['personId'], game_data['awayTeam']['teamId'],
-                    game_id, player['jerseyNum'], player['name'],
-                    player.get('position', ''), player['starter'] == '1',
-                    stats['minutes'], stats['points'], stats['reboundsTotal'],
-                    stats['assists'], stats['fieldGoalsMade'],
-                    stats['fieldGoalsAttempted'], stats['fieldGoalsPercentage'],
-                    stats['threePointersMade'], stats['threePointersAttempted'],
-                    stats['freeThrowsMade'], stats['freeThrowsAttempted'],
-                    stats['plusMinusPoints'], current_time
+                    game.game_id, team.team_id, is_home, team.score, team.in_bonus,
+                    team.timeouts_remaining, team.period1_score, current_time
                 ])
 
+    def _process_player_rows(self, players):
+        # One INSERT OR REPLACE per player row of a boxscore_frames players frame
+        for row in players.astype(object).values.tolist():
+            self.conn.execute(f"""
+                INSERT OR REPLACE INTO players ({', '.join(PLAYER_COLUMNS)})
+                VALUES ({', '.join('?' * len(PLAYER_COLUMNS))})
+            """, row)
+
     def get_database_stats(self):
+        # game_id and team_id are primary keys, and the summary table has one
+        # small row per player and season, so nothing here scans the players table
         return self.conn.execute("""
             SELECT 
-                (SELECT COUNT(DISTINCT game_id) FROM games) as total_games,
-                (SELECT COUNT(DISTINCT team_id) FROM teams) as total_teams,
-                (SELECT COUNT(DISTINCT player_id) FROM players) as total_players
+                (SELECT COUNT(*) FROM games) as total_games,
+                (SELECT COUNT(*) FROM teams) as total_teams,
+                (SELECT COUNT(DISTINCT player_id) FROM player_season_totals) as total_players
         """).fetchone()
 
 
@@ -225,11 +969,203 @@ class NBALiveStatsDB:
                 self.conn.execute("DROP TABLE IF EXISTS teams")
                 self.conn.execute("DROP TABLE IF EXISTS game_teams")
                 self.conn.execute("DROP TABLE IF EXISTS players")
+                self.conn.execute("DROP TABLE IF EXISTS ingest_fingerprints")
+                self.conn.execute("DROP TABLE IF EXISTS score_snapshots")
+                self.conn.execute("DROP TABLE IF EXISTS player_snapshots")
+                self.conn.execute("DROP TABLE IF EXISTS player_season_totals")
+                self.conn.execute("DROP TABLE IF EXISTS player_season_lines")
+                self.conn.execute("DROP TABLE IF EXISTS team_results")
+                self.conn.execute("DROP TABLE IF EXISTS team_form")
+                self.conn.execute("DROP TABLE IF EXISTS actions")
+                self.conn.execute("DROP TABLE IF EXISTS pbp_player_stats")
+                self.conn.execute("DROP TABLE IF EXISTS pbp_team_stats")
+                self.conn.execute("DROP TABLE IF EXISTS backfill_progress")
                 
                 # Recreate tables using the current schema
                 self.create_tables()
+                self.fingerprints = {}
+                self.last_action_numbers = {}
                 print("Database cleared and tables recreated successfully.")
             except Exception as e:
                 print(f"Error clearing the database: {e}")
     def commit(self):
-        self.conn.commit()
\ No newline at end of file
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+def open_database(db_path='nba_live_stats.db', read_only=False, retries=20, delay=0.25):
+    """
+    Open the database, waiting while another process holds the file lock.
+    DuckDB allows one writing process at a time, so the ingester and the
+    dashboard each keep their connection only as long as they need it.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return NBALiveStatsDB(db_path, read_only=read_only)
+        except duckdb.IOException:
+            if attempt == retries:
+                raise
+            time.sleep(delay)
+
+def write_snapshot(snapshot, path=SNAPSHOT_PATH):
+    """
+    Atomically replace the snapshot file so readers never see a partial write
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(tmp_path, path)
+
+def read_snapshot(path=SNAPSHOT_PATH, max_age=SNAPSHOT_MAX_AGE):
+    """
+    Return the ingester's latest snapshot, or None if it is missing or stale
+    """
+    try:
+        if time.time() - os.path.getmtime(path) > max_age:
+            return None
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def ingest_once(db_path='nba_live_stats.db', snapshot_path=SNAPSHOT_PATH,
+                scoreboard_url=SCOREBOARD_URL, boxscore_url=BOXSCORE_URL, cache=None,
+                scheduler=None, boxscores=None, action_stream=None, playbyplay_url=PLAYBYPLAY_URL):
+    """
+    Fetch the scoreboard and the boxscores of started games, write them to the
+    database and publish them as the latest snapshot.
+
+    With a scheduler only the games it reports as due are fetched, and the
+    latest boxscores of the others are carried over in `boxscores`. With an
+    action_stream (see play_by_play) the play-by-play feeds of the same games
+    are fetched too and their new actions appended to the actions table.
+    """
+    scoreboard_data, scoreboard_changed = fetch_scoreboard(scoreboard_url)
+    with metrics.timer('parse.records'):
+        games = scoreboard_records(scoreboard_data)
+    started_ids = [game.game_id for game in games if game.status != 1]
+    # The snapshot republishes the payloads, so they are carried over as the
+    # parsed JSON (shared with the fetcher); records are built per tick below
+    boxscores = {} if boxscores is None else boxscores
+    fetched, unchanged_ids = fetch_due_boxscores(games, scheduler, boxscores, cache=cache, url_template=boxscore_url)
+    due_ids = list(fetched)
+    # Payloads the CDN reported as identical to last time need no processing at all
+    with metrics.timer('parse.records'):
+        changed_boxscores = [
+            game_record(game_data) for game_id, game_data in fetched.items()
+            if game_data and game_id not in unchanged_ids
+        ]
+
+    new_actions = {}
+    if action_stream is not None:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            texts = dict(zip(due_ids, pool.map(lambda game_id: action_stream.fetch(game_id, playbyplay_url), due_ids)))
+        for game_id, text in texts.items():
+            actions = action_stream.new_actions(game_id, text) if text is not None else []
+            if actions:
+                new_actions[game_id] = actions
+
+    if not scoreboard_changed and not changed_boxscores and not new_actions and os.path.exists(snapshot_path):
+        # Nothing new: keep the snapshot fresh without rewriting it or touching the database
+        os.utime(snapshot_path)
+        if action_stream is not None:
+            for game_id in texts:
+                action_stream.commit(game_id)
+        return {'written': 0, 'skipped': 0}
+
+    db = open_database(db_path)
+    try:
+        write_stats = db.process_records(games if scoreboard_changed else None, changed_boxscores)
+        if action_stream is not None:
+            write_stats = dict(write_stats, actions=db.process_actions(new_actions))
+            # Only now that the actions are stored may the stream move past them
+            for game_id in texts:
+                action_stream.commit(game_id)
+        database_stats = db.get_database_stats()
+    finally:
+        db.close()
+
+    write_snapshot({
+        'fetched_at': datetime.now().isoformat(timespec='seconds'),
+        'scoreboard': scoreboard_data,
+        'boxscores': {game_id: boxscores.get(game_id) for game_id in started_ids},
+        'write_stats': write_stats,
+        'database_stats': list(database_stats),
+    }, snapshot_path)
+    return write_stats
+
+def archive_database(db_path='nba_live_stats.db', archive_dir=ARCHIVE_DIR):
+    """
+    Roll completed game dates out of the database into the Parquet archive
+    """
+    db = open_database(db_path)
+    try:
+        result = archive_completed_dates(db, archive_dir)
+    finally:
+        db.close()
+    if result['dates']:
+        print(f"Archived {len(result['dates'])} game dates ({result['dates'][0]} to {result['dates'][-1]}): {result['rows']}")
+    return result
+
+def run_ingester(db_path='nba_live_stats.db', snapshot_path=SNAPSHOT_PATH, interval=INGEST_INTERVAL,
+                 archive_dir=ARCHIVE_DIR, scoreboard_url=SCOREBOARD_URL, boxscore_url=BOXSCORE_URL,
+                 metrics_path=METRICS_PATH, playbyplay_url=None):
+    """
+    Poll on the scheduler's timetable, independent of how many dashboards are
+    open. `interval` is the longest wait between scoreboard polls. Completed
+    game dates are archived once a day, and the metrics file is rewritten
+    after every tick. Play-by-play is only ingested with a playbyplay_url.
+    """
+    scheduler = PollScheduler()
+    action_stream = ActionStream() if playbyplay_url else None
+    boxscores = {}
+    archived_on = None
+    while True:
+        try:
+            with metrics.timer('ingest.tick'):
+                write_stats = ingest_once(db_path, snapshot_path, scoreboard_url, boxscore_url,
+                                          scheduler=scheduler, boxscores=boxscores,
+                                          action_stream=action_stream, playbyplay_url=playbyplay_url)
+            print(f"{datetime.now():%H:%M:%S} wrote {write_stats['written']} rows, skipped {write_stats['skipped']}"
+                  + (f", appended {write_stats['actions']} actions" if 'actions' in write_stats else ""))
+            if archived_on != date.today():
+                archive_database(db_path, archive_dir)
+                archived_on = date.today()
+            if metrics.enabled:
+                metrics.write(metrics_path)
+        except Exception as e:
+            print(f"Error ingesting live data: {e}")
+        wait = scheduler.seconds_until_next_poll()
+        time.sleep(interval if wait is None else min(interval, max(MIN_INGEST_INTERVAL, wait)))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="NBA live stats database")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    ingest = subcommands.add_parser('ingest', help="poll live games and write them to the database")
+    ingest.add_argument('--db', default='nba_live_stats.db')
+    ingest.add_argument('--snapshot', default=SNAPSHOT_PATH)
+    ingest.add_argument('--interval', type=int, default=INGEST_INTERVAL)
+    ingest.add_argument('--once', action='store_true', help="run a single tick and exit")
+    ingest.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    # Point these at a replay server (python -m replay serve) to ingest a recorded night offline
+    ingest.add_argument('--scoreboard-url', default=SCOREBOARD_URL)
+    ingest.add_argument('--boxscore-url', default=BOXSCORE_URL, help="with a {game_id} placeholder")
+    ingest.add_argument('--metrics', default=METRICS_PATH, help="stage timings and counters, rewritten every tick")
+    ingest.add_argument('--play-by-play', action='store_true', help="also append live play-by-play actions")
+    ingest.add_argument('--playbyplay-url', default=PLAYBYPLAY_URL, help="with a {game_id} placeholder")
+    archive = subcommands.add_parser('archive', help="move completed game dates into the Parquet archive")
+    archive.add_argument('--db', default='nba_live_stats.db')
+    archive.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'ingest':
+        if args.once:
+            print(ingest_once(args.db, args.snapshot, args.scoreboard_url, args.boxscore_url,
+                              action_stream=ActionStream() if args.play_by_play else None,
+                              playbyplay_url=args.playbyplay_url))
+        else:
+            run_ingester(args.db, args.snapshot, args.interval, args.archive_dir, args.scoreboard_url, args.boxscore_url,
+                         args.metrics, args.playbyplay_url if args.play_by_play else None)
+    elif args.command == 'archive':
+        archive_database(args.db, args.archive_dir)
\ No newline at end of file
@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Written by whichever process is ingesting (the ingester, or the page when it polls itself)
+METRICS_PATH = 'nba_metrics.json'
+# Upper bounds of the latency histogram buckets, in milliseconds; the last bucket is open-ended
+BUCKET_BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+_DISABLED = nullcontext()
+
+class Metrics:
+    """
+    Per-stage latency histograms and counters for the hot path (fetch, parse,
+    ingest, predict).
+
+    Latencies go into fixed buckets, so recording is a few additions under a
+    lock and percentiles are read back from the bucket bounds. When disabled
+    (NBA_METRICS=0), timer() hands back one shared no-op context and count()
+    returns at once. Other modules can register a function returning their
+    own stats (the boxscore cache, the conditional fetcher) to be included in
+    every report.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._sources = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # stage -> {'count', 'total_ms', 'max_ms', 'buckets'}
+            self.stages = {}
+            self.counters = {}
+            self.started_at = time.time()
+
+    def timer(self, stage):
+        """
+        Context manager recording how long its block took under `stage`
+        """
+        return self._timer(stage) if self.enabled else _DISABLED
+
+    @contextmanager
+    def _timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage, seconds):
+        if not self.enabled:
+            return
+        ms = seconds * 1000
+        bucket = next((i for i, bound in enumerate(BUCKET_BOUNDS_MS) if ms <= bound), len(BUCKET_BOUNDS_MS))
+        with self._lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                entry = self.stages[stage] = {
+                    'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'buckets': [0] * (len(BUCKET_BOUNDS_MS) + 1)
+                }
+            entry['count'] += 1
+            entry['total_ms'] += ms
+            entry['max_ms'] = max(entry['max_ms'], ms)
+            entry['buckets'][bucket] += 1
+
+    def count(self, name, amount=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def register_source(self, name, stats):
+        """
+        Include stats() (a function returning a dict) in every report under `name`
+        """
+        self._sources[name] = stats
+
+    def report(self):
+        """
+        Everything recorded so far as a JSON-serializable dict
+        """
+        with self._lock:
+            stages = {
+                stage: dict(
+                    entry, buckets=list(entry['buckets']),
+                    mean_ms=entry['total_ms'] / entry['count'],
+                    p50_ms=bucket_percentile(entry['buckets'], 0.5, entry['max_ms']),
+                    p95_ms=bucket_percentile(entry['buckets'], 0.95, entry['max_ms']),
+                )
+                for stage, entry in self.stages.items()
+            }
+            counters = dict(self.counters)
+        return {
+            'enabled': self.enabled,
+            'since': self.started_at,
+            'bucket_bounds_ms': list(BUCKET_BOUNDS_MS),
+            'stages': stages,
+            'counters': counters,
+            'sources': {name: stats() for name, stats in self._sources.items()},
+        }
+
+    def write(self, path=METRICS_PATH):
+        """
+        Atomically replace the metrics file with the current report. Each
+        write gets its own temporary file, since every polling session of the
+        page may write at the same time.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.report(), f, indent=2)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+def bucket_percentile(buckets, quantile, max_ms):
+    """
+    Upper bound of the bucket holding the quantile (the maximum for the open-ended bucket)
+    """
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    seen = 0
+    for i, count in enumerate(buckets):
+        seen += count
+        if seen >= quantile * total:
+            return float(BUCKET_BOUNDS_MS[i]) if i < len(BUCKET_BOUNDS_MS) else max_ms
+    return max_ms
+
+def read_metrics(path=METRICS_PATH):
+    """
+    Return a metrics file written by Metrics.write, or None if there is none
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+# Single registry shared by everything running in this process
+metrics = Metrics(enabled=os.environ.get('NBA_METRICS', '1') != '0')
@@ -3,10 +3,17 @@ import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-from nba_api.stats.endpoints import leaguegamefinder
 from nba_api.stats.static import teams
-import requests
 import json
+import threading
+import time
+from contextlib import contextmanager
+from nba_fetch import fetch_boxscore, fetch_boxscores, get_boxscore_cache
+from team_game_log import get_game_log_store
+from feature_engine import team_game_features
+from live_records import game_record
+from poll_scheduler import tipoff_timestamp
+from nba_metrics import metrics
 from datetime import datetime, timedelta
 
 def fetch_player_stats(game_id):
@@ -14,15 +21,10 @@ def fetch_player_stats(game_id):
     Fetch detailed player statistics for a specific game from the NBA API
     """
     try:
-        response = requests.get(
-            f"https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{game_id}.json"
-        )
-        response.raise_for_status()
-        data = response.json()
-        if not data or 'game' not in data:
+        game_data = fetch_boxscore(game_id)
+        if game_data is None:
             print(f"Missing 'game' key in data for game ID {game_id}")
-            return None
-        return data['game']
+        return game_data
     except Exception as e:
         print(f"Error fetching player stats: {e}")
         return None
@@ -35,216 +37,423 @@ def get_team_recent_games(team_abv, num_games= 50):
     team = [t for t in nba_teams if t['abbreviation'] == team_abv][0]
     team_id = team['id']
     
-    gamefinder = leaguegamefinder.LeagueGameFinder(team_id_nullable=team_id)
-    games = gamefinder.get_data_frames()[0]
-    
-    # Filter for recent seasons and sort by date
-    games = games[games['SEASON_ID'].str[-4:].isin([ '2024', '2025'])]
-    games = games.sort_values('GAME_DATE', ascending=False)
-    
-    return games.head(num_games)
+    # Served from the local game-log store, which only asks the API for new games
+    store = get_game_log_store()
+    store.sync_team(team_id)
+    return store.recent_games(team_id, num_games)
 
-def process_game_stats(game_data, team_name):
+def process_game_stats(game_data, team_abv):
     """
     Process raw game data into usable features
     """
     if not game_data:
         return None
-        
-    is_home = game_data['homeTeam']["teamName"] == team_name
-    team_data = game_data['homeTeam'] if is_home else game_data['awayTeam']
-    
-    # Process player statistics
-    players = team_data.get('players', [])
-    active_players = [p for p in players if p.get('played')]
-    
-    if not active_players:
+
+    team_stats = team_game_features([game_record(game_data)])
+    team_stats = team_stats[team_stats['team_tricode'] == team_abv]
+    if team_stats.empty:
         return None
-        
-    # Aggregate team statistics
-    team_stats = {
-        'total_points': team_data['score'],
-        'is_home': 1 if is_home else 0,
-        'num_players': len(active_players),
-        'starters_points': 0,
-        'bench_points': 0,
-        
-        'total_rebounds': 0,
-        'total_assists': 0,
-        'fg_percentage': 0,
-        'three_pt_percentage': 0,
-        'ft_percentage': 0
-    }
-    
-    for player in active_players:
-        stats = player.get('statistics', {})
-        is_starter = player.get('starter') == '1'
-        
-        points = int(stats.get('points', 0))
-        if is_starter:
-            team_stats['starters_points'] += points
-        else:
-            team_stats['bench_points'] += points
-            
-        #team_stats['total_minutes'] += float(stats.get('minutes', '0').replace(':', '.'))
-        team_stats['total_rebounds'] += int(stats.get('reboundsTotal', 0))
-        team_stats['total_assists'] += int(stats.get('assists', 0))
-        
-        # Calculate shooting percentages
-        fgm = int(stats.get('fieldGoalsMade', 0))
-        fga = int(stats.get('fieldGoalsAttempted', 0))
-        tpm = int(stats.get('threePointersMade', 0))
-        tpa = int(stats.get('threePointersAttempted', 0))
-        ftm = int(stats.get('freeThrowsMade', 0))
-        fta = int(stats.get('freeThrowsAttempted', 0))
-        
-        if fga > 0:
-            team_stats['fg_percentage'] += (fgm / fga) * 100
-        if tpa > 0:
-            team_stats['three_pt_percentage'] += (tpm / tpa) * 100
-        if fta > 0:
-            team_stats['ft_percentage'] += (ftm / fta) * 100
-    
-    # Average the percentages
-    if len(active_players) > 0:
-        team_stats['fg_percentage'] /= len(active_players)
-        team_stats['three_pt_percentage'] /= len(active_players)
-        team_stats['ft_percentage'] /= len(active_players)
-    
-    return team_stats
+    return team_stats.drop(columns=['game_id', 'team_tricode']).iloc[0].to_dict()
+
+# Per-game team statistics that make up a team's recent form
+FORM_COLUMNS = [
+    'total_points', 'total_assists', 'total_rebounds', 'fg_percentage',
+    'three_pt_percentage', 'ft_percentage', 'bench_points', 'won'
+]
 
-def create_game_features(home_team_abv, away_team_abv, num_recent_games=20):
+# Number of previous games averaged into a team's form, and the fewest
+# previous games a training row needs before it is used
+FORM_WINDOW = 20
+MIN_FORM_GAMES = 5
+
+class PipelineStats:
     """
-    Create features for prediction using recent games data from both teams,
-    including win percentage.
+    Wall time and network/API call counts for each stage of a prediction.
+    Every stage is also recorded in the process metrics as predict.<stage>.
     """
-    home_recent_games = get_team_recent_games(home_team_abv, num_recent_games)
-    away_recent_games = get_team_recent_games(away_team_abv, num_recent_games)
-    
-    home_features = []
-    away_features = []
-    
-    # Calculate win percentage for both teams
-    wins_home = home_recent_games[home_recent_games['WL'] == 'W'].shape[0]
-    losses_home = home_recent_games[home_recent_games['WL'] == 'L'].shape[0]
-    home_win_percentage = wins_home / max(wins_home + losses_home, 1)
-    
-    wins_away = away_recent_games[away_recent_games['WL'] == 'W'].shape[0]
-    losses_away = away_recent_games[away_recent_games['WL'] == 'L'].shape[0]
-    away_win_percentage = wins_away / max(wins_away + losses_away, 1)
-    
-    # Process recent games for both teams
-    for _, game in home_recent_games.iterrows():
-        stats = fetch_player_stats(game['GAME_ID'])
-        if stats:
-            processed_stats = process_game_stats(stats, home_team_abv)
-            if processed_stats:
-                home_features.append(processed_stats)
-                
-    for _, game in away_recent_games.iterrows():
-        stats = fetch_player_stats(game['GAME_ID'])
-        if stats:
-            processed_stats = process_game_stats(stats, away_team_abv)
-            if processed_stats:
-                away_features.append(processed_stats)
-    
-    if not home_features or not away_features:
-        return None
-    
-    # Calculate average features for both teams
-    home_avg = pd.DataFrame(home_features).mean()
-    away_avg = pd.DataFrame(away_features).mean()
-    
-    # Combine features for the matchup
-    matchup_features = {
+    def __init__(self):
+        self.stages = {}
+
+    def reset(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        entry = self.stages.setdefault(name, {'calls': 0, 'seconds': 0.0})
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            seconds = time.perf_counter() - start
+            entry['seconds'] += seconds
+            metrics.record(f'predict.{name}', seconds)
+
+    def summary(self):
+        return {name: dict(entry) for name, entry in self.stages.items()}
+
+pipeline_stats = PipelineStats()
+
+def build_teams_game_rows(team_abvs, num_games=50):
+    """
+    Build one feature row per game for several teams at once. Every team's
+    boxscores are fetched in one batch (games between two of the teams only
+    once) and aggregated in one pass. Returns tricode -> rows, oldest first.
+    """
+    team_abvs = list(dict.fromkeys(team_abvs))
+    with pipeline_stats.stage('game_logs') as stage:
+        api_calls_before = get_game_log_store().api_calls
+        recent_games = {team_abv: get_team_recent_games(team_abv, num_games) for team_abv in team_abvs}
+        stage['calls'] += get_game_log_store().api_calls - api_calls_before
+
+    with pipeline_stats.stage('boxscores') as stage:
+        misses_before = get_boxscore_cache().misses
+        game_ids = [game_id for games in recent_games.values() for game_id in games['GAME_ID']]
+        boxscores = fetch_boxscores(game_ids, records=True)
+        stage['calls'] += get_boxscore_cache().misses - misses_before
+
+    with pipeline_stats.stage('features'):
+        team_stats = team_game_features(list(boxscores.values()))
+
+        team_rows = {}
+        for team_abv, games in recent_games.items():
+            stats = team_stats[team_stats['team_tricode'] == team_abv].drop(columns=['team_tricode'])
+            games = pd.DataFrame({
+                'game_id': games['GAME_ID'],
+                'game_date': pd.to_datetime(games['GAME_DATE']),
+                'won': (games['WL'] == 'W').astype(int),
+            })
+            rows = games.merge(stats, on='game_id')
+            team_rows[team_abv] = rows.sort_values('game_date').reset_index(drop=True)
+
+    return team_rows
+
+def build_team_game_rows(team_abv, num_games=50):
+    """
+    Build one feature row per game from a single pass over a team's game log.
+    Rows are returned oldest first.
+    """
+    return build_teams_game_rows([team_abv], num_games)[team_abv]
+
+def trailing_form(team_rows, window=FORM_WINDOW):
+    """
+    A team's form after each game: the mean of its last `window` games up to and including it.
+    """
+    min_periods = min(MIN_FORM_GAMES, window)
+    return team_rows[FORM_COLUMNS].astype(float).rolling(window, min_periods=min_periods).mean()
+
+def rolling_form(team_rows, window=FORM_WINDOW):
+    """
+    A team's form entering each game: the mean of its previous `window` games.
+    """
+    return trailing_form(team_rows, window).shift(1)
+
+def current_form(team_rows, window=FORM_WINDOW):
+    """
+    A team's form entering its next game, as a one-row frame
+    """
+    return team_rows[FORM_COLUMNS].astype(float).tail(window).mean().to_frame().T
+
+def matchup_features(home_form, away_form):
+    """
+    Combine home and away form frames (aligned row by row) into matchup features
+    """
+    home_form = home_form.reset_index(drop=True)
+    away_form = away_form.reset_index(drop=True)
+    return pd.DataFrame({
         # Home team features
-        'home_avg_points': home_avg['total_points'],
-        'home_avg_assists': home_avg['total_assists'],
-        'home_avg_rebounds': home_avg['total_rebounds'],
-        'home_fg_pct': home_avg['fg_percentage'],
-        'home_three_pct': home_avg['three_pt_percentage'],
-        'home_ft_pct': home_avg['ft_percentage'],
-        'home_bench_scoring': home_avg['bench_points'],
-        'home_win_percentage': home_win_percentage,  # Added feature
-        
+        'home_avg_points': home_form['total_points'],
+        'home_avg_assists': home_form['total_assists'],
+        'home_avg_rebounds': home_form['total_rebounds'],
+        'home_fg_pct': home_form['fg_percentage'],
+        'home_three_pct': home_form['three_pt_percentage'],
+        'home_ft_pct': home_form['ft_percentage'],
+        'home_bench_scoring': home_form['bench_points'],
+        'home_win_percentage': home_form['won'],
+
         # Away team features
-        'away_avg_points': away_avg['total_points'],
-        'away_avg_assists': away_avg['total_assists'],
-        'away_avg_rebounds': away_avg['total_rebounds'],
-        'away_fg_pct': away_avg['fg_percentage'],
-        'away_three_pct': away_avg['three_pt_percentage'],
-        'away_ft_pct': away_avg['ft_percentage'],
-        'away_bench_scoring': away_avg['bench_points'],
-        'away_win_percentage': away_win_percentage,  # Added feature
-        
+        'away_avg_points': away_form['total_points'],
+        'away_avg_assists': away_form['total_assists'],
+        'away_avg_rebounds': away_form['total_rebounds'],
+        'away_fg_pct': away_form['fg_percentage'],
+        'away_three_pct': away_form['three_pt_percentage'],
+        'away_ft_pct': away_form['ft_percentage'],
+        'away_bench_scoring': away_form['bench_points'],
+        'away_win_percentage': away_form['won'],
+
         # Differential features
-        'point_diff': home_avg['total_points'] - away_avg['total_points'],
-        'assist_diff': home_avg['total_assists'] - away_avg['total_assists'],
-        'rebound_diff': home_avg['total_rebounds'] - away_avg['total_rebounds'],
-        'bench_scoring_diff': home_avg['bench_points'] - away_avg['bench_points']
-    }
-    
-    return pd.Series(matchup_features)
+        'point_diff': home_form['total_points'] - away_form['total_points'],
+        'assist_diff': home_form['total_assists'] - away_form['total_assists'],
+        'rebound_diff': home_form['total_rebounds'] - away_form['total_rebounds'],
+        'bench_scoring_diff': home_form['bench_points'] - away_form['bench_points']
+    })
 
-def train_prediction_model(home_team_abv, away_team_abv):
+def create_game_features(home_team_abv, away_team_abv, num_recent_games=FORM_WINDOW, home_rows=None, away_rows=None):
     """
-    Train the prediction model using historical matchup data
+    Create features for prediction using recent games data from both teams,
+    including win percentage.
     """
-    # Get historical games
-    home_games = get_team_recent_games(home_team_abv, 20)  # Use more games for training
-    away_games = get_team_recent_games(away_team_abv, 20)
-    
-    # Create training dataset
-    X = []
-    y = []
-    
-    for _, game in home_games.iterrows():
-        features = create_game_features(home_team_abv, away_team_abv)
-        if features is not None:
-            X.append(features)
-            y.append(1 if game['WL'] == 'W' else 0)
-    
-    if not X:
+    if home_rows is None:
+        home_rows = build_team_game_rows(home_team_abv, num_recent_games)
+    if away_rows is None:
+        away_rows = build_team_game_rows(away_team_abv, num_recent_games)
+
+    if home_rows.empty or away_rows.empty:
+        return None
+
+    features = matchup_features(
+        current_form(home_rows, num_recent_games),
+        current_form(away_rows, num_recent_games)
+    )
+    return features.iloc[0]
+
+def build_training_set(home_rows, away_rows, window=FORM_WINDOW):
+    """
+    Build one training row per game in either team's log. The row pairs the
+    team's form entering that game with the other team's form as of that date,
+    placed on the home/away side each team actually played, and is labelled
+    with whether the home side won.
+    """
+    feature_frames = []
+    labels = []
+
+    for team_rows, other_rows in ((home_rows, away_rows), (away_rows, home_rows)):
+        team_form = rolling_form(team_rows, window)
+        team_form['game_date'] = team_rows['game_date']
+        team_form['is_home'] = team_rows['is_home']
+        team_form['game_won'] = team_rows['won']
+        team_form = team_form.dropna()
+
+        # Other team's form over its games strictly before each date
+        other_form = trailing_form(other_rows, window)
+        other_form['game_date'] = other_rows['game_date']
+        other_form = pd.merge_asof(
+            team_form[['game_date']], other_form.dropna(),
+            on='game_date', allow_exact_matches=False
+        )
+
+        usable = other_form[FORM_COLUMNS].notna().all(axis=1).to_numpy()
+        team_form = team_form[usable].reset_index(drop=True)
+        other_form = other_form[usable].reset_index(drop=True)
+        if team_form.empty:
+            continue
+
+        is_home = team_form['is_home'] == 1
+        home_side = team_form[FORM_COLUMNS].where(is_home, other_form[FORM_COLUMNS])
+        away_side = other_form[FORM_COLUMNS].where(is_home, team_form[FORM_COLUMNS])
+        feature_frames.append(matchup_features(home_side, away_side))
+
+        team_won = team_form['game_won'].to_numpy()
+        labels.append(np.where(is_home, team_won, 1 - team_won))
+
+    if not feature_frames:
+        return pd.DataFrame(), np.array([])
+    return pd.concat(feature_frames, ignore_index=True), np.concatenate(labels)
+
+def build_league_training_set(team_rows, window=FORM_WINDOW):
+    """
+    Build one training row per game played between two teams in team_rows
+    (tricode -> rows from build_team_game_rows). Each side is the team's form
+    entering the game, and the row is labelled with whether the home team won.
+    """
+    forms = []
+    for rows in team_rows.values():
+        if rows.empty:
+            continue
+        form = rolling_form(rows, window).dropna()
+        form['game_id'] = rows['game_id']
+        form['game_date'] = rows['game_date']
+        form['is_home'] = rows['is_home']
+        form['game_won'] = rows['won']
+        forms.append(form)
+
+    if not forms:
+        return pd.DataFrame(), np.array([])
+    forms = pd.concat(forms, ignore_index=True).sort_values('game_date')
+    home = forms[forms['is_home'] == 1].drop_duplicates('game_id').set_index('game_id')
+    away = forms[forms['is_home'] == 0].drop_duplicates('game_id').set_index('game_id')
+    game_ids = home.index.intersection(away.index, sort=False)
+
+    X = matchup_features(home.loc[game_ids, FORM_COLUMNS], away.loc[game_ids, FORM_COLUMNS])
+    return X, home.loc[game_ids, 'game_won'].to_numpy()
+
+def fit_model(X, y):
+    """
+    Fit the scaler and random forest on a training set.
+    Returns (model, scaler, held-out accuracy).
+    """
+    if len(X) < 5 or len(set(y)) < 2:
         raise ValueError("No training data available")
-    
-    X = pd.DataFrame(X)
-    y = np.array(y)
-    
+
     # Split and scale data
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     X_test_scaled = scaler.transform(X_test)
-    
+
     # Train model
     model = RandomForestClassifier(n_estimators=100, random_state=42)
     model.fit(X_train_scaled, y_train)
-    
+
     return model, scaler, model.score(X_test_scaled, y_test)
 
-def predict_upcoming_game(home_team_abv, away_team_abv):
+def train_prediction_model(home_team_abv, away_team_abv, home_rows=None, away_rows=None):
     """
-    Predict the outcome of an upcoming game
+    Train the prediction model using historical matchup data
     """
-    # Train model
-    model, scaler, accuracy = train_prediction_model(home_team_abv, away_team_abv)
-    
-    # Get features for the upcoming game
-    features = create_game_features(home_team_abv, away_team_abv)
-    
-    if features is None:
-        return None
-    
-    # Make prediction
-    features_scaled = scaler.transform(features.values.reshape(1, -1))
-    probabilities = model.predict_proba(features_scaled)[0]
-    
+    if home_rows is None:
+        home_rows = build_team_game_rows(home_team_abv)
+    if away_rows is None:
+        away_rows = build_team_game_rows(away_team_abv)
+
+    with pipeline_stats.stage('training'):
+        X, y = build_training_set(home_rows, away_rows)
+        return fit_model(X, y)
+
+def train_league_model(num_games=50, window=FORM_WINDOW, team_abvs=None):
+    """
+    Train one model over every team's recent games.
+    Returns (model, scaler, metadata) ready for model_registry.
+    """
+    if team_abvs is None:
+        team_abvs = sorted(team['abbreviation'] for team in teams.get_teams())
+
+    team_rows = build_teams_game_rows(team_abvs, num_games)
+    X, y = build_league_training_set(team_rows, window)
+    model, scaler, accuracy = fit_model(X, y)
+
+    game_dates = pd.concat([rows['game_date'] for rows in team_rows.values() if not rows.empty])
+    metadata = {
+        'features': list(X.columns),
+        'form_window': window,
+        'games_per_team': num_games,
+        'teams': list(team_abvs),
+        'training_rows': len(X),
+        'first_game_date': game_dates.min().strftime('%Y-%m-%d'),
+        'last_game_date': game_dates.max().strftime('%Y-%m-%d'),
+        'accuracy': accuracy,
+    }
+    return model, scaler, metadata
+
+def predict_upcoming_game(home_team_abv, away_team_abv, artifact=None):
+    """
+    Predict the outcome of an upcoming game.
+
+    With a saved model artifact (see model_registry) only the two teams' current
+    form is built; without one a model is trained for this matchup first.
+    """
+    pipeline_stats.reset()
+
+    if artifact is not None:
+        model, scaler = artifact['model'], artifact['scaler']
+        window = artifact['metadata']['form_window']
+        accuracy = artifact['metadata']['accuracy']
+        home_rows = build_team_game_rows(home_team_abv, window)
+        away_rows = build_team_game_rows(away_team_abv, window)
+    else:
+        window = FORM_WINDOW
+        # Each team's game log and boxscores are gathered exactly once
+        home_rows = build_team_game_rows(home_team_abv)
+        away_rows = build_team_game_rows(away_team_abv)
+
+        # Train model
+        model, scaler, accuracy = train_prediction_model(home_team_abv, away_team_abv, home_rows, away_rows)
+
+    with pipeline_stats.stage('prediction'):
+        # Get features for the upcoming game
+        features = create_game_features(home_team_abv, away_team_abv, window, home_rows, away_rows)
+
+        if features is None:
+            return None
+        if artifact is not None and list(features.index) != artifact['metadata']['features']:
+            raise ValueError("Saved model was trained on different features; retrain it")
+
+        # Make prediction
+        features_scaled = scaler.transform(features.to_frame().T)
+        probabilities = model.predict_proba(features_scaled)[0]
+
     return {
         'home_win_probability': probabilities[1],
         'away_win_probability': probabilities[0],
-        'model_accuracy': accuracy
+        'model_accuracy': accuracy,
+        'model_version': artifact['version'] if artifact is not None else None,
+        'pipeline_stats': pipeline_stats.summary()
     }
 
+# game_id -> (tip-off timestamp, model version, prediction) kept by predict_slate
+_slate_predictions = {}
+_slate_lock = threading.Lock()
+
+def predict_slate(games, artifact=None, now=None):
+    """
+    Predict every pre-game matchup of a scoreboard's GameRecords in one pass.
+
+    Each team's form is built once, the whole slate goes through a single
+    predict_proba call, and each prediction is reused until its game tips off.
+    Without a saved model one model is trained on the slate teams' games.
+    Returns game_id -> prediction, in scoreboard order.
+    """
+    now = time.time() if now is None else now
+    version = artifact['version'] if artifact is not None else None
+    games = [game for game in games if game.status == 1]
+
+    predictions = {}
+    pending = []
+    with _slate_lock:
+        for game in games:
+            cached = _slate_predictions.get(game.game_id)
+            if cached and cached[1] == version and now < cached[0]:
+                predictions[game.game_id] = cached[2]
+            else:
+                pending.append(game)
+    metrics.count('predict.slate_cached', len(predictions))
+    if not pending:
+        return predictions
+
+    pipeline_stats.reset()
+    team_abvs = [team.tricode for game in pending for team in (game.home, game.away)]
+    if artifact is not None:
+        model, scaler = artifact['model'], artifact['scaler']
+        window = artifact['metadata']['form_window']
+        accuracy = artifact['metadata']['accuracy']
+        team_rows = build_teams_game_rows(team_abvs, window)
+    else:
+        window = FORM_WINDOW
+        team_rows = build_teams_game_rows(team_abvs)
+        with pipeline_stats.stage('training'):
+            model, scaler, accuracy = fit_model(*build_league_training_set(team_rows, window))
+
+    probabilities = []
+    with pipeline_stats.stage('prediction'):
+        # Games with a team that has no usable history are left out
+        pending = [
+            game for game in pending
+            if not team_rows[game.home.tricode].empty
+            and not team_rows[game.away.tricode].empty
+        ]
+        if pending:
+            features = matchup_features(
+                pd.concat([current_form(team_rows[game.home.tricode], window) for game in pending]),
+                pd.concat([current_form(team_rows[game.away.tricode], window) for game in pending])
+            )
+            if artifact is not None and list(features.columns) != artifact['metadata']['features']:
+                raise ValueError("Saved model was trained on different features; retrain it")
+            probabilities = model.predict_proba(scaler.transform(features))
+
+    with _slate_lock:
+        for game, game_probabilities in zip(pending, probabilities):
+            prediction = {
+                'home_team': game.home.tricode,
+                'away_team': game.away.tricode,
+                'home_win_probability': game_probabilities[1],
+                'away_win_probability': game_probabilities[0],
+                'model_accuracy': accuracy,
+                'model_version': version,
+            }
+            _slate_predictions[game.game_id] = (tipoff_timestamp(game), version, prediction)
+            predictions[game.game_id] = prediction
+
+    return {game.game_id: predictions[game.game_id] for game in games if game.game_id in predictions}
+
 # # Example usage
 # home_team_abv = 'BOS'  # Celtics
 # away_team_abv = 'NOP'  # Pelicans
@@ -1,15 +1,74 @@
 # Import required libraries
-import requests  # For making HTTP requests to fetch live data from the NBA API
 from datetime import datetime  # For handling date and time operations
 import streamlit as st  # For building the interactive web app interface
 import pandas as pd  # For data manipulation and creating data tables
 import time  # For managing time-based operations, like refresh intervals
-from nba_live_stats_db import NBALiveStatsDB  # Custom module for handling database operations
-from nba_predictor import predict_upcoming_game # Custom module for predicting nba games 
+from contextlib import contextmanager
+from nba_live_stats_db import boxscore_player_frame, open_database, read_snapshot  # Custom module for handling database operations
+from live_records import game_record, players_digest, scoreboard_records  # Compact records the page works from instead of the raw JSON
+from connection_manager import ConnectionManager
+from nba_archive import attach_archive
+from table_browser import BROWSABLE_TABLES, PAGE_SIZE, count_rows, fetch_page, table_columns
+from nba_predictor import predict_slate, predict_upcoming_game # Custom module for predicting nba games 
+from nba_fetch import fetch_boxscore, fetch_due_boxscores, fetch_scoreboard  # Shared fetch layer with on-disk boxscore caching
 
 import json
-# Initialize the database for storing NBA game, team, and player data
-db = NBALiveStatsDB()
+from poll_scheduler import PollScheduler
+from model_registry import ModelRegistry
+from live_win_probability import LiveWinProbability
+from nba_metrics import metrics, read_metrics
+
+# Timed as page.run, from here until the page is drawn
+page_started = time.perf_counter()
+
+# When the background ingester (python -m nba_live_stats_db ingest) is running,
+# the page only reads its latest snapshot and never writes to the database.
+snapshot = read_snapshot()
+
+@st.cache_resource(on_release=lambda manager: manager.close())
+def get_connection_manager():
+    # One manager per server process: sessions share a serialized writer and a
+    # pool of read cursors, and the file is only held while one is in use
+    return ConnectionManager()
+
+# Otherwise this page polls and writes itself, as it did before the ingester existed
+manager = get_connection_manager() if snapshot is None else None
+
+@st.cache_resource
+def get_poll_scheduler():
+    # One scheduler per server process, shared by every session
+    return PollScheduler()
+
+@st.cache_resource
+def get_latest_boxscores():
+    # game_id -> latest boxscore (GameRecord), shared by every session so games
+    # the scheduler does not poll this refresh keep showing their last boxscore
+    return {}
+
+@st.cache_resource
+def get_live_win_probability():
+    # Shared by every session so each game keeps one probability timeline
+    return LiveWinProbability()
+
+@st.cache_resource
+def load_prediction_model(version):
+    # Each saved version is loaded once per server process and kept in memory;
+    # a retrain (python -m model_registry retrain) shows up as a new version
+    return ModelRegistry().load(version)
+
+@contextmanager
+def database_reader():
+    # Read through a pooled cursor, or briefly open a read-only connection so the
+    # ingester's writes are never blocked between refreshes
+    if manager is not None:
+        with manager.reader() as reader:
+            yield reader
+        return
+    reader = open_database(read_only=True)
+    try:
+        yield reader
+    finally:
+        reader.close()
 
 
 
@@ -21,230 +80,368 @@ st.sidebar.markdown(
     """
 )
 
-# Function to format the minutes played in a human-readable format
-def format_minutes(minutes_str):
-    try:
-        # Extract minutes and seconds from the input string (e.g., "PT12M34.56S")
-        minutes = minutes_str.split('PT')[1].split('M')[0]
-        seconds = minutes_str.split('M')[1].split('.')[0]
-        # Return formatted time in "MM:SS" format
-        return f"{minutes}:{seconds.zfill(2)}"
-    except:
-        # Return "0:00" if input format is invalid or minutes are not available
-        return "0:00"
-
 # Function to fetch player statistics for a specific game
 def fetch_player_stats(game_id):
     try:
-        # Send a GET request to fetch the game's box score data
-        response = requests.get(
-            f"https://cdn.nba.com/static/json/liveData/boxscore/boxscore_{game_id}.json"
-        )
-        response.raise_for_status()  # Raise an error if the request fails
-        data = response.json()  # Parse the response as JSON
-        if not data or 'game' not in data:
+        # Fetch the game's box score as a GameRecord, served from the shared cache when fresh
+        game = fetch_boxscore(game_id, records=True)
+        if game is None:
             # Show a warning in the app if the game data is missing
             st.warning(f"Missing 'game' key in data for game ID {game_id}.")
-            return None
-        return data['game']  # Return the game data
+        return game
     except Exception as e:
         # Show an error message in the app if fetching data fails
         st.error(f"Error fetching player stats: {e}")
         return None
 
+@st.cache_data(max_entries=256, show_spinner=False)
+def player_stats_tables(game_id, players_digest, _game_data):
+    # Keyed by the game and a digest of its player lines, so the tables are rebuilt
+    # whenever any line changes; _game_data (a GameRecord) is not hashed
+    players = boxscore_player_frame(_game_data)
+    seconds = players['seconds_played'].astype(int)
+
+    def made_attempted(made, attempted):
+        return players[made].astype(str) + '-' + players[attempted].astype(str)
+
+    # Every column is formatted at once rather than row by row
+    table = pd.DataFrame({
+        'PLAYER': players['name'].astype(str) + players['starter'].map({True: ' (S)', False: ''}).astype(str),
+        'MIN': (seconds // 60).astype(str) + ':' + (seconds % 60).astype(str).str.zfill(2),
+        'PTS': players['points'],
+        'REB': players['rebounds'],
+        'AST': players['assists'],
+        'BLK': players['blocks'],
+        'FG': made_attempted('field_goals_made', 'field_goals_attempted'),
+        'FG%': (players['field_goals_percentage'] * 100).round(1).astype(str),
+        '3P': made_attempted('three_pointers_made', 'three_pointers_attempted'),
+        'FT': made_attempted('free_throws_made', 'free_throws_attempted'),
+    })
+    is_home = players['is_home'].astype(bool)
+    return {'homeTeam': table[is_home].reset_index(drop=True), 'awayTeam': table[~is_home].reset_index(drop=True)}
+
 # Function to display player statistics for both teams in a game
-def display_player_stats(game_id, home_team, away_team):
-    # Fetch game data using the game ID
-    game_data = fetch_player_stats(game_id)
-    # example_output_file = "output.json"
-    # with open(example_output_file, "w") as file:
-    #     json.dump(game_data, file, indent=4)  # 'indent=4' makes the JSON file more readable
-
-    #print(game_data)
+def display_player_stats(game_id, home_team, away_team, game_data=None):
+    # Fetch game data using the game ID unless it was already fetched in the batch
+    if game_data is None:
+        game_data = fetch_player_stats(game_id)
+
     if not game_data:
         st.warning("Player statistics are unavailable for this game.")
         return
 
+    tables = player_stats_tables(game_id, players_digest(game_data), game_data)
+
     # Create tabs for home and away teams
     team_tab2, team_tab1 = st.tabs([
-        f"{away_team['teamCity']} {away_team['teamName']}",
-        f"{home_team['teamCity']} {home_team['teamName']}"
-        
+        f"{away_team.city} {away_team.name}",
+        f"{home_team.city} {home_team.name}"
     ])
 
-    # Display player stats for the home team
-    
-    with team_tab1:
-        players = game_data.get('homeTeam', {}).get('players', [])
-        if players:
-            players_data = []
-            for player in players:
-                if player.get('played'):  # Only include players who played
-                    stats = player.get('statistics', {})
-                    players_data.append({
-                        'PLAYER': f"{player['name']} {'(S)' if player.get('starter') == '1' else ''}",
-                        'MIN': format_minutes(stats.get('minutes', '0')),
-                        'PTS': stats.get('points', 0),
-                        'REB': stats.get('reboundsTotal', 0),
-                        'AST': stats.get('assists', 0),
-                        'FG': f"{stats.get('fieldGoalsMade', 0)}-{stats.get('fieldGoalsAttempted', 0)}",
-                        'FG%': f"{stats.get('fieldGoalsPercentage', 0) * 100:.1f}",
-                        '3P': f"{stats.get('threePointersMade', 0)}-{stats.get('threePointersAttempted', 0)}",
-                        'FT': f"{stats.get('freeThrowsMade', 0)}-{stats.get('freeThrowsAttempted', 0)}"
-                    })
-            if players_data:
-                # Display the player stats in a table
-                st.dataframe(pd.DataFrame(players_data), use_container_width=True)
-            else:
-                st.info("No statistics available for home team players.")
-
-    # Display player stats for the away team
-    with team_tab2:
-        players = game_data.get('awayTeam', {}).get('players', [])
-        if players:
-            players_data = []
-            for player in players:
-                if player.get('played'):  # Only include players who played
-                    stats = player.get('statistics', {})
-                    players_data.append({
-                        'PLAYER': f"{player['name']} {'(S)' if player.get('starter') == '1' else ''}",
-                        'MIN': format_minutes(stats.get('minutes', '0')),
-                        'PTS': stats.get('points', 0), 
-                        'REB': stats.get('reboundsTotal', 0),
-                        'AST': stats.get('assists', 0),
-                        'BLK': stats.get('blocks', 0),
-                        'FG': f"{stats.get('fieldGoalsMade', 0)}-{stats.get('fieldGoalsAttempted', 0)}",
-                        'FG%': f"{stats.get('fieldGoalsPercentage', 0) * 100:.1f}",
-                        '3P': f"{stats.get('threePointersMade', 0)}-{stats.get('threePointersAttempted', 0)}",
-                        'FT': f"{stats.get('freeThrowsMade', 0)}-{stats.get('freeThrowsAttempted', 0)}"
-                    })
-            if players_data:
+    for tab, side, label in ((team_tab1, 'homeTeam', 'home'), (team_tab2, 'awayTeam', 'away')):
+        with tab:
+            table = tables[side]
+            if len(table):
                 # Display the player stats in a table
-                st.dataframe(pd.DataFrame(players_data), use_container_width=True)
+                st.dataframe(table, use_container_width=True)
             else:
-                st.info("No statistics available for away team players.")
+                st.info(f"No statistics available for {label} team players.")
 
 # Main application interface
 st.title("🏀 NBA Live Games")  # App title
 
 # Sidebar controls for refresh interval
-refresh_interval = st.sidebar.slider("Refresh Interval (seconds):", min_value=5, max_value=120, value=30, step=5)
+refresh_interval = st.sidebar.slider(
+    "Refresh Interval (seconds):", min_value=5, max_value=120, value=30, step=5,
+    help="Longest wait between refreshes. Refreshes come sooner while a game is live."
+)
 
 # Button to reset the database
 if st.sidebar.button("Reset Database"):
-    db.clear_database()  # Clear all data in the database
+    if manager is None:
+        st.sidebar.warning("The database is managed by the background ingester.")
+    else:
+        with manager.writer() as db:
+            db.clear_database()  # Clear all data in the database
 
 # Sidebar section to display database statistics
 with st.sidebar:
     st.subheader("Database Statistics")
-    stats = db.get_database_stats()
+    if snapshot:
+        stats = snapshot['database_stats']
+    else:
+        with database_reader() as reader:
+            stats = reader.get_database_stats()
     st.write(f"Total Games Tracked: {stats[0]}")
     st.write(f"Total Teams: {stats[1]}")
     st.write(f"Total Players: {stats[2]}")
     view_database = st.checkbox("View Database")
+    show_diagnostics = st.checkbox("Show Diagnostics", help="Time spent per stage and cache hit rates")
 
-# If "View Database" is checked, display database tables
+def display_metrics(report):
+    # Stage latencies first, then counters and the fetch/cache stats behind them
+    if not report['stages']:
+        st.caption("Nothing recorded yet.")
+        return
+    stages = pd.DataFrame(report['stages']).T[['count', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms']]
+    st.dataframe(stages.astype(float).round(1).sort_index(), use_container_width=True)
+    fetch = report['sources'].get('conditional_fetch')
+    if fetch:
+        st.write(f"Fetched {fetch['bytes_fetched'] / 1e6:.1f} MB in {fetch['requests']} requests, "
+                 f"{fetch['not_modified'] + fetch['unchanged_bodies']} unchanged")
+    cache = report['sources'].get('boxscore_cache')
+    if cache:
+        st.write(f"Boxscore cache hit rate: {cache['hit_rate']:.0%} ({cache['hits']} hits, {cache['misses']} misses)")
+    for name, value in sorted(report['counters'].items()):
+        st.write(f"{name}: {value}")
+
+if show_diagnostics:
+    with st.sidebar:
+        st.subheader("Diagnostics")
+        if not metrics.enabled:
+            st.caption("Metrics are turned off (NBA_METRICS=0).")
+        else:
+            display_metrics(metrics.report())
+        if snapshot:
+            ingester_report = read_metrics()
+            if ingester_report:
+                st.caption("Background ingester")
+                display_metrics(ingester_report)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def cached_row_count(table, column, contains, date_from, date_to):
+    # Counting a filtered table is the one full scan the browser needs, so it is
+    # only repeated when the filters change or the count is a minute old
+    with database_reader() as reader:
+        attach_archive(reader.conn)
+        return count_rows(reader.conn, table, column=column, contains=contains, date_from=date_from, date_to=date_to)
+
+# If "View Database" is checked, browse the tables a page at a time
 if view_database:
     st.subheader("📊 View Database")
     selected_table = st.selectbox(
         "Select a table to view:",
-        options=["Games", "Game Teams", "Players"]
+        options=list(BROWSABLE_TABLES)
     )
+    table = BROWSABLE_TABLES[selected_table]
     try:
-        # Display the selected table
-        if selected_table == "Games":
-            # Query all rows from the 'games' table in the database
-            games_data = db.conn.execute("SELECT * FROM games").df()
-            # Display the queried data as an interactive table in the app
-            st.dataframe(games_data)
-        elif selected_table == "Game Teams":
-            # Query all rows from the 'game_teams' table in the database
-            game_teams_data = db.conn.execute("SELECT * FROM game_teams").df()
-            # Display the queried data as an interactive table in the app
-            st.dataframe(game_teams_data)
-        elif selected_table == "Players":
-            # Query all rows from the 'players' table in the database
-            players_data = db.conn.execute("SELECT * FROM players").df()
-            # Display the queried data as an interactive table in the app
-            st.dataframe(players_data)
+        with database_reader() as reader:
+            # all_<table> views cover the live rows plus archived game dates
+            attach_archive(reader.conn)
+            columns = table_columns(reader.conn, table)
+
+            filter_col, contains_col, dates_col = st.columns(3)
+            filter_column = filter_col.selectbox("Filter column", options=[None] + columns, format_func=lambda c: c or "(none)")
+            contains = contains_col.text_input("Contains", disabled=filter_column is None)
+            game_dates = dates_col.date_input("Game dates", value=())
+            date_from = game_dates[0] if len(game_dates) > 0 else None
+            date_to = game_dates[1] if len(game_dates) > 1 else date_from
+            sort_col, order_col, page_col = st.columns(3)
+            sort_column = sort_col.selectbox("Sort by", options=[None] + columns, format_func=lambda c: c or "(table key)")
+            descending = order_col.checkbox("Descending")
+
+            filters = dict(column=filter_column, contains=contains, date_from=date_from, date_to=date_to)
+            total = cached_row_count(table, **filters)
+            pages = max(1, -(-total // PAGE_SIZE))
+            page = page_col.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1) - 1
+
+            # Only the requested page leaves DuckDB
+            page_data = fetch_page(reader.conn, table, page, PAGE_SIZE, sort_column, descending, **filters)
+        st.dataframe(page_data, use_container_width=True)
+        st.caption(f"Rows {page * PAGE_SIZE + 1 if total else 0}-{page * PAGE_SIZE + len(page_data)} of {total}")
 
     except Exception as e:
         st.error(f"Error fetching data from the {selected_table} table: {e}")
 
+def load_games():
+    """
+    Latest games and boxscores as GameRecords, and the write stats: the
+    ingester's snapshot, or fetched and written to the database here
+    """
+    if snapshot:
+        # Read the ingester's latest scoreboard and boxscores
+        latest = read_snapshot() or snapshot
+        boxscores = {game_id: game_record(game_data) for game_id, game_data in latest['boxscores'].items()}
+        return scoreboard_records(latest['scoreboard']), boxscores, latest['write_stats']
+    # Conditional request: an unchanged scoreboard is neither downloaded nor
+    # parsed again, and its records are reused as they are
+    games, _ = fetch_scoreboard(convert=scoreboard_records)
+    # Fetch the boxscores of the games the scheduler reports as due in one
+    # concurrent batch; the others keep the boxscore fetched last time
+    latest_boxscores = get_latest_boxscores()
+    fetched, _ = fetch_due_boxscores(games, get_poll_scheduler(), latest_boxscores, records=True)
+    # Update database with game and player data in one transaction
+    with manager.writer() as db:
+        write_stats = db.process_records(games, [game for game in fetched.values() if game])
+    boxscores = {game.game_id: latest_boxscores.get(game.game_id) for game in games if game.status != 1}
+    for game_id in set(latest_boxscores) - set(boxscores):
+        # Off the scoreboard now
+        latest_boxscores.pop(game_id, None)
+    if metrics.enabled:
+        # This page is doing the ingesting, so it publishes the metrics file
+        metrics.write()
+    return games, boxscores, write_stats
+
+def display_game_header(game):
+    away_team = game.away
+    home_team = game.home
+    st.subheader(f"{away_team.city} {away_team.name} ({away_team.wins}-{away_team.losses}) at "
+                 f"{home_team.city} {home_team.name} ({home_team.wins}-{home_team.losses})")
+
+def display_team_stats(game):
+    away_team = game.away
+    home_team = game.home
+    st.write("Team Stats")
+    st.write(f"Timeouts: {away_team.timeouts_remaining} - {home_team.timeouts_remaining}")
+    if away_team.in_bonus != "None":
+        st.write(f"{away_team.city} in bonus")
+    if home_team.in_bonus != "None":
+        st.write(f"{home_team.city} in bonus")
+
+def display_player_expander(game, boxscores):
+    # Tracking the expander's state lets a collapsed one skip fetching and
+    # building the player tables entirely
+    try:
+        expander = st.expander("View Player Statistics", key=f"player_stats_{game.game_id}", on_change="rerun")
+        with expander:
+            if expander.open:
+                display_player_stats(game.game_id, game.home, game.away, boxscores.get(game.game_id))
+    except Exception as e:
+        st.error(f"Error displaying player stats: {e}")
+
+def display_live_game(game, boxscores, live_win_probability):
+    game_id = game.game_id
+    display_game_header(game)
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.write(f"Q{game.period} - {game.clock}")
+        st.header(f"{game.away.score} - {game.home.score}")
+        home_probability = live_win_probability.current(game_id)
+        if home_probability is not None:
+            st.write(f"Live win probability: {game.home.tricode} {home_probability:.1%}")
+            timeline = pd.DataFrame(live_win_probability.timeline(game_id))
+            if len(timeline) > 1:
+                st.line_chart(timeline.set_index('elapsed')['home_win_probability'], height=150)
+    with col2:
+        display_team_stats(game)
+    display_player_expander(game, boxscores)
+    st.markdown("---")  # Separator for games
+
+def live_games_panel(page_run, game_states, games, boxscores):
+    # Runs on its own every refresh: only the live games are fetched and drawn again.
+    # Its first run reuses the data the page just loaded. Once a game tips off or
+    # goes final the whole page reruns to move its card.
+    panel_started = time.perf_counter()
+    if st.session_state.get('live_panel_run') == page_run:
+        games, boxscores, _ = load_games()
+    st.session_state['live_panel_run'] = page_run
+    if {game.game_id: game.status for game in games} != game_states:
+        st.rerun(scope="app")
+    live_win_probability = get_live_win_probability()
+    live_win_probability.update(games)
+    for game in games:
+        if game.status == 2:
+            display_live_game(game, boxscores, live_win_probability)
+    st.caption(f"Live games updated {datetime.now().strftime('%I:%M:%S %p')}")
+    metrics.record('page.live_panel', time.perf_counter() - panel_started)
+
 # Fetch live scoreboard data and process game information
 try:
-    response = requests.get("https://nba-prod-us-east-1-mediaops-stats.s3.amazonaws.com/NBA/liveData/scoreboard/todaysScoreboard_00.json")
-    response.raise_for_status()  # Raise an error if the request fails
-    scoreboard_data = response.json()  # Parse response as JSON
-    db.process_scoreboard_data(scoreboard_data)  # Update database with game data
+    games, boxscores, write_stats = load_games()
+    if snapshot:
+        st.sidebar.caption(f"Live data from the background ingester, updated {snapshot['fetched_at']}")
+    st.sidebar.caption(f"Last refresh: {write_stats['written']} rows written, {write_stats['skipped']} unchanged rows skipped")
+
+    model_version = ModelRegistry().latest_version()
+    if model_version is None and any(game.status == 1 for game in games):
+        st.info("⏳ No saved model yet, so predictions train one first. Run `python -m model_registry retrain` to train once for every matchup.", icon="ℹ️")
+
+    # Predict every upcoming game in one pass; once asked for, the slate stays
+    # predicted on later refreshes, reusing each game's prediction until tip-off
+    slate_predictions = {}
+    if any(game.status == 1 for game in games):
+        if st.button("Predict all upcoming games", key="predict_slate"):
+            st.session_state['predict_slate'] = True
+        if st.session_state.get('predict_slate'):
+            try:
+                with st.spinner('Predicting every upcoming game...'):
+                    artifact = load_prediction_model(model_version) if model_version else None
+                    slate_predictions = predict_slate(games, artifact)
+            except Exception as e:
+                st.error(f"Prediction error: {e}")
+
+    # Live win probability is re-evaluated only for games whose score or clock moved
+    live_win_probability = get_live_win_probability()
+    for game_id, prediction in slate_predictions.items():
+        live_win_probability.set_pregame(game_id, prediction['home_win_probability'])
+    live_win_probability.update(games)
+
+    # Wait until the next game is due, but never longer than the refresh interval
+    wait = None if snapshot else get_poll_scheduler().seconds_until_next_poll()
+    interval = refresh_interval if wait is None else min(refresh_interval, max(5, wait))
+
+    # Live games sit at the top and refresh on their own; the pre-game and final
+    # cards below them only change when the whole page reruns
+    game_states = {game.game_id: game.status for game in games}
+    if any(status == 2 for status in game_states.values()):
+        st.fragment(live_games_panel, run_every=interval)(time.time(), game_states, games, boxscores)
 
-    games = scoreboard_data['scoreboard']['games']
     for game in games:
-        game_id = game["gameId"]
-        away_team = game["awayTeam"]
-        home_team = game["homeTeam"]
+        if game.status == 2:
+            continue
+        game_id = game.game_id
+        away_team = game.away
+        home_team = game.home
 
         # Display game information
-        st.subheader(f"{away_team['teamCity']} {away_team['teamName']} ({away_team['wins']}-{away_team['losses']}) at "
-                     f"{home_team['teamCity']} {home_team['teamName']} ({home_team['wins']}-{home_team['losses']})")
-
-        game_status = game["gameStatusText"]
+        display_game_header(game)
         col1, col2 = st.columns([2, 1])
 
         with col1:
             # Display game status
-            if game["gameStatus"] == 1:  # Pre-game
-                game_time = datetime.strptime(game['gameEt'], '%Y-%m-%dT%H:%M:%SZ')
+            if game.status == 1:  # Pre-game
+                game_time = datetime.strptime(game.game_et, '%Y-%m-%dT%H:%M:%SZ')
                 st.info(f"🕒 Tip-off at {game_time.strftime('%I:%M %p ET')}")
-                st.info("⏳ Predictions may take over 4 minutes to generate due to extensive data collection and analysis.", icon="ℹ️")
-
-                if st.button(f"Predict Outcome for {home_team['teamName']} vs {away_team['teamName']}", key=f"predict_{game_id}"):
+                if game_id in slate_predictions:
+                    prediction = slate_predictions[game_id]
+                    st.success(f"Prediction: {home_team.tricode} with {prediction['home_win_probability']:.1%} win percentage")
+                elif st.button(f"Predict Outcome for {home_team.name} vs {away_team.name}", key=f"predict_{game_id}"):
                     try:
                         with st.spinner('Generating prediction...'):
-                            prediction = predict_upcoming_game(home_team['teamTricode'], away_team['teamTricode'])
-                            st.success(f"Prediction: {home_team['teamTricode']} with {prediction['home_win_probability']:.1%} win percentage")
+                            artifact = load_prediction_model(model_version) if model_version else None
+                            prediction = predict_upcoming_game(home_team.tricode, away_team.tricode, artifact)
+                            st.success(f"Prediction: {home_team.tricode} with {prediction['home_win_probability']:.1%} win percentage")
+                        if prediction['model_version']:
+                            st.caption(f"Model {prediction['model_version']}, held-out accuracy {prediction['model_accuracy']:.1%}")
+                        # Show how many network/API calls and how much time each stage used
+                        with st.expander("Prediction timing"):
+                            st.dataframe(pd.DataFrame(prediction['pipeline_stats']).T, use_container_width=True)
                     except Exception as e:
                         st.error(f"Prediction error: {e}")
 
 
                 continue
-            # elif game["gameStatusText"] == "Halftime":
-            #     st.header(f"Half-Time")
-            #     st.header(f"{away_team['score']} - {home_team['score']}")
 
-            elif game["gameStatus"] == 2:  # Live game
-                st.write(f"Q{game['period']} - {game['gameClock']}")
-                st.header(f"{away_team['score']} - {home_team['score']}")
             else:  # Final score
                 st.write("Final")
-                st.header(f"{away_team['score']} - {home_team['score']}")
-
+                st.header(f"{away_team.score} - {home_team.score}")
 
         with col2:
             # Display team statistics
-            st.write("Team Stats")
-            st.write(f"Timeouts: {away_team['timeoutsRemaining']} - {home_team['timeoutsRemaining']}")
-            if away_team['inBonus'] != "None":
-                st.write(f"{away_team['teamCity']} in bonus")
-            if home_team['inBonus'] != "None":
-                st.write(f"{home_team['teamCity']} in bonus")
-
-        
-        
-
+            display_team_stats(game)
 
         # Display player statistics for the game
-        try:
-            with st.expander("View Player Statistics"):
-                display_player_stats(game_id, home_team, away_team)
-        except Exception as e:
-            st.error(f"Error displaying player stats: {e}")
+        display_player_expander(game, boxscores)
 
         st.markdown("---")  # Separator for games
 
-    db.commit()  # Save changes to the database
-    time.sleep(refresh_interval)  # Wait for the refresh interval
-    st.rerun()  # Restart the app to refresh data
+    metrics.record('page.run', time.perf_counter() - page_started)
+
+    # While games are live their panel keeps refreshing; otherwise nothing on the
+    # page changes until the next game is due, so rerun the whole page then
+    if not any(status == 2 for status in game_states.values()):
+        time.sleep(interval)
+        st.rerun()  # Restart the app to refresh data
 
 except Exception as e:
     st.error(f"Error updating data: {e}")  # Handle errors gracefully
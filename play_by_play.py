@@ -0,0 +1,135 @@
+import json
+import re
+import threading
+
+import requests
+
+from nba_fetch import REQUEST_TIMEOUT, get_response
+from nba_metrics import metrics
+
+PLAYBYPLAY_URL = "https://cdn.nba.com/static/json/liveData/playbyplay/playbyplay_{game_id}.json"
+# Characters just before the resume point that must match for a feed to count
+# as appended to, rather than rewritten
+RESUME_CHECK_CHARS = 64
+
+_decoder = json.JSONDecoder()
+# Whitespace and the commas between the action objects
+_SEPARATORS = re.compile(r'[\s,]*')
+
+def actions_start(text):
+    """
+    Index just past the '[' opening a play-by-play document's actions array, or None
+    """
+    key = text.find('"actions"')
+    if key == -1:
+        return None
+    bracket = text.find('[', key)
+    return None if bracket == -1 else bracket + 1
+
+class ActionStream:
+    """
+    Decodes only the new actions of growing play-by-play documents.
+
+    A game's feed is one JSON document whose actions array gets longer all game.
+    Instead of json.loads on the whole document every tick, the stream
+    remembers where in the text it stopped and decodes the action objects
+    after that point one at a time with JSONDecoder.raw_decode. If the text
+    before the resume point changed (the feed was rewritten, or this is the
+    first document seen for the game) the array is decoded from the start and
+    the actions already processed are filtered out by action number.
+
+    fetch and new_actions only stage where the game got to. Call commit once
+    the actions are stored; until then the next tick fetches and decodes
+    from the last committed point again, so a failed write loses nothing.
+    """
+
+    def __init__(self):
+        # game_id -> (resume offset, text just before it, last action number)
+        self._resume = {}
+        # game_id -> ETag of the last document committed
+        self._etags = {}
+        # The same two, staged by fetch and new_actions until commit
+        self._pending_resume = {}
+        self._pending_etags = {}
+        self._lock = threading.Lock()
+
+    def last_action_number(self, game_id):
+        with self._lock:
+            state = self._resume.get(game_id)
+        return state[2] if state else 0
+
+    def new_actions(self, game_id, text, after=0):
+        """
+        Actions of a play-by-play document numbered above both `after` and the
+        last action committed for the game, in feed order
+        """
+        with self._lock:
+            state = self._resume.get(game_id)
+        start = None
+        if state is not None:
+            offset, check, last_number = state
+            after = max(after, last_number)
+            if len(text) >= offset and text[offset - len(check):offset] == check:
+                start = offset
+        if start is None:
+            start = actions_start(text)
+            if start is None:
+                return []
+
+        actions = []
+        position = start
+        with metrics.timer('parse.actions'):
+            while True:
+                next_position = _SEPARATORS.match(text, position).end()
+                if next_position >= len(text) or text[next_position] != '{':
+                    break
+                try:
+                    action, next_position = _decoder.raw_decode(text, next_position)
+                except ValueError:
+                    # A truncated document: keep what decoded and resume there next time
+                    break
+                position = next_position
+                if action.get('actionNumber', 0) > after:
+                    actions.append(action)
+
+        last_number = max([after] + [action.get('actionNumber', 0) for action in actions])
+        with self._lock:
+            self._pending_resume[game_id] = (position, text[max(0, position - RESUME_CHECK_CHARS):position], last_number)
+        return actions
+
+    def fetch(self, game_id, url_template=PLAYBYPLAY_URL, timeout=REQUEST_TIMEOUT):
+        """
+        The text of a game's play-by-play document, or None when it is
+        unchanged since the last fetch or not published yet
+        """
+        with self._lock:
+            etag = self._etags.get(game_id)
+        try:
+            with metrics.timer('fetch.playbyplay'):
+                response = get_response(url_template.format(game_id=game_id),
+                                        headers={'If-None-Match': etag} if etag else None, timeout=timeout)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code in (403, 404):
+                return None
+            raise
+        if response.status_code == 304:
+            return None
+        with self._lock:
+            self._pending_etags[game_id] = response.headers.get('ETag')
+        return response.content.decode('utf-8')
+
+    def commit(self, game_id):
+        """
+        Resume the game's next fetch and decode from what was staged for it,
+        once its actions are safely stored
+        """
+        with self._lock:
+            if game_id in self._pending_resume:
+                self._resume[game_id] = self._pending_resume.pop(game_id)
+            if game_id in self._pending_etags:
+                self._etags[game_id] = self._pending_etags.pop(game_id)
+
+    def forget(self, game_id):
+        with self._lock:
+            for states in (self._resume, self._etags, self._pending_resume, self._pending_etags):
+                states.pop(game_id, None)
@@ -0,0 +1,135 @@
+import re
+import time
+from datetime import datetime, timezone
+
+# Seconds between polls for each game state
+LIVE_INTERVAL = 10
+STOPPAGE_INTERVAL = 30
+BREAK_INTERVAL = 120
+PREGAME_INTERVAL = 60
+# Pre-game games are only polled within this many seconds of tip-off
+TIPOFF_WINDOW = 15 * 60
+
+# gameStatus values used by the live CDN
+GAME_STATUS_LIVE = 2
+GAME_STATUS_FINAL = 3
+
+_CLOCK_PATTERN = re.compile(r'PT(\d+)M([\d.]+)S')
+
+def clock_seconds(game_clock):
+    """
+    Seconds in an ISO duration clock such as "PT05M32.00S"
+    (0 when the clock is empty or unreadable)
+    """
+    match = _CLOCK_PATTERN.match(game_clock or '')
+    if not match:
+        return 0.0
+    return int(match.group(1)) * 60 + float(match.group(2))
+
+def tipoff_timestamp(game):
+    """
+    Tip-off time of a scoreboard GameRecord as a Unix timestamp
+    """
+    tipoff = datetime.strptime(game.time_utc, '%Y-%m-%dT%H:%M:%SZ')
+    return tipoff.replace(tzinfo=timezone.utc).timestamp()
+
+def is_break(game):
+    """
+    True during halftime and between periods, when nothing on the floor changes
+    """
+    status_text = game.status_text
+    return (
+        status_text.startswith('Half') or status_text.startswith('End of')
+        or game.clock in ('', 'PT00M00.00S')
+    )
+
+class PollScheduler:
+    """
+    Decides when each game should next be polled, based on its state.
+
+    Live games are polled every `live_interval` seconds, slowing to
+    `stoppage_interval` while the clock is stopped (timeouts, reviews) and to
+    `break_interval` at halftime and between periods. Pre-game games are left
+    alone until `tipoff_window` seconds before tip-off. Final games are polled
+    until their boxscore is persisted and then never again.
+    """
+
+    def __init__(self, live_interval=LIVE_INTERVAL, stoppage_interval=STOPPAGE_INTERVAL,
+                 break_interval=BREAK_INTERVAL, pregame_interval=PREGAME_INTERVAL,
+                 tipoff_window=TIPOFF_WINDOW):
+        self.live_interval = live_interval
+        self.stoppage_interval = stoppage_interval
+        self.break_interval = break_interval
+        self.pregame_interval = pregame_interval
+        self.tipoff_window = tipoff_window
+        # game_id -> next poll timestamp, or None once the game needs no more polls
+        self._next_poll = {}
+        # game_id -> (gameStatus, period, gameClock) from the last scoreboard seen
+        self._last_state = {}
+        self._persisted = set()
+
+    def _interval(self, game, clock_stopped):
+        if is_break(game):
+            return self.break_interval
+        if clock_stopped:
+            return self.stoppage_interval
+        return self.live_interval
+
+    def _schedule(self, game, now, clock_stopped):
+        game_id = game.game_id
+        status = game.status
+        if status == GAME_STATUS_FINAL:
+            return None if game_id in self._persisted else now
+        if status == GAME_STATUS_LIVE:
+            return now + self._interval(game, clock_stopped)
+        tipoff = tipoff_timestamp(game)
+        if tipoff - now > self.tipoff_window:
+            return tipoff - self.tipoff_window
+        return now + self.pregame_interval
+
+    def poll_due(self, game, now=None):
+        """
+        Record a game's latest scoreboard state (a GameRecord) and return True if it should be
+        polled now. Due games are rescheduled from `now`.
+        """
+        now = time.time() if now is None else now
+        game_id = game.game_id
+        state = (game.status, game.period, game.clock)
+        previous = self._last_state.get(game_id)
+        self._last_state[game_id] = state
+        clock_stopped = previous == state
+
+        next_poll = self._next_poll.get(game_id, now)
+        status_changed = previous is not None and previous[0] != state[0]
+        if not status_changed and (next_poll is None or next_poll > now):
+            return False
+
+        self._next_poll[game_id] = self._schedule(game, now, clock_stopped)
+        return True
+
+    def mark_persisted(self, game_id):
+        """
+        Record that a final game's boxscore is stored, so it is never polled again
+        """
+        self._persisted.add(game_id)
+        if self._last_state.get(game_id, (None,))[0] == GAME_STATUS_FINAL:
+            self._next_poll[game_id] = None
+
+    def next_poll_time(self, game_id):
+        """
+        Timestamp of the game's next poll, or None if it needs no more polls
+        """
+        return self._next_poll.get(game_id)
+
+    def next_due_time(self):
+        """
+        Earliest next poll across all games, or None if nothing needs polling
+        """
+        pending = [t for t in self._next_poll.values() if t is not None]
+        return min(pending) if pending else None
+
+    def seconds_until_next_poll(self, now=None):
+        next_due = self.next_due_time()
+        if next_due is None:
+            return None
+        return max(0.0, next_due - (time.time() if now is None else now))
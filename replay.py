@@ -0,0 +1,334 @@
+import argparse
+import copy
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from nba_api.stats.static import teams
+
+EXAMPLE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Wall-clock seconds between two recorded ticks, the live ingester's usual cadence
+RECORDED_TICK_SECONDS = 30
+# Game-clock seconds that pass in one tick of a live game
+GAME_SECONDS_PER_TICK = 45
+PERIOD_SECONDS = 12 * 60
+PLAYERS_PER_TEAM = 13
+
+def _load_example(file_name):
+    with open(os.path.join(EXAMPLE_DIR, file_name)) as f:
+        return json.load(f)
+
+def _iso_clock(seconds):
+    return f"PT{int(seconds) // 60:02d}M{seconds % 60:05.2f}S"
+
+class _RecordedGame:
+    """
+    One game of a recorded night, played forward a tick at a time. The state
+    is kept as a boxscore 'game' section; the scoreboard entry is derived from it.
+    """
+
+    def __init__(self, index, home, away, tipoff, start_tick, scoreboard_template, boxscore_template, rng):
+        self.start_tick = start_tick
+        self.elapsed = 0
+        self.rng = rng
+        self.scoreboard_template = scoreboard_template
+        self.game = copy.deepcopy(boxscore_template)
+        game_id = f"00224{index + 1:05d}"
+        tipoff_utc = tipoff.strftime('%Y-%m-%dT%H:%M:%SZ')
+        self.game.update(
+            gameId=game_id, gameCode=f"{tipoff:%Y%m%d}/{away['abbreviation']}{home['abbreviation']}",
+            gameStatus=1, gameStatusText=f"{tipoff:%I:%M %p} ET", period=0, gameClock='',
+            gameTimeUTC=tipoff_utc, gameEt=tipoff_utc,
+        )
+        for side, team, team_index in (('homeTeam', home, 2 * index), ('awayTeam', away, 2 * index + 1)):
+            player_template = self.game[side]['players'][0]
+            players = []
+            for j in range(PLAYERS_PER_TEAM):
+                player = copy.deepcopy(player_template)
+                player.update(
+                    personId=1_000_000 + team_index * 100 + j, jerseyNum=str(j), order=j + 1,
+                    name=f"{team['nickname']} Player {j + 1}", starter='1' if j < 5 else '0', played='0',
+                )
+                player['statistics'] = {key: 0 for key in player['statistics']}
+                player['statistics'].update(minutes='PT00M00.00S', plusMinusPoints=0.0)
+                players.append(player)
+            self.game[side].update(
+                teamId=team['id'], teamName=team['nickname'], teamCity=team['city'],
+                teamTricode=team['abbreviation'], score=0, inBonus='0', timeoutsRemaining=7,
+                periods=[{'period': p, 'periodType': 'REGULAR', 'score': 0} for p in range(1, 5)],
+                players=players,
+            )
+        # Seconds each player has been on the floor
+        self.seconds = {player['personId']: 0.0 for side in ('homeTeam', 'awayTeam') for player in self.game[side]['players']}
+
+    def step(self, tick):
+        status = self.game['gameStatus']
+        if status == 3 or tick < self.start_tick:
+            return
+        if status == 1:
+            self.game.update(gameStatus=2, period=1)
+        self.elapsed = min(self.elapsed + GAME_SECONDS_PER_TICK, 4 * PERIOD_SECONDS)
+        period = min(4, self.elapsed // PERIOD_SECONDS + 1)
+        for side in ('homeTeam', 'awayTeam'):
+            self._play(self.game[side], period)
+        home, away = self.game['homeTeam'], self.game['awayTeam']
+        for side, team, opponent in (('homeTeam', home, away), ('awayTeam', away, home)):
+            for player in team['players']:
+                player['statistics']['plusMinusPoints'] = float(team['score'] - opponent['score'])
+
+        if self.elapsed >= 4 * PERIOD_SECONDS and home['score'] != away['score']:
+            self.game.update(gameStatus=3, gameStatusText='Final', period=4, gameClock='PT00M00.00S')
+        else:
+            remaining = max(0, period * PERIOD_SECONDS - self.elapsed)
+            self.game.update(period=period, gameClock=_iso_clock(remaining),
+                             gameStatusText=f"Q{period} {int(remaining) // 60}:{int(remaining) % 60:02d}")
+            if self.elapsed >= 4 * PERIOD_SECONDS:
+                # A tie at the buzzer: the next tick's free throw settles it
+                self.elapsed -= GAME_SECONDS_PER_TICK
+
+    def _play(self, team, period):
+        rng = self.rng
+        players = team['players']
+        for player in players:
+            share = 1.0 if player['starter'] == '1' else 0.4
+            self.seconds[player['personId']] += GAME_SECONDS_PER_TICK * share
+            player['played'] = '1' if self.seconds[player['personId']] else '0'
+            player['statistics']['minutes'] = _iso_clock(self.seconds[player['personId']])
+        weights = [3 if player['starter'] == '1' else 1 for player in players]
+        points = 0
+        for _ in range(rng.randint(1, 2)):
+            shooter = rng.choices(players, weights)[0]['statistics']
+            three = rng.random() < 0.35
+            shooter['fieldGoalsAttempted'] += 1
+            shooter['threePointersAttempted'] += three
+            if rng.random() < 0.48:
+                shooter['fieldGoalsMade'] += 1
+                shooter['threePointersMade'] += three
+                shooter['points'] += 3 if three else 2
+                points += 3 if three else 2
+                if rng.random() < 0.6:
+                    rng.choices(players, weights)[0]['statistics']['assists'] += 1
+            else:
+                rng.choices(players, weights)[0]['statistics']['reboundsTotal'] += 1
+        if rng.random() < 0.25:
+            shooter = rng.choices(players, weights)[0]['statistics']
+            made = rng.randint(0, 2)
+            shooter['freeThrowsAttempted'] += 2
+            shooter['freeThrowsMade'] += made
+            shooter['points'] += made
+            points += made
+        for player in players:
+            stats = player['statistics']
+            for made, attempted, pct in (
+                ('fieldGoalsMade', 'fieldGoalsAttempted', 'fieldGoalsPercentage'),
+                ('threePointersMade', 'threePointersAttempted', 'threePointersPercentage'),
+                ('freeThrowsMade', 'freeThrowsAttempted', 'freeThrowsPercentage'),
+            ):
+                stats[pct] = stats[made] / stats[attempted] if stats[attempted] else 0.0
+        team['score'] += points
+        team['periods'][period - 1]['score'] += points
+
+    def scoreboard_entry(self):
+        game = copy.deepcopy(self.scoreboard_template)
+        game.update({key: self.game[key] for key in (
+            'gameId', 'gameCode', 'gameStatus', 'gameStatusText', 'period',
+            'gameTimeUTC', 'gameEt', 'regulationPeriods'
+        )})
+        game['gameClock'] = '' if self.game['gameStatus'] != 2 else self.game['gameClock']
+        for side in ('homeTeam', 'awayTeam'):
+            team = self.game[side]
+            game[side] = dict(
+                game[side], periods=copy.deepcopy(team['periods']),
+                **{key: team[key] for key in ('teamId', 'teamName', 'teamCity', 'teamTricode', 'score', 'inBonus', 'timeoutsRemaining')}
+            )
+        return game
+
+def record_night(num_games=10, ticks=130, seed=0, date='2025-01-16'):
+    """
+    Generate a night of live payloads seeded from the example scoreboard and
+    boxscore: num_games games between real teams, tipping off in waves and
+    played forward with random baskets. Returns a list of ticks, each
+    {'scoreboard': ..., 'boxscores': {game_id: {'game': ...}}}, with a boxscore
+    for every game that has started.
+    """
+    rng = random.Random(seed)
+    scoreboard_template = _load_example('example_game_data.json')
+    boxscore_template = _load_example('example_box_score_data.json')['game']
+    game_template = scoreboard_template['scoreboard']['games'][0]
+    league = sorted(teams.get_teams(), key=lambda team: team['id'])
+    rng.shuffle(league)
+    if num_games * 2 > len(league):
+        raise ValueError(f"At most {len(league) // 2} games can be played in one night")
+
+    first_tipoff = datetime.strptime(date, '%Y-%m-%d') + timedelta(hours=19)
+    games = []
+    for i in range(num_games):
+        wave = i % 4
+        games.append(_RecordedGame(
+            i, league[2 * i], league[2 * i + 1], first_tipoff + timedelta(minutes=10 * wave),
+            # Waves tip off 10 minutes apart, and the first tick is all pre-game
+            1 + wave * (10 * 60 // RECORDED_TICK_SECONDS), game_template, boxscore_template, rng,
+        ))
+
+    night = []
+    for tick in range(ticks):
+        for game in games:
+            game.step(tick)
+        scoreboard = copy.deepcopy(scoreboard_template)
+        scoreboard['scoreboard']['gameDate'] = date
+        scoreboard['scoreboard']['games'] = [game.scoreboard_entry() for game in games]
+        night.append({
+            'scoreboard': scoreboard,
+            'boxscores': {
+                game.game['gameId']: {'game': copy.deepcopy(game.game)}
+                for game in games if game.game['gameStatus'] != 1
+            },
+        })
+    return night
+
+def save_night(night, path):
+    """
+    Write a recorded night as JSON lines, one tick per line
+    """
+    with open(path, 'w') as f:
+        for tick in night:
+            f.write(json.dumps(tick) + '\n')
+
+def load_night(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+class ReplayServer:
+    """
+    Local stand-in for the NBA CDN that serves a recorded night a tick at a time.
+
+    /scoreboard.json is the current tick's scoreboard and /boxscore_<id>.json
+    its boxscores (404 before tip-off). With a speed, ticks advance on their
+    own every RECORDED_TICK_SECONDS / speed seconds; without one, advance()
+    steps through them. Responses carry an ETag and answer 304 to a matching
+    If-None-Match, so conditional fetches behave as they do against the CDN.
+    """
+
+    def __init__(self, night, speed=None, host='127.0.0.1', port=0):
+        self.night = night
+        self.speed = speed
+        self.requests = 0
+        self._tick = 0
+        self._started = time.monotonic()
+        # (tick, path) -> (body, etag), for the current tick only
+        self._bodies = {}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.url = f"http://{host}:{self.server.server_address[1]}"
+        self.scoreboard_url = self.url + '/scoreboard.json'
+        self.boxscore_url = self.url + '/boxscore_{game_id}.json'
+
+    @property
+    def tick(self):
+        if self.speed:
+            elapsed = (time.monotonic() - self._started) * self.speed
+            return min(int(elapsed // RECORDED_TICK_SECONDS), len(self.night) - 1)
+        return self._tick
+
+    def advance(self):
+        """
+        Move to the next tick (the last one stays current) and return it
+        """
+        self._tick = min(self._tick + 1, len(self.night) - 1)
+        return self._tick
+
+    def payload_for(self, tick, path):
+        name = path.rsplit('/', 1)[-1]
+        if name == 'scoreboard.json':
+            return self.night[tick]['scoreboard']
+        if name.startswith('boxscore_') and name.endswith('.json'):
+            return self.night[tick]['boxscores'].get(name[len('boxscore_'):-len('.json')])
+        return None
+
+    def body_for(self, path):
+        tick = self.tick
+        with self._lock:
+            key = (tick, path)
+            if key not in self._bodies:
+                if any(cached_tick != tick for cached_tick, _ in self._bodies):
+                    self._bodies = {}
+                payload = self.payload_for(tick, path)
+                body = None if payload is None else json.dumps(payload).encode('utf-8')
+                self._bodies[key] = (body, body and '"%s"' % hashlib.sha1(body).hexdigest())
+            return self._bodies[key]
+
+    def _make_handler(self):
+        replay = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with replay._lock:
+                    replay.requests += 1
+                body, etag = replay.body_for(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._started = time.monotonic()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Record and replay a night of NBA live payloads")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    record = subcommands.add_parser('record', help="generate a night from the example payloads")
+    record.add_argument('path')
+    record.add_argument('--games', type=int, default=10)
+    record.add_argument('--ticks', type=int, default=130)
+    record.add_argument('--seed', type=int, default=0)
+    serve = subcommands.add_parser('serve', help="serve a recorded night as a local CDN")
+    serve.add_argument('path')
+    serve.add_argument('--speed', type=float, default=60, help="how many times faster than the recorded cadence")
+    serve.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        save_night(record_night(args.games, args.ticks, args.seed), args.path)
+        print(f"Recorded {args.ticks} ticks of {args.games} games to {args.path}")
+    elif args.command == 'serve':
+        with ReplayServer(load_night(args.path), args.speed, port=args.port) as replay:
+            print(f"Serving {replay.scoreboard_url} and {replay.boxscore_url}")
+            try:
+                while replay.tick < len(replay.night) - 1:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
@@ -0,0 +1,58 @@
+from nba_live_stats_db import TABLE_KEYS
+
+# Tables shown on the "View Database" page, by their label
+BROWSABLE_TABLES = {'Games': 'games', 'Game Teams': 'game_teams', 'Players': 'players'}
+PAGE_SIZE = 50
+
+def table_columns(conn, table):
+    """
+    Column names of a table's all_<table> view (see nba_archive.attach_archive)
+    """
+    return [row[0] for row in conn.execute(f"DESCRIBE all_{table}").fetchall()]
+
+def filter_clause(conn, table, column=None, contains=None, date_from=None, date_to=None):
+    """
+    WHERE clause and parameters for a case-insensitive "contains" filter on one
+    column and a game date range. Column names are checked against the table,
+    so only values are ever passed as parameters.
+    """
+    conditions, params = [], []
+    if column and contains:
+        if column not in table_columns(conn, table):
+            raise ValueError(f"Unknown column {column!r} for {table}")
+        conditions.append(f'CAST("{column}" AS VARCHAR) ILIKE ?')
+        params.append(f"%{contains}%")
+    if date_from or date_to:
+        game_dates = "SELECT game_id FROM all_games WHERE CAST(gameEt AS DATE) BETWEEN ? AND ?"
+        conditions.append(
+            "CAST(gameEt AS DATE) BETWEEN ? AND ?" if table == 'games' else f"game_id IN ({game_dates})"
+        )
+        params += [date_from or '0001-01-01', date_to or '9999-12-31']
+    return ('WHERE ' + ' AND '.join(conditions)) if conditions else '', params
+
+def count_rows(conn, table, **filters):
+    where, params = filter_clause(conn, table, **filters)
+    return conn.execute(f"SELECT COUNT(*) FROM all_{table} {where}", params).fetchone()[0]
+
+def fetch_page(conn, table, page=0, page_size=PAGE_SIZE, sort_column=None, descending=False, **filters):
+    """
+    One page of a table with the filters and sort done inside DuckDB. Rows are
+    ordered by the sort column and then the table's key, so pages never overlap.
+
+    Only the page is materialized, but every page still scans the filtered
+    rows and keeps the top (page + 1) * page_size of them, so a page costs
+    more the deeper it is: on 2M players page 0 takes about 0.05s and page
+    40,000 about 1s. Narrow the rows with the filters to reach deep pages.
+    """
+    columns = table_columns(conn, table)
+    if sort_column is not None and sort_column not in columns:
+        raise ValueError(f"Unknown column {sort_column!r} for {table}")
+    where, params = filter_clause(conn, table, **filters)
+    order = [f'"{sort_column}" {"DESC" if descending else "ASC"}'] if sort_column else []
+    order += [f'"{key}"' for key in TABLE_KEYS[table] if key != sort_column]
+    return conn.execute(f"""
+        SELECT * FROM all_{table}
+        {where}
+        ORDER BY {', '.join(order)}
+        LIMIT ? OFFSET ?
+    """, params + [page_size, page * page_size]).df()
@@ -0,0 +1,166 @@
+import threading
+from datetime import datetime
+
+import duckdb
+from nba_api.stats.endpoints import leaguegamefinder
+
+GAME_LOG_DB_PATH = 'nba_game_logs.db'
+# Seasons the predictor looks at, matched against the last four digits of SEASON_ID
+SEASONS = ('2024', '2025')
+# A team's log is synced again once its last sync is older than this
+SYNC_INTERVAL = 6 * 60 * 60
+
+# LeagueGameFinder columns kept in the store, with their DuckDB types
+GAME_LOG_COLUMNS = {
+    'SEASON_ID': 'VARCHAR',
+    'TEAM_ID': 'BIGINT',
+    'TEAM_ABBREVIATION': 'VARCHAR',
+    'TEAM_NAME': 'VARCHAR',
+    'GAME_ID': 'VARCHAR',
+    'GAME_DATE': 'DATE',
+    'MATCHUP': 'VARCHAR',
+    'WL': 'VARCHAR',
+    'MIN': 'INTEGER',
+    'PTS': 'INTEGER',
+    'FGM': 'INTEGER',
+    'FGA': 'INTEGER',
+    'FG_PCT': 'DOUBLE',
+    'FG3M': 'INTEGER',
+    'FG3A': 'INTEGER',
+    'FG3_PCT': 'DOUBLE',
+    'FTM': 'INTEGER',
+    'FTA': 'INTEGER',
+    'FT_PCT': 'DOUBLE',
+    'OREB': 'INTEGER',
+    'DREB': 'INTEGER',
+    'REB': 'INTEGER',
+    'AST': 'INTEGER',
+    'STL': 'INTEGER',
+    'BLK': 'INTEGER',
+    'TOV': 'INTEGER',
+    'PF': 'INTEGER',
+    'PLUS_MINUS': 'DOUBLE',
+}
+
+def fetch_league_game_log(team_id, date_from=None):
+    """
+    Download a team's game log from stats.nba.com, optionally only from date_from on
+    """
+    gamefinder = leaguegamefinder.LeagueGameFinder(
+        team_id_nullable=team_id,
+        date_from_nullable=date_from.strftime('%m/%d/%Y') if date_from else None
+    )
+    return gamefinder.get_data_frames()[0]
+
+class TeamGameLogStore:
+    """
+    Local DuckDB copy of every team's game log.
+
+    Each sync only asks the API for games on or after the latest stored
+    GAME_DATE, so after one warm-up sync per team the predictor's game-log
+    lookups are served from disk.
+    """
+
+    def __init__(self, db_path=GAME_LOG_DB_PATH, fetch_game_log=fetch_league_game_log, sync_interval=SYNC_INTERVAL):
+        self.conn = duckdb.connect(db_path)
+        self.fetch_game_log = fetch_game_log
+        self.sync_interval = sync_interval
+        # Number of game-log API calls made by this store
+        self.api_calls = 0
+        self._lock = threading.Lock()
+        self.create_tables()
+
+    def create_tables(self):
+        columns = ',\n'.join(f"{name} {sql_type}" for name, sql_type in GAME_LOG_COLUMNS.items())
+        self.conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS team_game_logs (
+                {columns},
+                PRIMARY KEY (TEAM_ID, GAME_ID)
+            )
+        """)
+        self.conn.execute("""
+            CREATE INDEX IF NOT EXISTS team_game_logs_team_date
+            ON team_game_logs (TEAM_ID, GAME_DATE)
+        """)
+        # When each team's log was last synced
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS team_game_log_syncs (
+                team_id BIGINT PRIMARY KEY,
+                synced_at TIMESTAMP
+            )
+        """)
+
+    def latest_game_date(self, team_id):
+        return self.conn.execute(
+            "SELECT MAX(GAME_DATE) FROM team_game_logs WHERE TEAM_ID = ?", [team_id]
+        ).fetchone()[0]
+
+    def needs_sync(self, team_id):
+        synced_at = self.conn.execute(
+            "SELECT synced_at FROM team_game_log_syncs WHERE team_id = ?", [team_id]
+        ).fetchone()
+        return synced_at is None or (datetime.now() - synced_at[0]).total_seconds() > self.sync_interval
+
+    def sync_team(self, team_id, force=False):
+        """
+        Fetch and store the team's games newer than the latest stored GAME_DATE.
+        Returns the number of rows stored, or None if the log was still fresh.
+        """
+        with self._lock:
+            if not force and not self.needs_sync(team_id):
+                return None
+
+            # The latest stored day is fetched again in case it was only partly played
+            games = self.fetch_game_log(team_id, self.latest_game_date(team_id))
+            self.api_calls += 1
+
+            games = games[[c for c in GAME_LOG_COLUMNS if c in games.columns]]
+            games = games.drop_duplicates(['TEAM_ID', 'GAME_ID'], keep='last')
+            columns = ', '.join(games.columns)
+            self.conn.execute("BEGIN TRANSACTION")
+            try:
+                if not games.empty:
+                    self.conn.register('game_log_batch', games)
+                    self.conn.execute(f"""
+                        INSERT OR REPLACE INTO team_game_logs ({columns})
+                        SELECT {columns} FROM game_log_batch
+                    """)
+                    self.conn.unregister('game_log_batch')
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO team_game_log_syncs VALUES (?, ?)", [team_id, datetime.now()]
+                )
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+            return len(games)
+
+    def recent_games(self, team_id, num_games=50, seasons=SEASONS):
+        """
+        A team's most recent games, newest first, in LeagueGameFinder's format
+        """
+        placeholders = ', '.join('?' for _ in seasons)
+        with self._lock:
+            return self.conn.execute(f"""
+                SELECT * REPLACE (strftime(GAME_DATE, '%Y-%m-%d') AS GAME_DATE)
+                FROM team_game_logs
+                WHERE TEAM_ID = ? AND right(SEASON_ID, 4) IN ({placeholders})
+                ORDER BY GAME_DATE DESC
+                LIMIT ?
+            """, [team_id, *seasons, num_games]).df()
+
+    def close(self):
+        self.conn.close()
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_game_log_store():
+    """
+    Return the process-wide game-log store, opening it on first use
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TeamGameLogStore()
+        return _store
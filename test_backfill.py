@@ -0,0 +1,122 @@
+import copy
+import os
+import subprocess
+import sys
+
+import pytest
+
+import backfill
+from nba_live_stats_db import NBALiveStatsDB
+from replay import ReplayServer, record_night
+
+
+def season_night(num_games):
+    # One tick serving num_games final boxscores under this season's game ids
+    night = record_night(num_games=4, ticks=130)
+    finals = list(night[-1]['boxscores'].values())
+    boxscores = {}
+    for i, game_id in enumerate(backfill.season_game_ids(2024, num_games)):
+        boxscore = copy.deepcopy(finals[i % len(finals)])
+        boxscore['game']['gameId'] = game_id
+        boxscores[game_id] = boxscore
+    return [{'scoreboard': night[-1]['scoreboard'], 'boxscores': boxscores}]
+
+
+def test_interrupted_backfill_resumes_from_its_checkpoint(tmp_path, monkeypatch):
+    night = season_night(10)
+    boxscores = night[0]['boxscores']
+    # Game 11 has no boxscore on the CDN
+    game_ids = backfill.season_game_ids(2024, 11)
+    db_path = str(tmp_path / 'live.db')
+
+    load_games = backfill.load_games
+    calls = []
+
+    def load_then_fail(db, games, current_time=None):
+        calls.append(len(games))
+        if len(calls) == 2:
+            raise RuntimeError("interrupted")
+        return load_games(db, games, current_time)
+
+    with ReplayServer(night) as replay:
+        monkeypatch.setattr(backfill, 'load_games', load_then_fail)
+        with pytest.raises(RuntimeError):
+            backfill.backfill(game_ids, db_path, replay.boxscore_url, workers=4, chunk_size=4, log=lambda message: None)
+        monkeypatch.setattr(backfill, 'load_games', load_games)
+
+        requests_before = replay.requests
+        result = backfill.backfill(game_ids, db_path, replay.boxscore_url, workers=4, chunk_size=4, log=lambda message: None)
+        # Only the games after the checkpointed first chunk were fetched again
+        assert replay.requests - requests_before == 7
+    assert result['already_loaded'] == 4
+    assert (result['loaded'], result['missing'], result['failed']) == (6, 1, 0)
+
+    played = sum(
+        player['played'] == '1'
+        for boxscore in boxscores.values()
+        for team in ('homeTeam', 'awayTeam') for player in boxscore['game'][team]['players']
+    )
+    db = NBALiveStatsDB(db_path)
+    try:
+        assert db.conn.execute("SELECT count(*) FROM backfill_progress").fetchone()[0] == 10
+        assert db.conn.execute("SELECT count(*) FROM games WHERE gameStatus = 3").fetchone()[0] == 10
+        assert db.conn.execute("SELECT count(*) FROM players").fetchone()[0] == played
+        scores = db.conn.execute("SELECT game_id, score FROM game_teams ORDER BY game_id, is_home").fetchall()
+        assert scores == [
+            (game_id, boxscore['game'][side]['score'])
+            for game_id, boxscore in boxscores.items() for side in ('awayTeam', 'homeTeam')
+        ]
+        assert db.conn.execute("SELECT count(*) FROM team_results").fetchone()[0] == 20
+        # Each game's players count once in the season totals, even the ones loaded before the interruption
+        assert db.conn.execute("SELECT sum(games) FROM player_season_totals").fetchone()[0] == played
+    finally:
+        db.close()
+
+
+def test_live_ingest_runs_between_backfill_chunks(tmp_path):
+    night = season_night(8)
+    db_path = str(tmp_path / 'live.db')
+    ingests = []
+
+    def ingest_between_chunks(message):
+        # The live ingester, in its own process, gives up if the file stays locked
+        ingester = subprocess.run(
+            [sys.executable, '-c',
+             'import sys; from nba_live_stats_db import ingest_once; '
+             'ingest_once(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4])',
+             db_path, str(tmp_path / 'snapshot.json'), replay.scoreboard_url, replay.boxscore_url],
+            capture_output=True, text=True, cwd=str(tmp_path),
+            env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__))),
+        )
+        ingests.append(ingester.returncode)
+        assert ingester.returncode == 0, ingester.stderr
+
+    with ReplayServer(night) as replay:
+        result = backfill.backfill(backfill.season_game_ids(2024, 8), db_path, replay.boxscore_url,
+                                   workers=4, chunk_size=4, log=ingest_between_chunks)
+    assert ingests == [0, 0] and os.path.exists(tmp_path / 'snapshot.json')
+    assert result['loaded'] == 8
+
+    db = NBALiveStatsDB(db_path)
+    try:
+        assert db.conn.execute("SELECT count(*) FROM backfill_progress").fetchone()[0] == 8
+        game_ids = set(backfill.season_game_ids(2024, 8))
+        game_ids.update(game['gameId'] for game in night[0]['scoreboard']['scoreboard']['games'])
+        assert db.conn.execute("SELECT count(*) FROM games").fetchone()[0] == len(game_ids)
+    finally:
+        db.close()
+
+
+def test_schedule_game_ids_keeps_final_games_in_range():
+    schedule = {'leagueSchedule': {'gameDates': [
+        {'games': [
+            {'gameId': '0012400001', 'gameDateEst': '2024-10-04T00:00:00Z', 'gameStatus': 3},
+            {'gameId': '0022400001', 'gameDateEst': '2024-10-22T00:00:00Z', 'gameStatus': 3},
+        ]},
+        {'games': [
+            {'gameId': '0022400003', 'gameDateEst': '2024-10-23T00:00:00Z', 'gameStatus': 3},
+            {'gameId': '0022400004', 'gameDateEst': '2024-10-23T00:00:00Z', 'gameStatus': 1},
+        ]},
+        {'games': [{'gameId': '0022400020', 'gameDateEst': '2024-10-25T00:00:00Z', 'gameStatus': 3}]},
+    ]}}
+    assert backfill.schedule_game_ids(schedule, '2024-10-01', '2024-10-23') == ['0022400001', '0022400003']
@@ -0,0 +1,57 @@
+import json
+import os
+
+from boxscore_cache import BoxscoreCache
+from conftest import load_example
+
+
+def test_final_games_persist_across_instances(tmp_path):
+    game = load_example('example_box_score_data.json')['game']
+    cache = BoxscoreCache(cache_dir=str(tmp_path), live_ttl=0)
+    cache.put(game['gameId'], game)
+
+    reopened = BoxscoreCache(cache_dir=str(tmp_path), live_ttl=0)
+    assert reopened.get(game['gameId']) == game
+    assert reopened.stats()['hits'] == 1
+
+
+def test_live_games_expire(tmp_path):
+    game = dict(load_example('example_box_score_data.json')['game'], gameStatus=2)
+    cache = BoxscoreCache(cache_dir=str(tmp_path), live_ttl=0)
+    cache.put(game['gameId'], game)
+
+    assert cache.get(game['gameId']) is None
+    assert cache.stats() == {
+        'entries': 0, 'bytes': 0, 'hits': 0, 'misses': 1, 'evictions': 0, 'hit_rate': 0.0,
+    }
+
+
+def test_lru_eviction_by_size(tmp_path):
+    game = load_example('example_box_score_data.json')['game']
+    size = len(json.dumps(game, separators=(',', ':')))
+    cache = BoxscoreCache(cache_dir=str(tmp_path), max_bytes=size * 2)
+
+    cache.put('a', game)
+    cache.put('b', game)
+    cache.get('a')  # 'b' is now the least recently used entry
+    cache.put('c', game)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == game
+    assert cache.get('c') == game
+    assert cache.evictions == 1
+    assert sorted(os.listdir(tmp_path)) == ['a.final.json', 'c.final.json']
+
+
+def test_unchanged_payload_only_refreshes_its_ttl(tmp_path):
+    game = dict(load_example('example_box_score_data.json')['game'], gameStatus=2)
+    cache = BoxscoreCache(cache_dir=str(tmp_path), live_ttl=60)
+    digest = cache.put(game['gameId'], game)
+    path = os.path.join(str(tmp_path), f"{game['gameId']}.live.json")
+    os.utime(path, (0, 0))
+    cache._entries[game['gameId']]['stored_at'] = 0
+
+    assert cache.put(game['gameId'], game) == digest
+    assert os.stat(path).st_mtime > 0
+    assert cache.get(game['gameId']) == game
+    assert cache.put(game['gameId'], dict(game, gameClock='PT01M00.00S')) != digest
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+import threading
+
+from conftest import load_example
+from connection_manager import ConnectionManager
+
+
+def test_concurrent_sessions_share_one_connection(tmp_path):
+    scoreboard_data = load_example('example_game_data.json')
+    boxscore_data = load_example('example_box_score_data.json')
+    manager = ConnectionManager(str(tmp_path / 'stats.db'), pool_size=4)
+    errors, counts = [], []
+
+    def session(index):
+        # Each simulated session refreshes once and then renders a few pages
+        try:
+            if index % 4 == 0:
+                with manager.writer() as db:
+                    db.process_refresh(scoreboard_data, [boxscore_data])
+            for _ in range(5):
+                with manager.reader() as reader:
+                    counts.append(reader.conn.execute("SELECT COUNT(*) FROM games").fetchone()[0])
+                    reader.get_database_stats()
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert manager.stats['writes'] == 8
+    assert manager.stats['reads'] == 32 * 5
+    # At most a pool's worth of cursors for each time the file was opened
+    assert manager.stats['cursors_opened'] <= 4 * manager.stats['connections_opened']
+    # Refreshes replace rows, so every reader saw either nothing yet or the full slate
+    assert set(counts) <= {0, len(scoreboard_data['scoreboard']['games'])}
+    manager.close()
+
+
+def test_other_processes_can_open_the_database_between_refreshes(tmp_path):
+    db_path = str(tmp_path / 'stats.db')
+    manager = ConnectionManager(db_path)
+    with manager.writer() as db:
+        db.process_refresh(load_example('example_game_data.json'), [load_example('example_box_score_data.json')])
+    with manager.reader() as reader:
+        reader.get_database_stats()
+
+    # The manager is still alive, as in a running dashboard, yet the ingester gets the file
+    ingester = subprocess.run(
+        [sys.executable, '-c', 'import sys; from nba_live_stats_db import open_database; '
+                               'db = open_database(sys.argv[1], retries=0); db.close()', db_path],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    assert ingester.returncode == 0, ingester.stderr
+    manager.close()
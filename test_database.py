@@ -1,22 +1,35 @@
-import duckdb
+from boxscore_cache import BoxscoreCache
+from nba_live_stats_db import NBALiveStatsDB, ingest_once, read_snapshot
+from replay import ReplayServer, record_night
 
-# Connect to the database
 
+def test_replayed_night_fills_every_table(tmp_path):
+    night = record_night(num_games=2, ticks=95)
+    db_path = str(tmp_path / 'live.db')
+    snapshot_path = str(tmp_path / 'snapshot.json')
+    cache = BoxscoreCache(str(tmp_path / 'cache'))
 
-conn = duckdb.connect('nba_live_stats.db')
+    with ReplayServer(night) as replay:
+        for _ in night:
+            ingest_once(db_path, snapshot_path, replay.scoreboard_url, replay.boxscore_url, cache=cache)
+            replay.advance()
 
-# Example queries to verify the data
-print("Games Table:")
-print(conn.execute("SELECT * FROM games LIMIT 5").fetchdf())  # Fetch and display 5 rows from games
-
-print("\nTeams Table:")
-print(conn.execute("SELECT * FROM teams LIMIT 5").fetchdf())  # Fetch and display 5 rows from teams
-
-print("\nPlayer Stats Table:")
-print(conn.execute("SELECT * FROM player_stats LIMIT 5").fetchdf())  # Fetch and display 5 rows from player_stats
-
-# Check the number of rows in each table
-print("\nRow Counts:")
-print(conn.execute("SELECT COUNT(*) AS games_count FROM games").fetchdf())
-print(conn.execute("SELECT COUNT(*) AS teams_count FROM teams").fetchdf())
-print(conn.execute("SELECT COUNT(*) AS player_stats_count FROM player_stats").fetchdf()) 
\ No newline at end of file
+    final_games = night[-1]['scoreboard']['scoreboard']['games']
+    played = sum(
+        player['played'] == '1'
+        for boxscore in night[-1]['boxscores'].values()
+        for team in ('homeTeam', 'awayTeam') for player in boxscore['game'][team]['players']
+    )
+    db = NBALiveStatsDB(db_path, read_only=True)
+    try:
+        assert db.conn.execute("SELECT COUNT(*) FROM games WHERE gameStatus = 3").fetchone()[0] == len(final_games)
+        assert db.conn.execute("SELECT COUNT(*) FROM teams").fetchone()[0] == 2 * len(final_games)
+        assert db.conn.execute("SELECT COUNT(*) FROM players").fetchone()[0] == played
+        scores = db.conn.execute("SELECT game_id, score FROM game_teams ORDER BY game_id, is_home").fetchall()
+        assert scores == [
+            (game['gameId'], game[side]['score']) for game in final_games for side in ('awayTeam', 'homeTeam')
+        ]
+        assert db.get_database_stats() == (len(final_games), 2 * len(final_games), played)
+    finally:
+        db.close()
+    assert read_snapshot(snapshot_path)['scoreboard'] == night[-1]['scoreboard']
@@ -0,0 +1,47 @@
+import copy
+
+import pytest
+
+from conftest import load_example
+from feature_engine import flatten_boxscores, team_game_features
+from live_records import game_record
+
+
+@pytest.fixture
+def game_data():
+    game = load_example('example_box_score_data.json')['game']
+    home = game['homeTeam']
+    starter = home['players'][0]
+    bench = copy.deepcopy(starter)
+    bench.update(personId=1, starter='0')
+    bench['statistics'].update(points=10, fieldGoalsMade=5, fieldGoalsAttempted=8, threePointersMade=0, threePointersAttempted=0)
+    dnp = copy.deepcopy(starter)
+    dnp.update(personId=2, starter='0', played='0')
+    home['players'] = [starter, bench, dnp]
+    return game
+
+
+def test_flatten_keeps_players_who_played(game_data):
+    players = flatten_boxscores([game_record(game_data), None])
+    away_played = sum(player['played'] == '1' for player in game_data['awayTeam']['players'])
+    assert len(players) == 2 + away_played
+    assert players['starter'].tolist()[:2] == [True, False]
+    assert players['points'].tolist()[1] == 10
+
+
+def test_team_aggregates(game_data):
+    teams = team_game_features([game_record(game_data)]).set_index('team_tricode')
+    home = teams.loc[game_data['homeTeam']['teamTricode']]
+    starter = game_data['homeTeam']['players'][0]['statistics']
+
+    assert home['num_players'] == 2
+    assert home['is_home'] == 1
+    assert home['starters_points'] == starter['points']
+    assert home['bench_points'] == 10
+    # Mean of the player percentages: 50% and 62.5%
+    assert home['fg_percentage'] == pytest.approx((50.0 + 62.5) / 2)
+    # Attempt-weighted: (6 + 5) / (12 + 8)
+    assert home['fg_pct_weighted'] == pytest.approx(55.0)
+    # The bench player took no threes, so only the weighted figure ignores them
+    assert home['three_pt_percentage'] == pytest.approx(20.0)
+    assert home['three_pt_pct_weighted'] == pytest.approx(40.0)
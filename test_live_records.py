@@ -0,0 +1,39 @@
+from conftest import load_example
+from live_records import STAT_INDEX, game_record, joined_column, players_digest, scoreboard_records
+
+
+def test_scoreboard_game_keeps_team_records_and_no_players():
+    scoreboard_data = load_example('example_game_data.json')
+    game = scoreboard_data['scoreboard']['games'][0]
+    record = scoreboard_records(scoreboard_data)[0]
+
+    assert (record.game_id, record.status, record.clock) == (game['gameId'], game['gameStatus'], game['gameClock'])
+    assert (record.home.wins, record.home.losses) == (game['homeTeam']['wins'], game['homeTeam']['losses'])
+    assert record.away.period1_score == game['awayTeam']['periods'][0]['score']
+    assert record.home.players is None
+
+
+def test_boxscore_players_are_stored_by_column():
+    game_data = load_example('example_box_score_data.json')['game']
+    record = game_record(game_data)
+    played = [p for p in game_data['homeTeam']['players'] if p.get('played') == '1']
+    players = record.home.players
+
+    assert record.home.wins is None
+    assert len(players) == len(played)
+    assert list(players.names) == [p['name'] for p in played]
+    assert players.stat_matrix()[:, STAT_INDEX['points']].tolist() == [p['statistics']['points'] for p in played]
+    person_ids = joined_column([record.home.players, record.away.players], 'person_ids')
+    assert len(person_ids) == len(players) + len(record.away.players)
+    assert game_record(None) is None
+
+
+def test_players_digest_follows_every_player_line():
+    game_data = load_example('example_box_score_data.json')['game']
+    digest = players_digest(game_record(game_data))
+    assert players_digest(game_record(game_data)) == digest
+
+    # A rebound moves neither the score nor the clock
+    player = next(p for p in game_data['homeTeam']['players'] if p.get('played') == '1')
+    player['statistics']['reboundsTotal'] += 1
+    assert players_digest(game_record(game_data)) != digest
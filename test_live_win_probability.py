@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from conftest import load_example
+from live_records import game_record
+import live_win_probability
+from live_win_probability import (
+    GAME_SECONDS, LiveWinProbability, seconds_remaining, win_probabilities, win_probability
+)
+
+
+def test_seconds_remaining():
+    assert seconds_remaining(1, 'PT12M00.00S') == GAME_SECONDS
+    assert seconds_remaining(3, 'PT05M30.50S') == 12 * 60 + 5 * 60 + 30.5
+    assert seconds_remaining(5, 'PT02M00.00S') == 120
+    assert seconds_remaining(4, '') == 0
+
+
+def test_probabilities_follow_margin_and_time():
+    # Even game at tip-off favours the home side by home court only
+    assert 0.5 < win_probability(0, GAME_SECONDS) < 0.6
+    # The same lead is worth more late in the game
+    assert win_probability(5, 60) > win_probability(5, 1800) > 0.5
+    assert win_probability(-3, 0) == 0.0
+    assert win_probability(0, 0) == 0.5
+
+    margins = np.array([0, 5, 5, -3, 0])
+    remaining = np.array([GAME_SECONDS, 60, 1800, 0, 0])
+    expected = [win_probability(m, r) for m, r in zip(margins, remaining)]
+    assert win_probabilities(margins, remaining) == pytest.approx(expected)
+
+
+def test_timeline_only_grows_when_the_game_changes():
+    game = game_record(load_example('example_game_data.json')['scoreboard']['games'][0])
+    game.status, game.period, game.clock = 2, 2, 'PT06M00.00S'
+    game.home.score, game.away.score = 50, 40
+    engine = LiveWinProbability()
+
+    first = engine.update([game])
+    assert first[game.game_id] > 0.5
+    assert engine.update([game]) == {}
+
+    game.away.score = 52
+    game.clock = 'PT05M10.00S'
+    engine.update([game])
+    timeline = engine.timeline(game.game_id)
+    assert [point['margin'] for point in timeline] == [10, -2]
+    assert timeline[1]['elapsed'] > timeline[0]['elapsed']
+    assert engine.current(game.game_id) < 0.5
+
+    # A pre-game favourite keeps more of its edge
+    engine.set_pregame(game.game_id, 0.8)
+    game.clock = 'PT05M00.00S'
+    assert engine.update([game])[game.game_id] > timeline[1]['home_win_probability']
+
+
+def test_timelines_are_capped_and_dropped_with_their_games(monkeypatch):
+    monkeypatch.setattr(live_win_probability, 'MAX_TIMELINE_POINTS', 3)
+    game = game_record(load_example('example_game_data.json')['scoreboard']['games'][0])
+    game.status, game.period, game.home.score, game.away.score = 2, 1, 0, 0
+    engine = LiveWinProbability()
+    engine.set_pregame(game.game_id, 0.7)
+
+    for seconds in range(5):
+        game.clock = f'PT10M{seconds:02d}.00S'
+        engine.update([game])
+    assert [point['clock'] for point in engine.timeline(game.game_id)] == [
+        'PT10M02.00S', 'PT10M03.00S', 'PT10M04.00S'
+    ]
+
+    # Final games and games that left the scoreboard are forgotten
+    game.status = 3
+    assert engine.update([game]) == {}
+    assert engine.timeline(game.game_id) == [] and engine.current(game.game_id) is None
+    game.status = 2
+    engine.update([game])
+    assert engine.update([]) == {}
+    assert engine.timelines == {} and engine._expected_margin == {}
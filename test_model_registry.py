@@ -0,0 +1,48 @@
+import nba_predictor
+from model_registry import ModelRegistry
+from nba_predictor import build_league_training_set, fit_model, predict_upcoming_game
+from test_nba_predictor import make_team_rows
+
+
+def league_rows():
+    # Two teams whose logs share every game, home and away alternating
+    home_rows = make_team_rows(40)
+    away_rows = make_team_rows(40, offset=1)
+    away_rows['game_id'] = home_rows['game_id']
+    away_rows['game_date'] = home_rows['game_date']
+    away_rows['is_home'] = 1 - home_rows['is_home']
+    away_rows['won'] = 1 - home_rows['won']
+    return {'AAA': home_rows, 'BBB': away_rows}
+
+
+def test_league_training_set_pairs_both_sides_of_each_game():
+    team_rows = league_rows()
+    X, y = build_league_training_set(team_rows, window=10)
+
+    assert len(X) == len(y) == 40 - 5
+    aaa = team_rows['AAA']
+    # AAA was at home for odd games and away for even ones; the label follows the home side
+    assert y[-1] == aaa['won'].iloc[-1]
+    assert y[-2] == 1 - aaa['won'].iloc[-2]
+
+
+def test_saved_model_round_trips_and_predicts(tmp_path, monkeypatch):
+    team_rows = league_rows()
+    X, y = build_league_training_set(team_rows, window=10)
+    model, scaler, accuracy = fit_model(X, y)
+    registry = ModelRegistry(str(tmp_path))
+    assert registry.load() is None
+
+    version = registry.save(model, scaler, {'features': list(X.columns), 'form_window': 10, 'accuracy': accuracy})
+    newer = registry.save(model, scaler, {'features': list(X.columns), 'form_window': 10, 'accuracy': accuracy})
+    assert registry.versions() == [version, newer]
+    artifact = registry.load()
+    assert artifact['version'] == newer
+    assert registry.metadata()['features'] == list(X.columns)
+
+    # No training happens when a saved model is passed in
+    monkeypatch.setattr(nba_predictor, 'build_team_game_rows', lambda team_abv, num_games: team_rows[team_abv].tail(num_games))
+    monkeypatch.setattr(nba_predictor, 'fit_model', None)
+    prediction = predict_upcoming_game('AAA', 'BBB', artifact)
+    assert prediction['model_version'] == newer
+    assert prediction['home_win_probability'] + prediction['away_win_probability'] == 1
@@ -0,0 +1,87 @@
+import copy
+import glob
+import os
+from datetime import date
+
+from conftest import load_example
+from nba_archive import archive_completed_dates, attach_archive
+from nba_live_stats_db import NBALiveStatsDB
+
+
+def test_completed_dates_move_to_parquet_and_stay_queryable(tmp_path):
+    archive_dir = str(tmp_path / 'archive')
+    db = NBALiveStatsDB(':memory:', archive_dir=archive_dir)
+    scoreboard = load_example('example_game_data.json')
+    boxscore = load_example('example_box_score_data.json')
+    db.process_refresh(scoreboard, [boxscore])
+    game = scoreboard['scoreboard']['games'][0]
+    players_before = db.conn.execute("SELECT * FROM players ORDER BY ALL").fetchall()
+    timeline_before = db.score_timeline(game['gameId'])
+
+    # Nothing is archived on the day itself
+    game_day = date.fromisoformat(game['gameEt'][:10])
+    assert archive_completed_dates(db, archive_dir, today=game_day)['dates'] == []
+
+    result = archive_completed_dates(db, archive_dir, today=date(2030, 1, 1))
+    assert result['dates'] == [game_day]
+    assert result['rows']['games'] == 1
+    assert db.get_database_stats()[0] == 0
+    assert glob.glob(os.path.join(archive_dir, 'games', 'season=2020', f'game_date={game_day}', '*.parquet'))
+
+    attach_archive(db.conn, archive_dir)
+    archived = db.conn.execute("SELECT * EXCLUDE (season, game_date) FROM all_players ORDER BY ALL").fetchall()
+    assert archived == players_before
+    assert db.score_timeline(game['gameId']).equals(timeline_before)
+
+    # Archiving the same date again rewrites its files instead of adding rows
+    db.process_refresh(scoreboard, [boxscore])
+    db.fingerprints = {}
+    db.process_refresh(scoreboard, [boxscore])
+    archive_completed_dates(db, archive_dir, today=date(2030, 1, 1))
+    assert db.conn.execute("SELECT COUNT(*) FROM all_games").fetchone()[0] == 1
+
+
+def test_archiving_a_date_again_keeps_the_games_archived_before(tmp_path):
+    archive_dir = str(tmp_path / 'archive')
+    db = NBALiveStatsDB(':memory:', archive_dir=archive_dir)
+    scoreboard = load_example('example_game_data.json')
+    boxscore = load_example('example_box_score_data.json')
+    db.process_refresh(scoreboard, [boxscore])
+    archive_completed_dates(db, archive_dir, today=date(2030, 1, 1))
+
+    # A second game on the same date, ingested and archived later
+    later = copy.deepcopy(scoreboard)
+    later['scoreboard']['games'][0]['gameId'] = '0022000199'
+    db.process_refresh(later)
+    # The first game's boxscore arrives again too
+    db.fingerprints = {}
+    db.process_refresh(None, [boxscore])
+    archive_completed_dates(db, archive_dir, today=date(2030, 1, 1))
+
+    attach_archive(db.conn, archive_dir)
+    assert sorted(row[0] for row in db.conn.execute("SELECT game_id FROM all_games").fetchall()) == [
+        '0022000181', '0022000199'
+    ]
+    players = db.conn.execute("SELECT count(*), count(DISTINCT (player_id, game_id)) FROM all_players").fetchone()
+    assert players[0] == players[1] > 0
+    game_date = scoreboard['scoreboard']['games'][0]['gameEt'][:10]
+    assert len(glob.glob(os.path.join(archive_dir, 'games', '*', f'game_date={game_date}', '*.parquet'))) == 1
+
+
+def test_reingesting_an_archived_game_keeps_season_totals(tmp_path):
+    archive_dir = str(tmp_path / 'archive')
+    db = NBALiveStatsDB(':memory:', archive_dir=archive_dir)
+    boxscore = load_example('example_box_score_data.json')
+    # A final scoreboard game for the boxscore, so its players are archived
+    scoreboard = load_example('example_game_data.json')
+    scoreboard['scoreboard']['games'][0]['gameId'] = boxscore['game']['gameId']
+    totals_query = "SELECT sum(points), sum(games), sum(seconds_played) FROM player_season_totals"
+    db.process_refresh(scoreboard, [boxscore])
+    totals_before = db.conn.execute(totals_query).fetchone()
+
+    result = archive_completed_dates(db, archive_dir, today=date(2030, 1, 1))
+    assert result['rows']['players'] > 0
+    db.fingerprints = {}
+    db.process_refresh(scoreboard, [boxscore])
+
+    assert db.conn.execute(totals_query).fetchone() == totals_before
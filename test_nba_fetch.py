@@ -0,0 +1,132 @@
+from boxscore_cache import BoxscoreCache
+from live_records import scoreboard_records
+from nba_fetch import ConditionalFetcher, fetch_boxscores, fetch_due_boxscores, fetch_scoreboard
+from poll_scheduler import PollScheduler
+
+
+def test_fetch_boxscores_returns_results_in_order(local_cdn, tmp_path):
+    game_ids = [f"00224{i:05d}" for i in range(12)][::-1]
+    results = fetch_boxscores(game_ids, cache=BoxscoreCache(str(tmp_path)), url_template=local_cdn.boxscore_url)
+
+    assert list(results) == game_ids
+    assert [game['gameId'] for game in results.values()] == game_ids
+
+
+def test_fetch_boxscores_caps_concurrency(local_cdn, tmp_path):
+    local_cdn.delay = 0.05
+    game_ids = [f"00224{i:05d}" for i in range(12)]
+    fetch_boxscores(
+        game_ids, cache=BoxscoreCache(str(tmp_path)),
+        url_template=local_cdn.boxscore_url, max_workers=3
+    )
+
+    assert len(local_cdn.requests) == 12
+    assert 1 < local_cdn.max_in_flight <= 3
+
+
+def test_fetch_boxscores_retries_and_uses_cache(local_cdn, tmp_path):
+    cache = BoxscoreCache(str(tmp_path))
+    url_template = local_cdn.url + "/flaky/boxscore_{game_id}.json"
+
+    first = fetch_boxscores(['0022400001', '0022400002'], cache=cache, url_template=url_template)
+    assert all(game is not None for game in first.values())
+    # Each path failed once with a 503 and succeeded on retry
+    assert len(local_cdn.requests) == 4
+
+    # The example game is final, so the second call is served entirely from the cache
+    second = fetch_boxscores(['0022400001', '0022400002'], cache=cache, url_template=url_template)
+    assert second == first
+    assert len(local_cdn.requests) == 4
+
+
+def test_fetch_boxscores_maps_failures_to_none(local_cdn, tmp_path):
+    url_template = local_cdn.url + "/missing/{game_id}.json"
+    results = fetch_boxscores(['0022400001'], cache=BoxscoreCache(str(tmp_path)), url_template=url_template)
+
+    assert results == {'0022400001': None}
+
+
+def test_conditional_requests_short_circuit_on_304(local_cdn):
+    fetcher = ConditionalFetcher()
+    url = local_cdn.url + '/etag/scoreboard.json'
+
+    data, changed = fetch_scoreboard(url, fetcher=fetcher)
+    assert changed and data == local_cdn.scoreboard
+
+    again, changed = fetch_scoreboard(url, fetcher=fetcher)
+    assert not changed and again is data
+    assert local_cdn.responses == [200, 304]
+    stats = fetcher.stats()
+    assert stats['not_modified'] == 1
+    assert stats['bytes_saved'] == stats['bytes_fetched'] > 0
+
+    local_cdn.scoreboard['scoreboard']['games'][0]['homeTeam']['score'] += 2
+    updated, changed = fetch_scoreboard(url, fetcher=fetcher)
+    assert changed and updated['scoreboard']['games'][0]['homeTeam']['score'] == data['scoreboard']['games'][0]['homeTeam']['score'] + 2
+
+
+def test_identical_body_skips_parsing_without_validators(local_cdn):
+    fetcher = ConditionalFetcher()
+    url = local_cdn.url + '/scoreboard.json'
+
+    fetch_scoreboard(url, fetcher=fetcher)
+    _, changed = fetch_scoreboard(url, fetcher=fetcher)
+
+    assert not changed
+    assert local_cdn.responses == [200, 200]
+    assert fetcher.stats()['unchanged_bodies'] == 1
+
+
+def test_fetch_boxscores_reports_unchanged_live_games(local_cdn, tmp_path):
+    local_cdn.boxscore['game']['gameStatus'] = 2
+    cache = BoxscoreCache(str(tmp_path), live_ttl=0)
+    url_template = local_cdn.url + '/etag/boxscore_{game_id}.json'
+
+    _, unchanged = fetch_boxscores(['0022400001', '0022400002'], cache=cache, url_template=url_template, with_unchanged=True)
+    assert unchanged == []
+
+    results, unchanged = fetch_boxscores(['0022400001', '0022400002'], cache=cache, url_template=url_template, with_unchanged=True)
+    assert unchanged == ['0022400001', '0022400002']
+    assert all(game is not None for game in results.values())
+    assert local_cdn.responses == [200, 200, 304, 304]
+
+
+def test_unchanged_payloads_reuse_their_records(local_cdn, tmp_path):
+    fetcher = ConditionalFetcher()
+    url = local_cdn.url + '/etag/scoreboard.json'
+    games, changed = fetch_scoreboard(url, fetcher=fetcher, convert=scoreboard_records)
+    assert changed and [game.game_id for game in games] == ['0022000181']
+    again, changed = fetch_scoreboard(url, fetcher=fetcher, convert=scoreboard_records)
+    assert not changed and again is games
+    # Asked for in another form, the payload is fetched and returned that way
+    data, changed = fetch_scoreboard(url, fetcher=fetcher)
+    assert changed and data == local_cdn.scoreboard
+
+    local_cdn.boxscore['game']['gameStatus'] = 2
+    cache = BoxscoreCache(str(tmp_path), live_ttl=0)
+    url_template = local_cdn.url + '/etag/boxscore_{game_id}.json'
+    first = fetch_boxscores(['0022400001'], cache=cache, url_template=url_template, records=True)
+    second, unchanged = fetch_boxscores(['0022400001'], cache=cache, url_template=url_template, records=True,
+                                        with_unchanged=True)
+    assert unchanged == ['0022400001']
+    assert second['0022400001'] is first['0022400001']
+    assert first['0022400001'].home.players.names
+
+
+def test_games_are_not_refetched_before_their_poll_is_due(local_cdn, tmp_path):
+    final = local_cdn.scoreboard['scoreboard']['games'][0]
+    halftime = dict(final, gameId='0022000182', gameStatus=2, gameStatusText='Halftime', gameClock='PT00M00.00S')
+    games = scoreboard_records({'scoreboard': {'games': [final, halftime]}})
+    scheduler = PollScheduler(break_interval=120)
+    latest = {}
+    fetch = dict(cache=BoxscoreCache(str(tmp_path), live_ttl=0), url_template=local_cdn.boxscore_url, records=True)
+
+    fetched, _ = fetch_due_boxscores(games, scheduler, latest, **fetch)
+    assert list(fetched) == ['0022000181', '0022000182']
+    requests = len(local_cdn.requests)
+
+    # The final boxscore is stored and halftime lasts longer than one refresh
+    fetched, _ = fetch_due_boxscores(games, scheduler, latest, **fetch)
+    assert fetched == {}
+    assert len(local_cdn.requests) == requests
+    assert sorted(latest) == ['0022000181', '0022000182']
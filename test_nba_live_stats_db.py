@@ -0,0 +1,218 @@
+from datetime import datetime
+
+import pytest
+
+from boxscore_cache import BoxscoreCache
+from conftest import load_example
+from live_records import game_record
+from nba_live_stats_db import NBALiveStatsDB, boxscore_player_frame, ingest_once, open_database, read_snapshot
+from poll_scheduler import PollScheduler, clock_seconds
+
+
+def table_contents(db, table):
+    rows = db.conn.execute(f"SELECT * FROM {table} ORDER BY ALL").df()
+    return rows.drop(columns=['last_updated'], errors='ignore').values.tolist()
+
+
+@pytest.fixture
+def scoreboard_data():
+    return load_example('example_game_data.json')
+
+
+@pytest.fixture
+def boxscore_data():
+    return load_example('example_box_score_data.json')
+
+
+def test_batched_and_per_row_ingestion_match(scoreboard_data, boxscore_data):
+    batched = NBALiveStatsDB(':memory:')
+    per_row = NBALiveStatsDB(':memory:', batch_mode=False)
+    for db in (batched, per_row):
+        db.process_refresh(scoreboard_data, [boxscore_data])
+        # A second tick replaces rows rather than duplicating them
+        db.process_refresh(scoreboard_data, [boxscore_data])
+
+    for table in ('games', 'teams', 'game_teams', 'players'):
+        assert table_contents(batched, table) == table_contents(per_row, table)
+    assert len(table_contents(batched, 'players')) > 0
+
+
+def test_failed_refresh_rolls_back(scoreboard_data, boxscore_data, monkeypatch):
+    db = NBALiveStatsDB(':memory:')
+    # Payloads are parsed before the transaction, so fail the last table written instead
+    upsert_frame = db.upsert_frame
+    def failing_upsert(table, frame):
+        if table == 'players':
+            raise KeyError(table)
+        return upsert_frame(table, frame)
+    monkeypatch.setattr(db, 'upsert_frame', failing_upsert)
+
+    with pytest.raises(KeyError):
+        db.process_refresh(scoreboard_data, [boxscore_data])
+    assert db.get_database_stats() == (0, 0, 0)
+
+
+def test_unchanged_games_skip_writes(scoreboard_data, boxscore_data):
+    db = NBALiveStatsDB(':memory:')
+    first = db.process_refresh(scoreboard_data, [boxscore_data])
+    assert first['skipped'] == 0 and first['written'] > 0
+
+    assert db.process_refresh(scoreboard_data, [boxscore_data]) == {
+        'written': 0, 'skipped': first['written'],
+    }
+
+    # Only the game whose score moved is written again
+    scoreboard_data['scoreboard']['games'][0]['homeTeam']['score'] += 2
+    assert db.process_refresh(scoreboard_data, [boxscore_data]) == {
+        'written': 5, 'skipped': first['written'] - 5,
+    }
+
+    # A rebound during a stoppage moves neither the score nor the clock, but is still written
+    player = next(p for p in boxscore_data['game']['homeTeam']['players'] if p.get('played') == '1')
+    player['statistics']['reboundsTotal'] += 1
+    played = sum(p.get('played') == '1' for team in ('homeTeam', 'awayTeam') for p in boxscore_data['game'][team]['players'])
+    assert db.process_refresh(scoreboard_data, [boxscore_data]) == {
+        'written': played, 'skipped': first['written'] - played,
+    }
+    stored = db.conn.execute("SELECT rebounds FROM players WHERE player_id = ?", [player['personId']]).fetchone()[0]
+    assert stored == player['statistics']['reboundsTotal']
+
+
+def test_fingerprints_survive_reopening(tmp_path, scoreboard_data):
+    db_path = str(tmp_path / 'live.db')
+    db = NBALiveStatsDB(db_path)
+    db.process_scoreboard_data(scoreboard_data)
+    db.conn.close()
+
+    reopened = NBALiveStatsDB(db_path)
+    assert reopened.process_scoreboard_data(scoreboard_data)['written'] == 0
+
+
+def test_ingest_once_writes_database_and_snapshot(local_cdn, tmp_path):
+    db_path = str(tmp_path / 'live.db')
+    snapshot_path = str(tmp_path / 'snapshot.json')
+    ingest = dict(
+        db_path=db_path, snapshot_path=snapshot_path,
+        scoreboard_url=local_cdn.url + '/scoreboard.json',
+        boxscore_url=local_cdn.boxscore_url,
+        cache=BoxscoreCache(str(tmp_path / 'cache')),
+    )
+
+    assert ingest_once(**ingest)['written'] > 0
+    # The ingester releases the file between ticks, so readers can open it
+    reader = open_database(db_path, read_only=True, retries=0)
+    assert reader.get_database_stats()[0] == len(local_cdn.scoreboard['scoreboard']['games'])
+    reader.close()
+
+    snapshot = read_snapshot(snapshot_path)
+    assert snapshot['scoreboard'] == local_cdn.scoreboard
+    assert list(snapshot['boxscores']) == [g['gameId'] for g in local_cdn.scoreboard['scoreboard']['games']]
+
+    # Nothing changed upstream, so the second tick writes nothing
+    assert ingest_once(**ingest)['written'] == 0
+
+
+def test_stale_snapshot_is_ignored(tmp_path):
+    path = tmp_path / 'snapshot.json'
+    path.write_text('{}')
+    assert read_snapshot(str(path)) == {}
+    assert read_snapshot(str(path), max_age=-1) is None
+    assert read_snapshot(str(tmp_path / 'missing.json')) is None
+
+
+def test_scheduled_ingest_stops_polling_persisted_final_games(local_cdn, tmp_path):
+    scheduler = PollScheduler()
+    boxscores = {}
+    ingest = dict(
+        db_path=str(tmp_path / 'live.db'), snapshot_path=str(tmp_path / 'snapshot.json'),
+        scoreboard_url=local_cdn.url + '/scoreboard.json',
+        boxscore_url=local_cdn.boxscore_url,
+        cache=BoxscoreCache(str(tmp_path / 'cache')),
+        scheduler=scheduler, boxscores=boxscores,
+    )
+    game_ids = [g['gameId'] for g in local_cdn.scoreboard['scoreboard']['games']]
+
+    ingest_once(**ingest)
+    assert all(scheduler.next_poll_time(game_id) is None for game_id in game_ids)
+
+    requests_before = len(local_cdn.requests)
+    ingest_once(**ingest)
+    # Only the scoreboard is fetched again, and the snapshot still has every boxscore
+    assert local_cdn.requests[requests_before:] == ['/scoreboard.json']
+    assert list(read_snapshot(ingest['snapshot_path'])['boxscores']) == game_ids
+
+
+def test_snapshots_only_append_changes(scoreboard_data, boxscore_data):
+    db = NBALiveStatsDB(':memory:')
+    game = scoreboard_data['scoreboard']['games'][0]
+    player = next(p for p in boxscore_data['game']['homeTeam']['players'] if p.get('played') == '1')
+    db.process_refresh(scoreboard_data, [boxscore_data])
+    before_basket = datetime.now()
+
+    # The clock and minutes moved but nothing was scored: no new rows
+    game['gameClock'] = 'PT03M00.00S'
+    player['statistics']['minutes'] = 'PT40M00.00S'
+    db.process_refresh(scoreboard_data, [boxscore_data])
+    assert len(db.score_timeline(game['gameId'])) == 1
+
+    game['homeTeam']['score'] += 2
+    boxscore_data['game']['homeTeam']['score'] += 2
+    player['statistics']['points'] += 2
+    db.process_refresh(scoreboard_data, [boxscore_data])
+
+    timeline = db.score_timeline(game['gameId'])
+    assert timeline['home_score'].diff().tolist()[1:] == [2]
+    assert timeline['clock_seconds'].tolist()[-1] == 180
+    player_rows = db.conn.execute("SELECT COUNT(*) FROM player_snapshots WHERE player_id = ?", [player['personId']]).fetchone()[0]
+    assert player_rows == 2
+
+    line = db.player_line_at(boxscore_data['game']['gameId'], before_basket, player['personId'])
+    assert line['points'].tolist() == [player['statistics']['points'] - 2]
+    # One current line per player who played
+    played = [p for team in ('homeTeam', 'awayTeam') for p in boxscore_data['game'][team]['players'] if p.get('played') == '1']
+    assert len(db.player_line_at(boxscore_data['game']['gameId'], datetime.now())) == len(played)
+
+
+@pytest.mark.parametrize('batch_mode', [True, False])
+def test_summaries_follow_changing_lines(boxscore_data, scoreboard_data, batch_mode):
+    db = NBALiveStatsDB(':memory:', batch_mode=batch_mode)
+    player = next(p for p in boxscore_data['game']['homeTeam']['players'] if p.get('played') == '1')
+    points = player['statistics']['points']
+    db.process_refresh(scoreboard_data, [boxscore_data])
+
+    # A later tick of the same game replaces the line rather than adding to it
+    player['statistics']['points'] += 5
+    boxscore_data['game']['homeTeam']['score'] += 5
+    db.process_refresh(None, [boxscore_data])
+    totals = db.player_season_averages(player_id=player['personId'])
+    assert totals[['season', 'games', 'points']].values.tolist() == [[2020, 1, points + 5]]
+
+    # A second game counts as another game played
+    boxscore_data['game']['gameId'] = '0022000999'
+    db.process_refresh(None, [boxscore_data])
+    averages = db.player_season_averages(name=player['name'].upper(), season=2020)
+    assert averages[['games', 'points']].values.tolist() == [[2, points + 5]]
+    assert db.get_database_stats()[2] == len(db.player_season_averages())
+
+    game = scoreboard_data['scoreboard']['games'][0]
+    home = db.team_last_games(game['homeTeam']['teamId'])
+    assert home[['game_id', 'points', 'opponent_points', 'won']].values.tolist() == [
+        [game['gameId'], game['homeTeam']['score'], game['awayTeam']['score'], True]
+    ]
+    form = db.conn.execute("SELECT team_id, wins, losses, recent_games FROM team_form ORDER BY wins").fetchall()
+    assert form == [(game['awayTeam']['teamId'], 0, 1, 1), (game['homeTeam']['teamId'], 1, 0, 1)]
+
+
+def test_boxscore_player_frame_covers_both_teams(boxscore_data):
+    game_data = boxscore_data['game']
+    players = boxscore_player_frame(game_record(game_data))
+    played = [
+        (p['personId'], team == 'homeTeam', p['statistics']['blocks'])
+        for team in ('homeTeam', 'awayTeam') for p in game_data[team]['players'] if p.get('played') == '1'
+    ]
+    assert list(zip(players['player_id'], players['is_home'], players['blocks'])) == played
+    # "PT25M01.00S" is 25 minutes and 1 second
+    minutes = game_data['homeTeam']['players'][0]['statistics']['minutes']
+    assert players['seconds_played'].iloc[0] == clock_seconds(minutes)
+    assert boxscore_player_frame(game_record(dict(game_data, homeTeam=dict(game_data['homeTeam'], players=[]),
+                                                  awayTeam=dict(game_data['awayTeam'], players=[])))).empty
@@ -0,0 +1,66 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from nba_metrics import BUCKET_BOUNDS_MS, Metrics, bucket_percentile, read_metrics
+
+
+def test_timer_fills_the_stage_histogram():
+    metrics = Metrics()
+    for seconds in (0.0005, 0.003, 0.003, 0.004, 0.250):
+        metrics.record('fetch.boxscore', seconds)
+    with metrics.timer('parse.json'):
+        pass
+    metrics.count('ingest.rows_written', 12)
+    metrics.count('ingest.rows_written', 3)
+
+    report = metrics.report()
+    stage = report['stages']['fetch.boxscore']
+    assert stage['count'] == 5
+    assert sum(stage['buckets']) == 5
+    assert stage['max_ms'] == 250
+    # Three of the five calls took 2-5 ms
+    assert stage['p50_ms'] == 5
+    assert stage['p95_ms'] == 500
+    assert report['stages']['parse.json']['count'] == 1
+    assert report['counters'] == {'ingest.rows_written': 15}
+
+
+def test_open_ended_bucket_reports_the_maximum():
+    buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+    buckets[-1] = 2
+    assert bucket_percentile(buckets, 0.5, 42000.0) == 42000.0
+    assert bucket_percentile([0] * len(buckets), 0.5, 0.0) == 0.0
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    with metrics.timer('fetch.scoreboard'):
+        pass
+    metrics.record('parse.json', 0.1)
+    metrics.count('ingest.rows_written')
+    assert metrics.report()['stages'] == {}
+    assert metrics.report()['counters'] == {}
+
+
+def test_report_includes_sources_and_round_trips(tmp_path):
+    metrics = Metrics()
+    metrics.register_source('boxscore_cache', lambda: {'hits': 3, 'misses': 1, 'hit_rate': 0.75})
+    metrics.record('ingest.refresh', 0.02)
+    path = str(tmp_path / 'metrics.json')
+    metrics.write(path)
+
+    report = read_metrics(path)
+    assert report['sources']['boxscore_cache']['hit_rate'] == 0.75
+    assert report['stages']['ingest.refresh']['count'] == 1
+    assert read_metrics(str(tmp_path / 'missing.json')) is None
+
+
+def test_concurrent_writes_all_succeed(tmp_path):
+    metrics = Metrics()
+    metrics.record('ingest.refresh', 0.02)
+    path = str(tmp_path / 'metrics.json')
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: metrics.write(path), range(200)))
+
+    assert read_metrics(path)['stages']['ingest.refresh']['count'] == 1
+    assert os.listdir(tmp_path) == ['metrics.json']
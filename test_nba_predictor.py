@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+import nba_predictor
+from live_records import scoreboard_records
+from nba_predictor import (
+    FORM_COLUMNS, MIN_FORM_GAMES, build_training_set, create_game_features,
+    fit_model, predict_slate, rolling_form
+)
+
+
+def make_team_rows(num_games, start='2024-11-01', offset=0):
+    rng = np.random.default_rng(offset)
+    dates = pd.date_range(start, periods=num_games, freq='2D') + pd.Timedelta(days=offset)
+    return pd.DataFrame({
+        'total_points': rng.integers(90, 130, num_games),
+        'total_assists': rng.integers(15, 35, num_games),
+        'total_rebounds': rng.integers(35, 55, num_games),
+        'fg_percentage': rng.uniform(40, 55, num_games),
+        'three_pt_percentage': rng.uniform(30, 40, num_games),
+        'ft_percentage': rng.uniform(70, 85, num_games),
+        'bench_points': rng.integers(20, 50, num_games),
+        'won': rng.integers(0, 2, num_games),
+        'is_home': np.arange(num_games) % 2,
+        'game_id': [f"g{offset}_{i}" for i in range(num_games)],
+        'game_date': dates,
+    })
+
+
+def test_rolling_form_only_uses_previous_games():
+    rows = make_team_rows(12)
+    form = rolling_form(rows, window=8)
+
+    assert form.iloc[:MIN_FORM_GAMES][FORM_COLUMNS].isna().all().all()
+    assert form.iloc[MIN_FORM_GAMES:][FORM_COLUMNS].notna().all().all()
+    expected = rows['total_points'].iloc[2:10].mean()
+    assert form['total_points'].iloc[10] == expected
+
+
+def test_training_set_has_one_row_per_game():
+    home_rows = make_team_rows(30)
+    away_rows = make_team_rows(30, offset=1)
+    X, y = build_training_set(home_rows, away_rows, window=10)
+
+    assert len(X) == len(y)
+    assert len(X) > 40
+    # Every row is built from a different point in time, not copies of one vector
+    assert len(X.drop_duplicates()) == len(X)
+    assert set(np.unique(y)) <= {0, 1}
+
+
+def test_training_and_prediction_features_share_columns():
+    home_rows = make_team_rows(30)
+    away_rows = make_team_rows(30, offset=1)
+    X, _ = build_training_set(home_rows, away_rows)
+    features = create_game_features('AAA', 'BBB', home_rows=home_rows, away_rows=away_rows)
+
+    assert list(features.index) == list(X.columns)
+
+
+def make_team(tricode):
+    return {'teamId': 0, 'teamName': tricode, 'teamCity': tricode, 'teamTricode': tricode, 'score': 0}
+
+
+def make_game(game_id, status, home, away, tipoff):
+    return {'gameId': game_id, 'gameStatus': status, 'period': 0, 'gameTimeUTC': tipoff, 'gameEt': tipoff,
+            'homeTeam': make_team(home), 'awayTeam': make_team(away)}
+
+
+def make_slate(matchups, tipoff='2025-01-16T00:30:00Z'):
+    games = [make_game(f"00224{i:05d}", 1, home, away, tipoff) for i, (home, away) in enumerate(matchups)]
+    # A game already underway is not predicted
+    games.append(make_game('0022499999', 2, 'AAA', 'BBB', tipoff))
+    return {'scoreboard': {'games': games}}
+
+
+def test_predict_slate_builds_each_team_once_and_caches_until_tipoff(monkeypatch):
+    team_rows = {abv: make_team_rows(30, offset=i) for i, abv in enumerate(['AAA', 'BBB', 'CCC', 'DDD'])}
+    X, y = build_training_set(team_rows['AAA'], team_rows['BBB'])
+    model, scaler, accuracy = fit_model(X, y)
+    artifact = {'model': model, 'scaler': scaler, 'version': 'v1',
+                'metadata': {'features': list(X.columns), 'form_window': 20, 'accuracy': accuracy}}
+
+    calls = []
+    def build_teams_game_rows(team_abvs, num_games):
+        calls.append(list(team_abvs))
+        return {abv: team_rows[abv] for abv in team_abvs}
+    monkeypatch.setattr(nba_predictor, 'build_teams_game_rows', build_teams_game_rows)
+    monkeypatch.setattr(nba_predictor, '_slate_predictions', {})
+
+    games = scoreboard_records(make_slate([('AAA', 'BBB'), ('CCC', 'AAA'), ('DDD', 'BBB')]))
+    tipoff = pd.Timestamp('2025-01-16T00:30:00Z').timestamp()
+    predictions = predict_slate(games, artifact, now=tipoff - 3600)
+
+    assert list(predictions) == ['0022400000', '0022400001', '0022400002']
+    assert len(calls) == 1 and sorted(set(calls[0])) == ['AAA', 'BBB', 'CCC', 'DDD']
+    assert predictions['0022400001']['home_team'] == 'CCC'
+
+    # Cached until tip-off, then predicted again
+    assert predict_slate(games, artifact, now=tipoff - 60) == predictions
+    assert len(calls) == 1
+    predict_slate(games, artifact, now=tipoff + 60)
+    assert len(calls) == 2
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from conftest import load_example
+from nba_live_stats_db import NBALiveStatsDB, ingest_once, open_database
+from play_by_play import ActionStream
+
+
+def feed_text(document, num_actions):
+    game = dict(document['game'], actions=document['game']['actions'][:num_actions])
+    return json.dumps(dict(document, game=game), indent=2)
+
+
+def test_stream_decodes_only_new_actions():
+    document = load_example('example_play_by_play_data.json')
+    actions = document['game']['actions']
+    stream = ActionStream()
+
+    def new_actions(text):
+        actions = stream.new_actions('0022000180', text)
+        stream.commit('0022000180')
+        return actions
+
+    assert new_actions(feed_text(document, 0)) == []
+    assert new_actions(feed_text(document, 10)) == actions[:10]
+    assert new_actions(feed_text(document, 10)) == []
+    assert new_actions(feed_text(document, 25)) == actions[10:25]
+    # A document cut off mid-action yields the complete actions before the cut
+    text = feed_text(document, 30)
+    cut = text.index(f'"actionNumber": {actions[28]["actionNumber"]},') + 30
+    assert new_actions(text[:cut]) == actions[25:28]
+    assert new_actions(text) == actions[28:30]
+    assert stream.last_action_number('0022000180') == actions[29]['actionNumber']
+
+    # Until they are committed, the same actions are decoded again
+    assert stream.new_actions('0022000180', feed_text(document, 35)) == actions[30:35]
+    assert stream.new_actions('0022000180', feed_text(document, 35)) == actions[30:35]
+    assert stream.last_action_number('0022000180') == actions[29]['actionNumber']
+
+    # A fresh stream (a restarted ingester) skips what the database already holds
+    after = actions[29]['actionNumber']
+    assert ActionStream().new_actions('0022000180', feed_text(document, None), after=after) == actions[30:]
+
+
+def test_growing_feed_builds_player_and_team_stats(local_cdn, tmp_path):
+    document = load_example('example_play_by_play_data.json')
+    url_template = local_cdn.url + "/etag/playbyplay_{game_id}.json"
+    stream = ActionStream()
+    db = NBALiveStatsDB(str(tmp_path / 'live.db'))
+    try:
+        for num_actions in (0, 8, 8, 21, None):
+            local_cdn.play_by_play_actions = num_actions
+            text = stream.fetch('0022000180', url_template)
+            if text is not None:
+                db.process_actions({'0022000180': stream.new_actions('0022000180', text)})
+            stream.commit('0022000180')
+        # The unchanged feed was answered with a 304 and not decoded again
+        assert local_cdn.responses == [200, 200, 304, 200, 200]
+
+        final = document['game']['actions'][-1]
+        assert db.last_action_numbers['0022000180'] == final['actionNumber']
+        assert db.conn.execute("SELECT count(*) FROM actions").fetchone()[0] == len(document['game']['actions'])
+        team_points = db.conn.execute("SELECT team_id, points FROM pbp_team_stats ORDER BY team_id").fetchall()
+        assert team_points == [(1610612738, int(final['scoreHome'])), (1610612753, int(final['scoreAway']))]
+
+        # Each scorer's points match the running total the feed reports on their last basket
+        expected = {}
+        for action in document['game']['actions']:
+            if action.get('shotResult') == 'Made':
+                expected[action['personId']] = action['pointsTotal']
+            if action.get('assistPersonId'):
+                expected.setdefault(action['assistPersonId'], 0)
+        points = dict(db.conn.execute("SELECT player_id, points FROM pbp_player_stats WHERE points > 0 OR assists > 0").fetchall())
+        assert points == expected
+        assists = db.conn.execute("SELECT sum(assists) FROM pbp_player_stats").fetchone()[0]
+        assert assists == sum(1 for action in document['game']['actions'] if action.get('assistPersonId'))
+
+        # Replaying actions already stored changes nothing
+        assert db.process_actions({'0022000180': document['game']['actions']}) == 0
+        assert db.conn.execute("SELECT sum(points) FROM pbp_team_stats").fetchone()[0] == sum(p for _, p in team_points)
+    finally:
+        db.close()
+
+
+def test_failed_write_leaves_actions_for_the_next_tick(local_cdn, tmp_path, monkeypatch):
+    game_id = local_cdn.scoreboard['scoreboard']['games'][0]['gameId']
+    db_path = str(tmp_path / 'live.db')
+    ingest = dict(
+        db_path=db_path, snapshot_path=str(tmp_path / 'snapshot.json'),
+        scoreboard_url=local_cdn.url + '/scoreboard.json', boxscore_url=local_cdn.boxscore_url,
+        action_stream=ActionStream(), playbyplay_url=local_cdn.url + '/etag/playbyplay_{game_id}.json',
+    )
+    process_actions = NBALiveStatsDB.process_actions
+    def failing_process_actions(db, actions_by_game):
+        raise OSError('disk full')
+    monkeypatch.setattr(NBALiveStatsDB, 'process_actions', failing_process_actions)
+    with pytest.raises(OSError):
+        ingest_once(**ingest)
+
+    # The feed is fetched and decoded again rather than answered with a 304
+    monkeypatch.setattr(NBALiveStatsDB, 'process_actions', process_actions)
+    assert ingest_once(**ingest)['actions'] == len(local_cdn.play_by_play['game']['actions'])
+    first_number = local_cdn.play_by_play['game']['actions'][0]['actionNumber']
+    db = open_database(db_path, read_only=True)
+    try:
+        assert db.conn.execute("SELECT min(action_number) FROM actions WHERE game_id = ?", [game_id]).fetchone()[0] == first_number
+    finally:
+        db.close()
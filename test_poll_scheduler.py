@@ -0,0 +1,58 @@
+from live_records import game_record
+from poll_scheduler import PollScheduler, tipoff_timestamp
+
+TEAM = {'teamId': 1610612738, 'teamName': 'Celtics', 'teamCity': 'Boston', 'teamTricode': 'BOS', 'score': 0}
+
+
+def make_game(status, clock='PT05M00.00S', period=2, status_text='Q2 5:00', tipoff='2025-01-15T00:30:00Z'):
+    return game_record({
+        'gameId': '0022400001', 'gameStatus': status, 'gameStatusText': status_text,
+        'period': period, 'gameClock': clock, 'gameTimeUTC': tipoff, 'gameEt': tipoff,
+        'homeTeam': TEAM, 'awayTeam': TEAM,
+    })
+
+
+def test_live_game_polls_fast_and_slows_when_clock_stops():
+    scheduler = PollScheduler(live_interval=10, stoppage_interval=30)
+    assert scheduler.poll_due(make_game(2), now=0)
+    assert scheduler.next_poll_time('0022400001') == 10
+    assert not scheduler.poll_due(make_game(2), now=5)
+
+    # Same clock on the next due poll means a stoppage such as a timeout
+    assert scheduler.poll_due(make_game(2), now=10)
+    assert scheduler.next_poll_time('0022400001') == 40
+
+    assert scheduler.poll_due(make_game(2, clock='PT04M30.00S'), now=40)
+    assert scheduler.next_poll_time('0022400001') == 50
+
+
+def test_halftime_uses_break_interval():
+    scheduler = PollScheduler(break_interval=120)
+    scheduler.poll_due(make_game(2, clock='PT00M00.00S', status_text='Halftime'), now=0)
+    assert scheduler.next_poll_time('0022400001') == 120
+
+
+def test_pregame_waits_for_tipoff_window():
+    game = make_game(1, status_text='7:30 pm ET')
+    tipoff = tipoff_timestamp(game)
+    scheduler = PollScheduler(pregame_interval=60, tipoff_window=900)
+
+    scheduler.poll_due(game, now=tipoff - 3600)
+    assert scheduler.next_poll_time('0022400001') == tipoff - 900
+    assert not scheduler.poll_due(game, now=tipoff - 1800)
+    assert scheduler.poll_due(game, now=tipoff - 900)
+    assert scheduler.next_poll_time('0022400001') == tipoff - 840
+
+    # Tip-off is picked up on the next scoreboard even if the game is not due
+    assert scheduler.poll_due(make_game(2), now=tipoff - 830)
+
+
+def test_final_game_stops_once_persisted():
+    scheduler = PollScheduler()
+    assert scheduler.poll_due(make_game(3, status_text='Final'), now=0)
+    assert scheduler.poll_due(make_game(3, status_text='Final'), now=1)
+
+    scheduler.mark_persisted('0022400001')
+    assert scheduler.next_poll_time('0022400001') is None
+    assert scheduler.next_due_time() is None
+    assert not scheduler.poll_due(make_game(3, status_text='Final'), now=1000)
@@ -0,0 +1,40 @@
+import requests
+
+from replay import ReplayServer, load_night, record_night, save_night
+
+
+def test_recorded_night_plays_every_game_to_the_end():
+    night = record_night(num_games=4, ticks=130, seed=1)
+    first, last = night[0]['scoreboard']['scoreboard']['games'], night[-1]['scoreboard']['scoreboard']['games']
+
+    assert [game['gameStatus'] for game in first] == [1] * 4
+    assert night[0]['boxscores'] == {}
+    assert [game['gameStatus'] for game in last] == [3] * 4
+    for game in last:
+        assert game['homeTeam']['score'] != game['awayTeam']['score']
+        players = night[-1]['boxscores'][game['gameId']]['game']['homeTeam']['players']
+        assert sum(player['statistics']['points'] for player in players) == game['homeTeam']['score']
+    # Scores only ever go up
+    scores = [
+        [(game['homeTeam']['score'], game['awayTeam']['score']) for game in tick['scoreboard']['scoreboard']['games']]
+        for tick in night
+    ]
+    assert all(a <= b for before, after in zip(scores, scores[1:]) for a, b in zip(before, after))
+
+
+def test_replay_server_serves_one_tick_at_a_time(tmp_path):
+    path = str(tmp_path / 'night.jsonl')
+    save_night(record_night(num_games=2, ticks=5), path)
+    night = load_night(path)
+    game_id = night[0]['scoreboard']['scoreboard']['games'][0]['gameId']
+
+    with ReplayServer(night) as replay:
+        assert requests.get(replay.boxscore_url.format(game_id=game_id)).status_code == 404
+        replay.advance()
+        response = requests.get(replay.boxscore_url.format(game_id=game_id))
+        assert response.json() == night[1]['boxscores'][game_id]
+        # An unchanged payload is not sent again
+        etag = response.headers['ETag']
+        assert requests.get(replay.boxscore_url.format(game_id=game_id), headers={'If-None-Match': etag}).status_code == 304
+        replay.advance()
+        assert requests.get(replay.scoreboard_url).json() == night[2]['scoreboard']
@@ -0,0 +1,49 @@
+import pytest
+
+from conftest import load_example
+from nba_archive import attach_archive
+from nba_live_stats_db import NBALiveStatsDB
+from table_browser import count_rows, fetch_page
+
+
+@pytest.fixture
+def conn(tmp_path):
+    db = NBALiveStatsDB(':memory:')
+    db.process_refresh(load_example('example_game_data.json'), [load_example('example_box_score_data.json')])
+    # Pad the players table out to several pages
+    db.conn.execute("""
+        INSERT INTO players (player_id, team_id, game_id, name, points)
+        SELECT i, 1, '0022000181', 'Player ' || i, i % 40 FROM range(1000, 1120) AS t(i)
+    """)
+    attach_archive(db.conn, str(tmp_path / 'archive'))
+    return db.conn
+
+
+def test_pages_are_disjoint_and_cover_the_table(conn):
+    total = count_rows(conn, 'players')
+    pages = [fetch_page(conn, 'players', page, page_size=50) for page in range(-(-total // 50))]
+
+    ids = [(row.player_id, row.game_id) for page in pages for row in page.itertuples()]
+    assert len(ids) == len(set(ids)) == total
+    assert len(pages[0]) == 50
+
+
+def test_filters_and_sort_run_in_duckdb(conn):
+    filters = dict(column='name', contains='player 11')
+    assert count_rows(conn, 'players', **filters) == 20
+
+    page = fetch_page(conn, 'players', 0, 5, sort_column='points', descending=True, **filters)
+    assert page['points'].tolist() == sorted(page['points'], reverse=True)
+    assert page['name'].str.startswith('Player 11').all()
+
+    # The padded players belong to the example scoreboard game, played in January 2021
+    assert count_rows(conn, 'players', date_from='2021-01-01', date_to='2021-01-31') == 120
+    assert count_rows(conn, 'games', date_from='2021-01-01', date_to='2021-01-31') == 1
+    assert count_rows(conn, 'games', date_from='2024-10-01') == 0
+
+
+def test_unknown_columns_are_rejected(conn):
+    with pytest.raises(ValueError):
+        fetch_page(conn, 'players', sort_column='points; DROP TABLE players')
+    with pytest.raises(ValueError):
+        count_rows(conn, 'players', column='nope', contains='x')
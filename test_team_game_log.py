@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+import pandas as pd
+
+from team_game_log import TeamGameLogStore
+
+
+def make_game_log(team_id, start, num_games, season_id='22024'):
+    dates = [start + timedelta(days=2 * i) for i in range(num_games)]
+    return pd.DataFrame({
+        'SEASON_ID': season_id,
+        'TEAM_ID': team_id,
+        'TEAM_ABBREVIATION': 'BOS',
+        'GAME_ID': [f"00224{d:%m%d}" for d in dates],
+        'GAME_DATE': [d.strftime('%Y-%m-%d') for d in dates],
+        'MATCHUP': 'BOS vs. NOP',
+        'WL': ['W' if i % 3 else 'L' for i in range(num_games)],
+        'PTS': 110,
+        'UNUSED_COLUMN': 0,
+    })
+
+
+class FakeGameFinder:
+    def __init__(self, log):
+        self.log = log
+        self.calls = []
+
+    def __call__(self, team_id, date_from=None):
+        self.calls.append(date_from)
+        games = self.log[self.log['TEAM_ID'] == team_id]
+        if date_from is not None:
+            games = games[pd.to_datetime(games['GAME_DATE']).dt.date >= date_from]
+        return games
+
+
+def test_sync_is_incremental_and_queries_newest_first(tmp_path):
+    finder = FakeGameFinder(make_game_log(1610612738, date(2024, 11, 1), 30))
+    store = TeamGameLogStore(str(tmp_path / 'logs.db'), fetch_game_log=finder, sync_interval=0)
+
+    assert store.sync_team(1610612738) == 30
+    finder.log = pd.concat([finder.log, make_game_log(1610612738, date(2025, 1, 1), 3)])
+    # Only games from the latest stored date on are requested again
+    assert store.sync_team(1610612738) == 4
+    assert finder.calls == [None, date(2024, 12, 29)]
+
+    recent = store.recent_games(1610612738, num_games=5)
+    assert list(recent['GAME_DATE']) == ['2025-01-05', '2025-01-03', '2025-01-01', '2024-12-29', '2024-12-27']
+    assert store.conn.execute("SELECT COUNT(*) FROM team_game_logs").fetchone()[0] == 33
+
+
+def test_fresh_logs_are_served_from_disk(tmp_path):
+    log = pd.concat([
+        make_game_log(1610612738, date(2023, 11, 1), 5, season_id='22023'),
+        make_game_log(1610612738, date(2024, 11, 1), 10),
+    ])
+    finder = FakeGameFinder(log)
+    store = TeamGameLogStore(str(tmp_path / 'logs.db'), fetch_game_log=finder)
+
+    store.sync_team(1610612738)
+    assert store.sync_team(1610612738) is None
+    assert store.api_calls == 1
+
+    # Only the configured seasons are returned
+    assert len(store.recent_games(1610612738, num_games=50)) == 10